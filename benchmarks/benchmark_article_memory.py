@@ -0,0 +1,29 @@
+"""
+Compares the memory of the processed articles with their compact dtypes and as Python object columns.
+
+Usage:
+    python benchmarks/benchmark_article_memory.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+
+from benchmark_articles_processor import synthetic_articles
+
+from PaperBee.papers.utils import ArticlesProcessor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'records':>10} {'object (MB)':>12} {'compact (MB)':>13} {'reduction':>10}")
+    for size in args.sizes:
+        articles = ArticlesProcessor(synthetic_articles(size), "2024-01-31").articles
+        compact = articles.memory_usage(deep=True).sum() / 1024**2
+        objects = articles.astype(object).memory_usage(deep=True).sum() / 1024**2
+        print(f"{size:>10} {objects:>12.2f} {compact:>13.2f} {1 - compact / objects:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
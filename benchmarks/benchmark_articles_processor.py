@@ -0,0 +1,63 @@
+"""
+Times `ArticlesProcessor` on synthetic findpapers records.
+
+Usage:
+    python benchmarks/benchmark_articles_processor.py [--sizes 1000 10000 100000] [--repeats 3]
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Dict, List
+
+from PaperBee.papers.utils import ArticlesProcessor
+
+DATABASES = [["bioRxiv"], ["PubMed"], ["arXiv"], ["bioRxiv", "PubMed"]]
+KEYWORDS = ["K-single-cell", "K-spatial transcriptomics", "K-deep learning", "M-RNA-Seq", "K-atlas"]
+
+
+def synthetic_articles(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Generates findpapers-like articles with resolved DOI URLs.
+
+    Args:
+        n (int): Number of articles.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        List[Dict[str, Any]]: The articles.
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            "databases": rng.choice(DATABASES),
+            "publication_date": f"2024-01-{rng.randint(1, 28):02d}",
+            "title": f"Synthetic paper {i} on single-cell analysis",
+            "keywords": rng.sample(KEYWORDS, rng.randint(0, len(KEYWORDS))),
+            "url": f"https://doi.org/10.1101/2024.01.{i:06d}",
+            "abstract": "An abstract. " * 20,
+        }
+        for i in range(n)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'records':>10} {'best (s)':>10} {'records/s':>12}")
+    for size in args.sizes:
+        articles = synthetic_articles(size)
+        timings = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            ArticlesProcessor(articles, "2024-01-31")
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(f"{size:>10} {best:>10.3f} {size / best:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,11 @@ from typing import Any, List, Optional, Tuple, cast
 import yaml
 
 from PaperBee.papers import (
+    GoogleSheetsUpdater,
+    HTTPSessionConfig,
+    PaperRecord,
     PapersFinder,
+    SheetShardPolicy,
     validate_configuration,
     validate_llm_args,
     validate_platform_args,
@@ -22,13 +26,13 @@ async def daily_papers_search(
     interactive: bool = False,
     since: Optional[int] = None,
     databases: Optional[List[str]] = None,
-) -> Tuple[List[List[Any]], Any, Any, Any, Any]:
+) -> Tuple[List[PaperRecord], Any, Any, Any, Any]:
     """
     Searches for daily papers and posts them to Telegram.
 
     Returns:
-        Tuple[List[List[Any]], Any, Any, Any, Any]:
-            - List of papers (list of lists of Any)
+        Tuple[List[PaperRecord], Any, Any, Any, Any]:
+            - List of papers
             - Slack response
             - Telegram response
             - Zulip response
@@ -63,7 +67,7 @@ async def daily_papers_search(
         root_dir=root_dir,
         spreadsheet_id=config.get("GOOGLE_SPREADSHEET_ID", ""),
         google_credentials_json=config.get("GOOGLE_CREDENTIALS_JSON", ""),
-        sheet_name="Papers",
+        sheet_name=config.get("SHEET_NAME", "Papers"),
         since=since,
         query=query,
         query_biorxiv=query_biorxiv,
@@ -85,7 +89,23 @@ async def daily_papers_search(
         mattermost_token=mattermost_args["token"],
         mattermost_team=mattermost_args["team"],
         mattermost_channel=mattermost_args["channel"],
+        ncbi_api_key=config.get("NCBI_API_KEY", ""),
+        http_config=HTTPSessionConfig(**config.get("HTTP", {})),
         databases=databases,
+        search_timeout=config.get("SEARCH_TIMEOUT", 1800),
+        incremental=config.get("INCREMENTAL_SEARCH", False),
+        chunk_size=config.get("CHUNK_SIZE", 500),
+        search_cache_ttl=config.get("SEARCH_CACHE_TTL_HOURS", 12),
+        archive_retention_days=config.get("ARCHIVE_RETENTION_DAYS", 365),
+        archive_max_size_mb=config.get("ARCHIVE_MAX_SIZE_MB"),
+        limit=config.get("SEARCH_LIMIT", 1200),
+        limit_per_database=config.get("SEARCH_LIMIT_PER_DATABASE", 400),
+        sheet_write_chunk_size=config.get("SHEET_WRITE_CHUNK_SIZE", 500),
+        sheet_write_mode=config.get("SHEET_WRITE_MODE", "insert"),
+        sheet_sharding=config.get("SHEET_SHARDING", "none"),
+        sheet_shard_spreadsheets=config.get("SHEET_SHARD_SPREADSHEETS"),
+        llm_max_concurrency=config.get("LLM_MAX_CONCURRENCY", 8),
+        llm_timeout=config.get("LLM_TIMEOUT", 60),
     )
     papers, response_slack, response_telegram, response_zulip, response_mattermost = await finder.run_daily(
         post_to_slack=slack_args["is_posting_on"],
@@ -97,9 +117,47 @@ async def daily_papers_search(
     return papers, response_slack, response_telegram, response_zulip, response_mattermost
 
 
+def migrate_sheet(config: dict) -> List[str]:
+    """
+    Prepares the Google Sheet of an existing setup, and each of its shards, for the 'append' SHEET_WRITE_MODE.
+
+    The rows are sorted oldest first and a filter view lists them newest first, see `SheetSession.migrate_to_append`.
+
+    Returns:
+        List[str]: The names of the migrated sheets.
+
+    Raises:
+        ValueError: If a sheet cannot be opened.
+    """
+    root_dir, _, _, _ = validate_configuration(config)
+    policy = SheetShardPolicy(
+        config.get("SHEET_NAME", "Papers"),
+        config.get("SHEET_SHARDING", "none"),
+        config.get("GOOGLE_SPREADSHEET_ID", ""),
+        config.get("SHEET_SHARD_SPREADSHEETS"),
+    )
+    migrated = []
+    for spreadsheet_id in policy.spreadsheet_ids():
+        updater = GoogleSheetsUpdater(
+            spreadsheet_id=spreadsheet_id,
+            credentials_json_path=config.get("GOOGLE_CREDENTIALS_JSON", ""),
+            token_dir=root_dir,
+        )
+        for sheet_name in updater.worksheet_titles():
+            if not policy.is_shard(sheet_name) or policy.spreadsheet_of(sheet_name) != spreadsheet_id:
+                continue
+            session = updater.session(sheet_name)
+            if session is None:
+                e = f"Failed to open the specified sheet '{sheet_name}' for the migration."
+                raise ValueError(e)
+            session.migrate_to_append()
+            migrated.append(sheet_name)
+    return migrated
+
+
 def main() -> None:
     """
-    CLI entry point for PaperBee, supporting subcommands like 'post'.
+    CLI entry point for PaperBee, supporting subcommands like 'post' and 'migrate-sheet'.
     """
     parser = argparse.ArgumentParser(description="PaperBee CLI")
     subparsers = parser.add_subparsers(dest="command", required=True, help="Available commands")
@@ -128,6 +186,17 @@ def main() -> None:
         type=str,
         help="Specify any combination of databases to search among the available ones 'pubmed','arxiv', and 'biorxiv'(e.g., ['pubmed', 'arxiv']).",
     )
+
+    # Subcommand: migrate-sheet
+    migrate_parser = subparsers.add_parser(
+        "migrate-sheet", help="Prepare an existing Google Sheet for the 'append' SHEET_WRITE_MODE"
+    )
+    migrate_parser.add_argument(
+        "--config",
+        type=str,
+        required=True,
+        help="Path to YAML configuration file.",
+    )
     args = parser.parse_args()
 
     # Dispatch to the appropriate subcommand
@@ -143,3 +212,7 @@ def main() -> None:
         )
         print("Papers found:")
         print(papers)
+    elif args.command == "migrate-sheet":
+        migrated = migrate_sheet(load_config(args.config))
+        print(f"Sorted oldest first, with a 'Newest first' filter view: {', '.join(migrated)}")
+        print("Set SHEET_WRITE_MODE: append in the configuration to append new papers at the bottom.")
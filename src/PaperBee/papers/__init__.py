@@ -1,4 +1,8 @@
+from .google_sheet import GoogleSheetsUpdater
+from .http_session import HTTPSessionConfig
+from .paper_record import PaperRecord
 from .papers_finder import PapersFinder
+from .sheet_shards import SheetShardPolicy
 from .validate_inputs import (
     validate_configuration,
     validate_llm_args,
@@ -6,7 +10,11 @@ from .validate_inputs import (
 )
 
 __all__ = [
+    "GoogleSheetsUpdater",
+    "HTTPSessionConfig",
+    "PaperRecord",
     "PapersFinder",
+    "SheetShardPolicy",
     "validate_configuration",
     "validate_llm_args",
     "validate_platform_args",
@@ -0,0 +1,208 @@
+import os
+import shutil
+import time
+import uuid
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .paper_record import COLUMNS, PaperRecord
+
+_PARTITION_PREFIX = "date="
+# Reads strings into Arrow-backed columns instead of Python objects
+_ARROW_STRINGS = {pa.string(): pd.StringDtype("pyarrow")}
+
+
+class ArticleArchive:
+    """
+    An append-only, date-partitioned Parquet archive of processed articles.
+
+    Every append writes a new file to the partition of the processing date (`archive/date=YYYY-MM-DD/`), so writes never
+    rewrite existing data. `compact` merges the files of a partition and drops repeated DOIs, e.g. from reruns on the
+    same day, and deletes the temporary files left behind by writes that crashed. `apply_retention` deletes the oldest
+    partitions by age and total size. Reads are memory-mapped, into Arrow-backed string columns.
+
+    Args:
+        directory (str): Directory of the archive, created if needed.
+        retention_days (Optional[float]): Partitions older than this are deleted by `apply_retention`. None keeps all.
+        max_size_mb (Optional[float]): Maximum total size; the oldest partitions are deleted beyond it. None for no limit.
+
+    Methods:
+        append(papers): Archives processed papers.
+        read(since, until, columns): Reads archived papers.
+        compact(before): Merges the files of each partition.
+        apply_retention(today): Deletes partitions beyond the age and size limits.
+    """
+
+    SCHEMA: pa.Schema = pa.schema([
+        ("DOI", pa.string()),
+        ("Date", pa.string()),
+        ("PostedDate", pa.string()),
+        ("IsPreprint", pa.bool_()),
+        ("Title", pa.string()),
+        ("Keywords", pa.string()),
+        ("Preprint", pa.string()),
+        ("URL", pa.string()),
+    ])
+
+    def __init__(
+        self,
+        directory: str,
+        retention_days: Optional[float] = 365,
+        max_size_mb: Optional[float] = None,
+    ) -> None:
+        self.directory: str = directory
+        self.retention_days: Optional[float] = retention_days
+        self.max_size_mb: Optional[float] = max_size_mb
+        os.makedirs(directory, exist_ok=True)
+
+    def partition_dir(self, day: str) -> str:
+        """Returns the directory of the partition of a date formatted as YYYY-MM-DD."""
+        return os.path.join(self.directory, f"{_PARTITION_PREFIX}{day}")
+
+    def partitions(self) -> List[str]:
+        """
+        Lists the dates of the archived partitions.
+
+        Returns:
+            List[str]: The dates formatted as YYYY-MM-DD, oldest first.
+        """
+        return sorted(
+            name[len(_PARTITION_PREFIX) :]
+            for name in os.listdir(self.directory)
+            if name.startswith(_PARTITION_PREFIX) and os.path.isdir(os.path.join(self.directory, name))
+        )
+
+    def _files(self, day: str) -> List[str]:
+        directory = self.partition_dir(day)
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".parquet"))
+
+    def _write(self, table: pa.Table, directory: str, prefix: str) -> str:
+        """Writes a file atomically, so that readers never see a partial file."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{prefix}-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet")
+        tmp_path = f"{path}.tmp"
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+        return path
+
+    def append(self, papers: List[PaperRecord]) -> List[str]:
+        """
+        Archives processed papers in the partitions of their processing date.
+
+        Args:
+            papers (List[PaperRecord]): The papers to archive.
+
+        Returns:
+            List[str]: The written files.
+        """
+        by_day: Dict[str, List[PaperRecord]] = {}
+        for paper in papers:
+            by_day.setdefault(paper.date, []).append(paper)
+
+        written = []
+        for day, day_papers in by_day.items():
+            rows = [dict(zip(COLUMNS, paper.to_row())) for paper in day_papers]
+            for row in rows:
+                row["IsPreprint"] = row["IsPreprint"] == "TRUE"
+            table = pa.Table.from_pylist(rows, schema=self.SCHEMA)
+            written.append(self._write(table, self.partition_dir(day), "part"))
+        return written
+
+    def _read_table(self, day: str, columns: Optional[List[str]] = None) -> pa.Table:
+        tables = [pq.read_table(path, columns=columns, memory_map=True) for path in self._files(day)]
+        if not tables:
+            return self.SCHEMA.empty_table() if columns is None else self.SCHEMA.empty_table().select(columns)
+        return pa.concat_tables(tables)
+
+    def read(
+        self,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Reads archived papers, memory-mapping the files.
+
+        Args:
+            since (Optional[str]): First processing date to read, formatted as YYYY-mm-dd.
+            until (Optional[str]): Last processing date to read, formatted as YYYY-mm-dd.
+            columns (Optional[List[str]]): Columns to read. Defaults to all columns of `COLUMNS`.
+
+        Returns:
+            pd.DataFrame: The papers, oldest partition first.
+        """
+        days = [day for day in self.partitions() if (not since or day >= since) and (not until or day <= until)]
+        tables = [self._read_table(day, columns) for day in days]
+        if not tables:
+            schema = self.SCHEMA if columns is None else pa.schema([self.SCHEMA.field(column) for column in columns])
+            return schema.empty_table().to_pandas(types_mapper=_ARROW_STRINGS.get)
+        return pa.concat_tables(tables).to_pandas(types_mapper=_ARROW_STRINGS.get)
+
+    def compact(self, before: Optional[str] = None) -> List[str]:
+        """
+        Merges the files of each partition into one file, keeping the last archived row of each DOI, and deletes the
+        temporary files of crashed writes.
+
+        Args:
+            before (Optional[str]): Only partitions older than this date are compacted, e.g. today's date so that the
+                partition still being written is left alone.
+
+        Returns:
+            List[str]: The dates of the compacted partitions.
+        """
+        compacted = []
+        for day in self.partitions():
+            if before and day >= before:
+                continue
+            directory = self.partition_dir(day)
+            for name in os.listdir(directory):
+                if name.endswith(".tmp"):
+                    os.remove(os.path.join(directory, name))
+            files = self._files(day)
+            if len(files) < 2:
+                continue
+            articles = self._read_table(day).to_pandas()
+            articles = articles.drop_duplicates(subset="DOI", keep="last")
+            table = pa.Table.from_pandas(articles, schema=self.SCHEMA, preserve_index=False)
+            self._write(table, self.partition_dir(day), "compacted")
+            for path in files:
+                os.remove(path)
+            compacted.append(day)
+        return compacted
+
+    def size_bytes(self) -> int:
+        """Returns the total size of the archived files."""
+        return sum(os.path.getsize(path) for day in self.partitions() for path in self._files(day))
+
+    def apply_retention(self, today: Optional[date] = None) -> List[str]:
+        """
+        Deletes the partitions older than `retention_days`, then the oldest ones while the archive exceeds `max_size_mb`.
+
+        Args:
+            today (Optional[date]): The reference date of the age limit. Defaults to today.
+
+        Returns:
+            List[str]: The dates of the deleted partitions.
+        """
+        today = today or date.today()
+        deleted = []
+        days = self.partitions()
+        if self.retention_days is not None:
+            oldest = (today - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+            deleted = [day for day in days if day < oldest]
+        if self.max_size_mb is not None:
+            sizes = {day: sum(os.path.getsize(path) for path in self._files(day)) for day in days}
+            total = sum(size for day, size in sizes.items() if day not in deleted)
+            for day in days[:-1]:  # The newest partition is always kept
+                if total <= self.max_size_mb * 1024 * 1024:
+                    break
+                if day not in deleted:
+                    deleted.append(day)
+                    total -= sizes[day]
+        for day in deleted:
+            shutil.rmtree(self.partition_dir(day))
+        return deleted
@@ -0,0 +1,215 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Type
+
+import httpx
+
+from .http_session import ConnectionStats, HTTPSessionConfig, create_async_client
+from .utils import PubMedClient, parse_pubmed_articles
+
+
+class TokenBucket:
+    """
+    An asyncio token-bucket rate limiter.
+
+    Tokens are refilled continuously at `rate` per second up to `capacity`; every request consumes one token and
+    waits until one is available.
+
+    Args:
+        rate (float): Number of tokens added per second.
+        capacity (Optional[float]): Maximum number of tokens, i.e. the allowed burst. Defaults to `rate`.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        if rate <= 0:
+            e = f"Rate must be positive, got {rate}."
+            raise ValueError(e)
+        self.rate: float = rate
+        self.capacity: float = capacity if capacity is not None else rate
+        self.tokens: float = self.capacity
+        self.updated_at: Optional[float] = None
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Waits until a token is available and consumes it."""
+        async with self.lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if self.updated_at is not None:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncPubMedClient:
+    """
+    An asynchronous client for fetching DOIs from PubMed with many lookups in flight at once.
+
+    All requests share a token bucket set to NCBI's limits: 3 requests per second, or 10 with an API key. The bucket
+    holds a single token, so requests are evenly spaced and no burst exceeds the limit in any one-second window.
+    Failed requests are retried individually with exponential backoff and jitter, honouring `Retry-After`.
+
+    Args:
+        ncbi_api_key (Optional[str]): Optional API key for NCBI.
+        max_concurrency (int): Maximum number of requests in flight.
+        n_retries (int): Number of attempts for each request.
+        backoff (float): Base delay in seconds of the exponential backoff.
+        http_config (Optional[HTTPSessionConfig]): Settings of the connection-pooled HTTP client.
+        client (Optional[httpx.AsyncClient]): Pre-initialized HTTP client (for testing/mocking).
+
+    Attributes:
+        stats (ConnectionStats): Requests sent and connections opened by the client created by this instance.
+
+    Methods:
+        get_doi_from_title(title): Retrieve the DOI of a single publication.
+        get_dois_from_titles(titles): Retrieve the DOIs of many publications using batched requests.
+    """
+
+    RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        ncbi_api_key: Optional[str] = None,
+        max_concurrency: int = 10,
+        n_retries: int = 3,
+        backoff: float = 0.5,
+        http_config: Optional[HTTPSessionConfig] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        self.ncbi_api_key: Optional[str] = ncbi_api_key or None
+        self.rate_limiter = TokenBucket(rate=10 if self.ncbi_api_key else 3, capacity=1)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.n_retries: int = n_retries
+        self.backoff: float = backoff
+        self.stats = ConnectionStats()
+        self._owns_client: bool = client is None
+        self.client: httpx.AsyncClient = client if client is not None else create_async_client(http_config, self.stats)
+
+    async def __aenter__(self) -> "AsyncPubMedClient":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Closes the underlying HTTP client if it was created by this instance."""
+        if self._owns_client:
+            await self.client.aclose()
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Returns the delay before the next attempt, preferring the server's `Retry-After` header."""
+        if response is not None and "Retry-After" in response.headers:
+            retry_after = response.headers["Retry-After"]
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(retry_after)
+                    return max(0.0, retry_at.timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+        return float(self.backoff * 2**attempt + random.uniform(0, self.backoff))
+
+    async def _request(self, endpoint: str, params: Dict[str, Any]) -> httpx.Response:
+        """Sends a rate-limited POST request to an E-utilities endpoint, retrying transient failures."""
+        url = f"{PubMedClient.base_url}{endpoint}"
+        for attempt in range(self.n_retries):
+            response: Optional[httpx.Response] = None
+            await self.rate_limiter.acquire()
+            try:
+                async with self.semaphore:
+                    response = await self.client.post(url, data=params)
+                if response.status_code not in self.RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return response
+            except httpx.TransportError as err:
+                print(f"Error querying PubMed {endpoint}: {err}")
+            if attempt < self.n_retries - 1:
+                await asyncio.sleep(self._retry_delay(attempt, response))
+
+        if response is not None:
+            response.raise_for_status()
+        e = f"Failed to query PubMed {endpoint} after {self.n_retries} attempts."
+        raise RuntimeError(e)
+
+    async def _fetch_records(self, pubmed_ids: List[str]) -> List[Dict[str, Optional[str]]]:
+        """Fetches the PubMed records of all PMIDs with a single efetch request."""
+        if not pubmed_ids:
+            return []
+        response = await self._request("efetch.fcgi", PubMedClient.fetch_params(pubmed_ids, self.ncbi_api_key))
+        return parse_pubmed_articles(response.content)
+
+    async def get_doi_from_title(self, title: str) -> Optional[str]:
+        """
+        Retrieve the DOI of a publication given its title by querying PubMed's database.
+
+        Args:
+            title (str): The title of the publication.
+
+        Returns:
+            Optional[str]: The DOI of the publication if found, otherwise None.
+        """
+        params: Dict[str, Any] = {"db": "pubmed", "term": title, "retmode": "json"}
+        if self.ncbi_api_key:
+            params["api_key"] = self.ncbi_api_key
+        search_data = (await self._request("esearch.fcgi", params)).json()
+        pubmed_ids = search_data["esearchresult"]["idlist"][:1]
+        for record in await self._fetch_records(pubmed_ids):
+            if record["doi"]:
+                return record["doi"]
+        return None
+
+    async def _get_dois_for_batch(self, titles: List[str]) -> Dict[str, Optional[str]]:
+        """Resolves one batch of titles, falling back to per-title lookups for unmatched ones."""
+        try:
+            search_params = PubMedClient.batch_search_params(titles, self.ncbi_api_key)
+            search_data = (await self._request("esearch.fcgi", search_params)).json()
+            records = await self._fetch_records(search_data["esearchresult"]["idlist"])
+        except Exception as e:
+            print(f"Error fetching DOIs from PubMed in batch: {e}")
+            matched: Dict[str, Optional[str]] = {}
+            unmatched = titles
+        else:
+            matched, unmatched = PubMedClient.match_titles(titles, records)
+
+        fallback = await asyncio.gather(
+            *(self.get_doi_from_title(title) for title in unmatched), return_exceptions=True
+        )
+        for title, doi in zip(unmatched, fallback):
+            # Failed lookups are left out so that they are not cached as misses
+            if isinstance(doi, BaseException):
+                print(f"Error fetching DOI from PubMed for '{title}': {doi}")
+            else:
+                matched[title] = doi
+        return matched
+
+    async def get_dois_from_titles(self, titles: List[str], batch_size: int = 50) -> Dict[str, Optional[str]]:
+        """
+        Retrieve the DOIs of many publications, resolving all batches of titles concurrently.
+
+        Args:
+            titles (List[str]): The titles of the publications.
+            batch_size (int): Number of titles combined into a single esearch query.
+
+        Returns:
+            Dict[str, Optional[str]]: A mapping from each title to its DOI, or None if no DOI was found.
+                Titles whose lookup failed are left out.
+        """
+        unique_titles = list(dict.fromkeys(titles))
+        batches = [unique_titles[start : start + batch_size] for start in range(0, len(unique_titles), batch_size)]
+        dois: Dict[str, Optional[str]] = {}
+        for batch_dois in await asyncio.gather(*(self._get_dois_for_batch(batch) for batch in batches)):
+            dois.update(batch_dois)
+        return dois
@@ -0,0 +1,223 @@
+import random
+import zlib
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .doi_resolver import DOIResolver
+from .utils import normalize_title
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def title_shingles(title: str, k: int = 4) -> Set[str]:
+    """
+    Splits a normalized title into overlapping character k-grams.
+
+    Args:
+        title (str): The title of the publication.
+        k (int): Length of the shingles.
+
+    Returns:
+        Set[str]: The shingles of the title.
+    """
+    normalized = normalize_title(title)
+    if len(normalized) <= k:
+        return {normalized} if normalized else set()
+    return {normalized[i : i + k] for i in range(len(normalized) - k + 1)}
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures, whose agreement estimates the Jaccard similarity of two shingle sets.
+
+    Args:
+        num_perm (int): Number of hash permutations, i.e. the signature length.
+        seed (int): Seed of the permutations, so that signatures are comparable across instances.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1) -> None:
+        rng = random.Random(seed)
+        self.num_perm: int = num_perm
+        self.permutations: List[Tuple[int, int]] = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1)) for _ in range(num_perm)
+        ]
+
+    def signature(self, shingles: Set[str]) -> "array[int]":
+        """
+        Computes the MinHash signature of a set of shingles.
+
+        Args:
+            shingles (Set[str]): The shingles, e.g. from `title_shingles`.
+
+        Returns:
+            array[int]: The signature, with `num_perm` unsigned 32-bit values.
+        """
+        if not shingles:
+            return array("I", [_MAX_HASH] * self.num_perm)
+        hashes = [zlib.crc32(shingle.encode()) for shingle in shingles]
+        return array(
+            "I", (min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes) for a, b in self.permutations)
+        )
+
+    @staticmethod
+    def similarity(signature: "array[int]", other: "array[int]") -> float:
+        """Estimates the Jaccard similarity of the shingle sets of two signatures."""
+        return sum(x == y for x, y in zip(signature, other)) / len(signature)
+
+
+class DeduplicationIndex:
+    """
+    An in-run index that detects the same work found several times, e.g. in bioRxiv and PubMed or by two queries.
+
+    Articles are duplicates if they share a normalized DOI, or if their titles are near-identical according to a
+    MinHash fingerprint and they do not have two different known DOIs. A preprint and a journal article are never
+    merged on their title alone: the publication of a preprint is a separate row, linked by `PreprintLinker`. Candidate pairs are found with
+    locality-sensitive hashing over bands of the signature, so adding an article does not compare it to all others.
+
+    Only compact fingerprints are kept per article once `release` has been called, so the index can be used on
+    streamed articles without holding all of them in memory.
+
+    Args:
+        threshold (float): Minimum estimated Jaccard similarity of the title shingles to consider two titles equal.
+        num_perm (int): Length of the MinHash signatures.
+        bands (int): Number of LSH bands; `num_perm` must be divisible by it.
+
+    Methods:
+        add(article): Adds an article, merging it into an indexed duplicate if there is one.
+        iter_unique(articles): Streams the articles that are not duplicates.
+        merge(articles): Deduplicates a list of articles.
+        release(): Drops the references to the indexed articles.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16) -> None:
+        if num_perm % bands:
+            e = f"num_perm ({num_perm}) must be divisible by bands ({bands})."
+            raise ValueError(e)
+        self.threshold: float = threshold
+        self.bands: int = bands
+        self.rows: int = num_perm // bands
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.articles: List[Optional[Dict[str, Any]]] = []
+        self.n_duplicates: int = 0
+        self._dois: Dict[str, int] = {}
+        self._known_dois: List[Optional[str]] = []
+        self._preprints: List[bool] = []
+        self._signatures: List[array[int]] = []
+        self._buckets: Dict[int, List[int]] = {}
+
+    @staticmethod
+    def article_doi(article: Dict[str, Any]) -> Optional[str]:
+        """Returns the lowercase DOI known from the article's metadata, if any."""
+        local = DOIResolver.local_doi(article)
+        return local["doi"].lower() if local else None
+
+    @staticmethod
+    def is_preprint(article: Dict[str, Any]) -> bool:
+        """Checks whether an article comes from a preprint server, like `ArticlesProcessor` sets IsPreprint."""
+        return "PubMed" not in (article.get("databases") or [])
+
+    def _band_keys(self, signature: "array[int]") -> List[int]:
+        return [hash((band, *signature[band * self.rows : (band + 1) * self.rows])) for band in range(self.bands)]
+
+    def find(self, article: Dict[str, Any]) -> Optional[int]:
+        """
+        Finds an indexed duplicate of an article.
+
+        Args:
+            article (Dict[str, Any]): A findpapers article.
+
+        Returns:
+            Optional[int]: The position of the duplicate in `articles`, or None.
+        """
+        doi = self.article_doi(article)
+        if doi and doi in self._dois:
+            return self._dois[doi]
+        signature = self.hasher.signature(title_shingles(article["title"]))
+        candidates = {index for key in self._band_keys(signature) for index in self._buckets.get(key, [])}
+        preprint = self.is_preprint(article)
+        for index in sorted(candidates):
+            other_doi = self._known_dois[index]
+            if doi and other_doi and doi != other_doi:
+                continue  # Different works with similar titles, e.g. a preprint and its publication
+            if preprint != self._preprints[index]:
+                continue  # A preprint and its publication keep their own DOI, and are linked by PreprintLinker
+            if self.hasher.similarity(signature, self._signatures[index]) >= self.threshold:
+                return index
+        return None
+
+    def add(self, article: Dict[str, Any]) -> bool:
+        """
+        Adds an article to the index, or merges it into its indexed duplicate.
+
+        Args:
+            article (Dict[str, Any]): A findpapers article.
+
+        Returns:
+            bool: True if the article is new, False if it was merged into a duplicate.
+        """
+        duplicate = self.find(article)
+        doi = self.article_doi(article)
+        if duplicate is not None:
+            indexed_article = self.articles[duplicate]
+            if indexed_article is not None:  # Released articles have already been processed
+                self._merge_into(indexed_article, article)
+            if doi and not self._known_dois[duplicate]:
+                self._known_dois[duplicate] = doi
+                self._dois[doi] = duplicate
+            self.n_duplicates += 1
+            return False
+
+        index = len(self.articles)
+        signature = self.hasher.signature(title_shingles(article["title"]))
+        self.articles.append(article)
+        self._known_dois.append(doi)
+        self._preprints.append(self.is_preprint(article))
+        self._signatures.append(signature)
+        if doi:
+            self._dois[doi] = index
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, []).append(index)
+        return True
+
+    @staticmethod
+    def _merge_into(article: Dict[str, Any], duplicate: Dict[str, Any]) -> None:
+        """Merges the databases, URLs, keywords and DOI of a duplicate into the indexed article."""
+        for field in ("databases", "urls", "keywords"):
+            values = list(article.get(field) or [])
+            values.extend(value for value in duplicate.get(field) or [] if value not in values)
+            article[field] = values
+        if not article.get("doi") and duplicate.get("doi"):
+            article["doi"] = duplicate["doi"]
+
+    def release(self) -> None:
+        """Drops the references to all indexed articles, keeping only their fingerprints."""
+        self.articles = [None] * len(self.articles)
+
+    def iter_unique(self, articles: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Streams the articles that are not duplicates of an indexed article.
+
+        Duplicates are merged into their first occurrence as long as it has not been released.
+
+        Args:
+            articles (Iterable[Dict[str, Any]]): findpapers articles, e.g. streamed from the result files.
+
+        Yields:
+            Dict[str, Any]: The new articles.
+        """
+        for article in articles:
+            if self.add(article):
+                yield article
+
+    def merge(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Deduplicates articles, keeping the first occurrence of each work in its original position.
+
+        Args:
+            articles (List[Dict[str, Any]]): findpapers articles.
+
+        Returns:
+            List[Dict[str, Any]]: The articles of this call that were not duplicates, with merged metadata.
+        """
+        return list(self.iter_unique(articles))
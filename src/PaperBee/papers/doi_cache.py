@@ -0,0 +1,138 @@
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .utils import normalize_title
+
+
+class DOICache:
+    """
+    A persistent SQLite cache of DOI lookups keyed by normalized publication title.
+
+    Both hits and misses ("no DOI found") are stored, each with its own time to live, so that titles seen in
+    previous runs do not have to be resolved against PubMed again.
+
+    Args:
+        db_path (str): Path to the SQLite database file.
+        hit_ttl_days (float): Days after which a found DOI is looked up again.
+        miss_ttl_days (float): Days after which a title without DOI is looked up again.
+        max_entries (int): Maximum number of entries kept; the oldest ones are evicted first.
+
+    Methods:
+        get_many(titles): Returns the fresh cached DOIs for the given titles.
+        set_many(dois): Stores the results of DOI lookups.
+        seed(records): Stores known (title, DOI) pairs, e.g. from the Google Sheet.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        hit_ttl_days: float = 180,
+        miss_ttl_days: float = 7,
+        max_entries: int = 200_000,
+    ) -> None:
+        """
+        Initializes the DOICache and creates the database table if needed.
+
+        Args:
+            db_path (str): Path to the SQLite database file.
+            hit_ttl_days (float): Days after which a found DOI is looked up again. Defaults to 180.
+            miss_ttl_days (float): Days after which a title without DOI is looked up again. Defaults to 7.
+            max_entries (int): Maximum number of entries kept. Defaults to 200 000.
+        """
+        self.db_path: str = db_path
+        self.hit_ttl: float = hit_ttl_days * 24 * 3600
+        self.miss_ttl: float = miss_ttl_days * 24 * 3600
+        self.max_entries: int = max_entries
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS doi_cache (title TEXT PRIMARY KEY, doi TEXT, resolved_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS doi_cache_resolved_at ON doi_cache (resolved_at)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, titles: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Looks up titles in the cache.
+
+        Args:
+            titles (Iterable[str]): The titles of the publications.
+
+        Returns:
+            Dict[str, Optional[str]]: The fresh cache entries, mapping each found title to its DOI or None
+                for a cached miss. Titles that are not cached or expired are left out.
+        """
+        keys = {title: normalize_title(title) for title in titles}
+        now = time.time()
+        entries: Dict[str, Tuple[Optional[str], float]] = {}
+        unique_keys = list(set(keys.values()))
+        with self._connect() as conn:
+            # Stay below SQLite's limit on the number of query parameters
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT title, doi, resolved_at FROM doi_cache WHERE title IN ({placeholders})",  # noqa: S608
+                    chunk,
+                ).fetchall()
+                entries.update({title: (doi, resolved_at) for title, doi, resolved_at in rows})
+
+        cached: Dict[str, Optional[str]] = {}
+        for title, key in keys.items():
+            if key not in entries:
+                continue
+            doi, resolved_at = entries[key]
+            ttl = self.hit_ttl if doi else self.miss_ttl
+            if now - resolved_at < ttl:
+                cached[title] = doi
+        return cached
+
+    def set_many(self, dois: Dict[str, Optional[str]]) -> None:
+        """
+        Stores DOI lookup results, including misses. Only confirmed misses may be passed as None; lookups that failed
+        must be left out, so that an outage is not cached as a miss.
+
+        Args:
+            dois (Dict[str, Optional[str]]): A mapping from titles to their DOI, or None if no DOI was found.
+        """
+        now = time.time()
+        rows = [(normalize_title(title), doi, now) for title, doi in dois.items()]
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO doi_cache (title, doi, resolved_at) VALUES (?, ?, ?)", rows)
+        self._evict()
+
+    def seed(self, records: Iterable[Tuple[str, str]]) -> None:
+        """
+        Stores known (title, DOI) pairs, replacing cached misses and refreshing cached hits.
+
+        Args:
+            records (Iterable[Tuple[str, str]]): Pairs of title and DOI, e.g. read from the Google Sheet.
+        """
+        now = time.time()
+        rows: List[Tuple[str, str, float]] = [
+            (normalize_title(str(title)), str(doi), now) for title, doi in records if title and doi
+        ]
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO doi_cache (title, doi, resolved_at) VALUES (?, ?, ?)", rows)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Deletes the oldest entries when the cache holds more than `max_entries`."""
+        with self._connect() as conn:
+            (count,) = conn.execute("SELECT COUNT(*) FROM doi_cache").fetchone()
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM doi_cache WHERE title IN "
+                    "(SELECT title FROM doi_cache ORDER BY resolved_at ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
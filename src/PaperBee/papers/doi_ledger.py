@@ -0,0 +1,209 @@
+import json
+import sqlite3
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .google_sheet import SheetSession
+
+
+class DOILedger:
+    """
+    A local SQLite ledger of the DOIs already listed in the Google Sheet, so that deduplication is a local lookup.
+
+    The ledger remembers the revision (Drive modification time) and the grid row count of each sheet at the last
+    sync; without access to the Drive metadata, only the row count is compared. `sync` only talks to the sheet again
+    when one of them changed: if rows were added, only the rows where new papers are inserted are read; otherwise,
+    e.g. after rows were deleted or edited by hand, the DOI column is read again in full. The added rows are checked
+    before they are recorded: they must hold unknown DOIs, right above the known ones. If not, e.g. because the sheet
+    was sorted by hand, the ledger is rebuilt from the full DOI column. Sheets written in append mode have no fixed
+    insertion row, as appended rows first fill the empty rows of the grid: they are read in full whenever they were
+    changed by someone else. DOIs inserted by PaperBee itself are recorded with `record`, without reading them back.
+
+    Rows that could not be written, e.g. because the sheet write failed after the papers were posted, are kept as
+    pending rows until a later run writes them.
+
+    Args:
+        db_path (str): Path to the SQLite database file.
+
+    Methods:
+        sync(key, session, insert_row): Brings the ledger of a sheet up to date with the sheet.
+        published(key, dois): Returns the DOIs that are listed in a sheet.
+        record(key, session, dois, siblings): Adds the DOIs inserted into a sheet.
+        set_pending(key, rows): Keeps rows that still have to be written to a sheet.
+        pending(key): Returns the rows that still have to be written to a sheet.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path: str = db_path
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS dois (sheet TEXT NOT NULL, doi TEXT NOT NULL, PRIMARY KEY (sheet, doi))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state (sheet TEXT PRIMARY KEY, revision TEXT, row_count INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pending_rows "
+                "(sheet TEXT NOT NULL, position INTEGER NOT NULL, doi TEXT NOT NULL, row TEXT NOT NULL, "
+                "PRIMARY KEY (sheet, doi))"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _state(self, key: str) -> Optional[Tuple[Optional[str], int]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT revision, row_count FROM sync_state WHERE sheet = ?", (key,)).fetchone()
+        return (row[0], int(row[1])) if row else None
+
+    def _save(self, key: str, dois: Iterable[str], revision: Optional[str], row_count: int, replace: bool) -> None:
+        with self._connect() as conn:
+            if replace:
+                conn.execute("DELETE FROM dois WHERE sheet = ?", (key,))
+            conn.executemany("INSERT OR IGNORE INTO dois (sheet, doi) VALUES (?, ?)", [(key, doi) for doi in dois])
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state (sheet, revision, row_count) VALUES (?, ?, ?)",
+                (key, revision, row_count),
+            )
+
+    def sync(self, key: str, session: SheetSession, insert_row: Optional[int] = 2) -> List[Dict[str, Any]]:
+        """
+        Brings the ledger of a sheet up to date, reading only what changed since the last sync.
+
+        Args:
+            key (str): Identifies the sheet in the ledger, e.g. the spreadsheet ID and the sheet name.
+            session (SheetSession): The session of the sheet.
+            insert_row (Optional[int]): The row where new papers are inserted, i.e. where rows added since the last
+                sync are, or None if they are appended.
+
+        Returns:
+            List[Dict[str, Any]]: The rows read from the sheet, with their DOI and Title; empty if nothing changed.
+        """
+        state = self._state(key)
+        revision = session.revision()
+        row_count = session.row_count
+        if state is not None:
+            known_revision, known_row_count = state
+            if row_count == known_row_count and revision == known_revision:
+                return []
+            if insert_row is not None and row_count > known_row_count:
+                # Only rows were added: read the rows inserted since the last sync
+                added = self._read_added_rows(key, session, insert_row, row_count - known_row_count)
+                if added is not None:
+                    self._save(key, _dois(added), revision, row_count, replace=False)
+                    return added
+        records = session.read_rows()
+        self._save(key, _dois(records), revision, row_count, replace=True)
+        return records
+
+    def _read_added_rows(
+        self, key: str, session: SheetSession, insert_row: int, nr_added: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Reads the rows added at the insertion row, together with the row below them.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: The added rows, or None if they are not where they are expected: one of
+                them holds a known DOI, or the row below them does not, e.g. because the sheet was sorted by hand.
+        """
+        records = session.read_rows(insert_row, insert_row + nr_added)
+        added, below = records[:nr_added], records[nr_added:]
+        known = self.published(key, _dois(records))
+        if len(added) < nr_added or any(doi in known for doi in _dois(added)):
+            return None
+        with self._connect() as conn:
+            has_dois = conn.execute("SELECT 1 FROM dois WHERE sheet = ? LIMIT 1", (key,)).fetchone() is not None
+        if has_dois and not (below and str(below[0].get("DOI")) in known):
+            return None
+        return added
+
+    def published(self, key: str, dois: Iterable[str]) -> Set[str]:
+        """
+        Looks up DOIs in the ledger of a sheet.
+
+        Args:
+            key (str): Identifies the sheet in the ledger.
+            dois (Iterable[str]): The DOIs to look up.
+
+        Returns:
+            Set[str]: The DOIs that are listed in the sheet.
+        """
+        unique_dois = list(set(dois))
+        found: Set[str] = set()
+        with self._connect() as conn:
+            # Stay below SQLite's limit on the number of query parameters
+            for start in range(0, len(unique_dois), 500):
+                chunk = unique_dois[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT doi FROM dois WHERE sheet = ? AND doi IN ({placeholders})",  # noqa: S608
+                    [key, *chunk],
+                ).fetchall()
+                found.update(doi for (doi,) in rows)
+        return found
+
+    def record(self, key: str, session: SheetSession, dois: Iterable[str], siblings: Iterable[str] = ()) -> None:
+        """
+        Adds the DOIs just inserted into a sheet, and remembers its new revision and row count.
+
+        The revision belongs to the whole spreadsheet, so the insertion also changes the revision of the other sheets
+        of the same spreadsheet. Those that were in sync with the revision before the insertion are moved to the new
+        one, so that they are not read again by the next sync.
+
+        Args:
+            key (str): Identifies the sheet in the ledger.
+            session (SheetSession): The session of the sheet, after the insertion.
+            dois (Iterable[str]): The inserted DOIs.
+            siblings (Iterable[str]): The keys of the other sheets of the same spreadsheet.
+        """
+        dois = list(dois)
+        state = self._state(key)
+        revision = session.revision()
+        self._save(key, dois, revision, session.row_count, replace=False)
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM pending_rows WHERE sheet = ? AND doi = ?", [(key, doi) for doi in dois])
+            if state is not None and state[0] is not None:
+                conn.executemany(
+                    "UPDATE sync_state SET revision = ? WHERE sheet = ? AND revision = ?",
+                    [(revision, sibling, state[0]) for sibling in siblings if sibling != key],
+                )
+
+    def set_pending(self, key: str, rows: List[List[Any]]) -> None:
+        """
+        Replaces the rows that still have to be written to a sheet.
+
+        Args:
+            key (str): Identifies the sheet in the ledger.
+            rows (List[List[Any]]): The rows, in the order of the sheet columns, with the DOI in the first column.
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM pending_rows WHERE sheet = ?", (key,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO pending_rows (sheet, position, doi, row) VALUES (?, ?, ?, ?)",
+                [(key, position, str(row[0]), json.dumps(row)) for position, row in enumerate(rows)],
+            )
+
+    def pending(self, key: str) -> List[List[Any]]:
+        """
+        Returns the rows that still have to be written to a sheet, in their order.
+
+        Args:
+            key (str): Identifies the sheet in the ledger.
+
+        Returns:
+            List[List[Any]]: The pending rows.
+        """
+        with self._connect() as conn:
+            rows = conn.execute("SELECT row FROM pending_rows WHERE sheet = ? ORDER BY position", (key,)).fetchall()
+        return [json.loads(row) for (row,) in rows]
+
+
+def _dois(records: List[Dict[str, Any]]) -> List[str]:
+    return [str(record["DOI"]) for record in records if record.get("DOI")]
@@ -0,0 +1,216 @@
+import re
+from collections import Counter
+from logging import Logger
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Type
+
+from .async_pubmed import AsyncPubMedClient
+from .doi_cache import DOICache
+from .http_session import HTTPSessionConfig
+from .utils import normalize_title
+
+DOI_PATTERN = re.compile(r"10\.\d{4,9}/\S+")
+ARXIV_URL_PATTERN = re.compile(r"arxiv\.org/(?:abs|pdf)/([a-z\-]+(?:\.[A-Z]{2})?/\d{7}|\d{4}\.\d{4,5})(?:v\d+)?", re.I)
+
+
+def doi_from_string(value: Optional[str]) -> Optional[str]:
+    """
+    Extracts a DOI from a bare DOI or a DOI-bearing URL.
+
+    Args:
+        value (Optional[str]): A DOI, a `doi:` prefixed DOI or a URL such as https://doi.org/10.1101/2024.01.01.123456.
+
+    Returns:
+        Optional[str]: The DOI, or None if the value does not contain one.
+    """
+    if not value:
+        return None
+    match = DOI_PATTERN.search(value)
+    return match.group(0).rstrip(".") if match else None
+
+
+def arxiv_doi(urls: List[str]) -> Optional[str]:
+    """
+    Derives the DataCite DOI (10.48550/arXiv.<id>) of an arXiv paper from its URLs.
+
+    Args:
+        urls (List[str]): The URLs of the paper.
+
+    Returns:
+        Optional[str]: The arXiv DOI, or None if no URL points to an arXiv paper.
+    """
+    for url in urls:
+        match = ARXIV_URL_PATTERN.search(url)
+        if match:
+            return f"10.48550/arXiv.{match.group(1)}"
+    return None
+
+
+class DOIResolver:
+    """
+    Resolves the DOIs of findpapers articles with a chain of resolvers, from the cheapest to the most expensive.
+
+    The chain is: the article's `doi` field, DOI URLs in its `urls`, arXiv identifiers, another journal article of
+    the same run with the same title and a known DOI, the local DOI cache, and finally PubMed. A preprint with the
+    same title never lends its DOI to a journal article, as the published version has a DOI of its own. Only PubMed
+    articles that no local resolver could handle are sent to NCBI.
+
+    The resolver is an async context manager: all chunks of a run share one PubMed client, opened on the first
+    lookup, so that its connections and rate limit carry over from one chunk to the next. The client is closed, and
+    its connection reuse logged, on exit.
+
+    Args:
+        doi_cache (Optional[DOICache]): Persistent cache of PubMed lookups.
+        ncbi_api_key (Optional[str]): Optional API key for NCBI.
+        http_config (Optional[HTTPSessionConfig]): Settings of the connection-pooled HTTP client used for NCBI.
+        logger (Optional[Logger]): Logger for the resolution statistics.
+
+    Attributes:
+        stats (Counter): Number of articles resolved by each resolver, plus 'unresolved'.
+    """
+
+    def __init__(
+        self,
+        doi_cache: Optional[DOICache] = None,
+        ncbi_api_key: Optional[str] = None,
+        http_config: Optional[HTTPSessionConfig] = None,
+        logger: Optional[Logger] = None,
+    ) -> None:
+        self.doi_cache: Optional[DOICache] = doi_cache
+        self.ncbi_api_key: Optional[str] = ncbi_api_key
+        self.http_config: Optional[HTTPSessionConfig] = http_config
+        self.logger: Logger = logger or Logger("DOIResolver")
+        self.stats: Counter = Counter()
+        self._client: Optional[AsyncPubMedClient] = None
+
+    async def __aenter__(self) -> "DOIResolver":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Closes the PubMed client of the run, if it was opened, and logs how its connections were reused."""
+        if self._client is not None:
+            await self._client.aclose()
+            self.logger.info(f"NCBI connection reuse: {self._client.stats}")
+            self._client = None
+
+    @property
+    def saved_lookups(self) -> int:
+        """Number of PubMed articles that were resolved without querying NCBI."""
+        return int(self.stats["pubmed_saved"])
+
+    @staticmethod
+    def local_doi(article: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """
+        Resolves the DOI of an article from its own metadata, without any request.
+
+        Args:
+            article (Dict[str, Any]): A findpapers article.
+
+        Returns:
+            Optional[Dict[str, str]]: The DOI and the name of the resolver that found it, or None.
+        """
+        doi = doi_from_string(article.get("doi"))
+        if doi:
+            return {"doi": doi, "source": "doi_field"}
+        urls = article.get("urls") or []
+        for url in urls:
+            if "doi.org/" in url:
+                doi = doi_from_string(url)
+                if doi:
+                    return {"doi": doi, "source": "doi_url"}
+        doi = arxiv_doi(urls)
+        if doi:
+            return {"doi": doi, "source": "arxiv"}
+        return None
+
+    async def resolve(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Sets the `url` of every article to its DOI URL, or None if no DOI could be found.
+
+        Args:
+            articles (List[Dict[str, Any]]): findpapers articles, updated in place.
+
+        Returns:
+            List[Dict[str, Any]]: The same articles.
+        """
+        dois: Dict[int, Optional[str]] = {}
+        pending: List[int] = []
+        for index, article in enumerate(articles):
+            local = self.local_doi(article)
+            is_pubmed = "PubMed" in article["databases"]
+            if local:
+                dois[index] = local["doi"]
+                self.stats[local["source"]] += 1
+                self.stats["pubmed_saved"] += int(is_pubmed)
+            elif is_pubmed:
+                pending.append(index)
+            else:
+                dois[index] = None
+                self.stats["unresolved"] += 1
+
+        pending = self._resolve_from_other_sources(articles, dois, pending)
+        if pending:
+            pubmed_dois = await self._resolve_titles([articles[index]["title"] for index in pending])
+            for index in pending:
+                dois[index] = pubmed_dois.get(articles[index]["title"])
+                if dois[index] is None:
+                    self.stats["unresolved"] += 1
+
+        for index, article in enumerate(articles):
+            doi = dois.get(index)
+            article["url"] = f"https://doi.org/{doi}" if doi else None
+
+        self.logger.info(
+            f"Resolved DOIs: {dict(self.stats)}; {self.saved_lookups} PubMed lookups saved by local resolvers."
+        )
+        return articles
+
+    def _resolve_from_other_sources(
+        self, articles: List[Dict[str, Any]], dois: Dict[int, Optional[str]], pending: List[int]
+    ) -> List[int]:
+        """Resolves pending PubMed articles from journal articles of the same run with the same title and a DOI."""
+        known_titles = {
+            normalize_title(articles[index]["title"]): doi
+            for index, doi in dois.items()
+            if doi and "PubMed" in articles[index]["databases"]
+        }
+        still_pending = []
+        for index in pending:
+            doi = known_titles.get(normalize_title(articles[index]["title"]))
+            if doi:
+                dois[index] = doi
+                self.stats["cross_source"] += 1
+                self.stats["pubmed_saved"] += 1
+            else:
+                still_pending.append(index)
+        return still_pending
+
+    async def _resolve_titles(self, titles: List[str]) -> Dict[str, Optional[str]]:
+        """Resolves titles from the DOI cache, and the remaining ones from PubMed."""
+        dois: Dict[str, Optional[str]] = self.doi_cache.get_many(titles) if self.doi_cache else {}
+        cached_titles = set(dois)
+        # Cached misses save a lookup, but are counted as unresolved by `resolve`
+        self.stats["cache"] += sum(bool(dois.get(title)) for title in titles)
+        self.stats["pubmed_saved"] += sum(title in cached_titles for title in titles)
+
+        missing_titles = list(dict.fromkeys(title for title in titles if title not in cached_titles))
+        if missing_titles:
+            if self._client is None:
+                self._client = AsyncPubMedClient(ncbi_api_key=self.ncbi_api_key, http_config=self.http_config)
+            resolved_dois = await self._client.get_dois_from_titles(missing_titles)
+            if self.doi_cache:
+                self.doi_cache.set_many(resolved_dois)
+            dois.update(resolved_dois)
+            # Failed lookups and titles without a DOI are counted as unresolved by `resolve`
+            self.stats["pubmed"] += sum(
+                bool(resolved_dois.get(title)) for title in titles if title not in cached_titles
+            )
+        return dois
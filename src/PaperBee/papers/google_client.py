@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Sequence, Tuple
+
+import gspread
+from google.auth.transport.requests import Request
+from google.oauth2.service_account import Credentials
+
+# Access tokens are refreshed when they expire within this margin
+REFRESH_MARGIN = timedelta(minutes=5)
+
+_clients: Dict[Tuple[str, Tuple[str, ...]], Tuple[gspread.Client, Credentials]] = {}
+_clients_lock = threading.Lock()
+
+
+def _utcnow() -> datetime:
+    # google-auth stores token expiries as naive UTC datetimes
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def token_path(token_dir: str, credentials_json_path: str, scopes: Sequence[str]) -> str:
+    """
+    Returns the path of the cached access token of a service account and a set of scopes.
+
+    Args:
+        token_dir (str): Directory of the cached tokens.
+        credentials_json_path (str): Path to the service account's JSON credentials.
+        scopes (Sequence[str]): The OAuth scopes of the token.
+
+    Returns:
+        str: The path of the token file.
+    """
+    key = json.dumps([os.path.abspath(credentials_json_path), sorted(scopes)])
+    return os.path.join(token_dir, f"google_token_{hashlib.sha256(key.encode()).hexdigest()[:16]}.json")
+
+
+def _load_token(creds: Credentials, path: str) -> None:
+    """Restores a cached access token, if any, so that no token exchange is needed while it is valid."""
+    try:
+        with open(path) as token_file:
+            token = json.load(token_file)
+        creds.token = token["token"]
+        creds.expiry = datetime.fromisoformat(token["expiry"])
+    except (OSError, ValueError, KeyError):
+        return
+
+
+def _save_token(creds: Credentials, path: str) -> None:
+    """Writes the access token atomically, readable by the owner only."""
+    if creds.token is None or creds.expiry is None:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as token_file:
+        json.dump({"token": creds.token, "expiry": creds.expiry.isoformat()}, token_file)
+    os.replace(tmp_path, path)
+
+
+def get_client(
+    credentials_json_path: str,
+    scopes: Sequence[str],
+    token_dir: Optional[str] = None,
+) -> gspread.Client:
+    """
+    Returns the process-wide authorized gspread client of a service account, creating it on first use.
+
+    Clients are cached by credentials path and scopes. The access token is only refreshed when it expires within
+    `REFRESH_MARGIN`, and with `token_dir` it is persisted, so that short-lived processes reuse it instead of
+    exchanging a new one on every start.
+
+    Args:
+        credentials_json_path (str): Path to the service account's JSON credentials.
+        scopes (Sequence[str]): The OAuth scopes of the client.
+        token_dir (Optional[str]): Directory where the access token is cached. None keeps it in memory only.
+
+    Returns:
+        gspread.Client: The authorized client.
+    """
+    key = (os.path.abspath(credentials_json_path), tuple(sorted(scopes)))
+    path = token_path(token_dir, credentials_json_path, scopes) if token_dir else None
+    with _clients_lock:
+        if key not in _clients:
+            creds = Credentials.from_service_account_file(  # type: ignore[no-untyped-call]
+                credentials_json_path, scopes=list(scopes)
+            )
+            if path:
+                _load_token(creds, path)
+            _clients[key] = (gspread.authorize(creds), creds)
+        client, creds = _clients[key]
+        if creds.token is None or creds.expiry is None or creds.expiry - REFRESH_MARGIN <= _utcnow():
+            creds.refresh(Request())  # type: ignore[no-untyped-call]
+            if path:
+                _save_token(creds, path)
+        return client
+
+
+def clear_clients() -> None:
+    """Forgets the cached clients, e.g. after the credentials were rotated."""
+    with _clients_lock:
+        _clients.clear()
@@ -1,7 +1,382 @@
+import json
+import os
+import random
+import time
 from typing import Any, ClassVar, Dict, List, Optional, Tuple, Union, cast
 
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from gspread.utils import Dimension, rowcol_to_a1
+
+from .google_client import get_client
+from .paper_record import COLUMNS
+
+# Title of the filter view listing the papers newest first, for sheets written in append mode
+NEWEST_FIRST_VIEW = "Newest first"
+
+
+class SheetSession:
+    """
+    A snapshot of one worksheet, fetched once per run and reused for deduplication and insertion.
+
+    Only the header row and the key columns (by default DOI and Title) are downloaded, in a single batch request
+    for the columns. The number of data rows is cached and kept up to date by `insert_rows`.
+
+    Rows are inserted with one `batch_update` request that inserts the rows and fills their cells, so an insertion
+    either succeeds or leaves the sheet unchanged. Inserting near the top shifts every row below, which gets slow on
+    large sheets; `append_rows` instead writes after the last row, and a filter view sorted by date lists the papers
+    newest first (see `migrate_to_append`). Requests failing with 429 (quota exceeded) or a 5xx error are retried
+    with exponential backoff and jitter.
+
+    Args:
+        worksheet (gspread.Worksheet): The opened worksheet.
+        key_columns (Tuple[str, ...]): Header names of the columns to fetch.
+        n_retries (int): Number of attempts of each write request.
+        backoff (float): Base delay in seconds of the exponential backoff.
+        max_backoff (float): Maximum delay in seconds between two attempts.
+
+    Methods:
+        records(): Returns the values of the key columns of every data row.
+        dois(): Returns the DOIs listed in the sheet.
+        read_rows(first_row, last_row): Reads the key columns of a range of rows, without caching them.
+        revision(): Returns the time of the last modification of the spreadsheet.
+        insert_rows(rows_data, row): Inserts new rows and updates the snapshot.
+        append_rows(rows_data): Appends new rows after the last row and updates the snapshot.
+        filter_views(): Returns the titles of the filter views of the sheet.
+        migrate_to_append(column, view_title): Sorts the rows oldest first and adds a filter view sorted newest first.
+    """
+
+    RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        worksheet: gspread.Worksheet,
+        key_columns: Tuple[str, ...] = ("DOI", "Title"),
+        n_retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 64.0,
+    ) -> None:
+        self.worksheet: gspread.Worksheet = worksheet
+        self.key_columns: Tuple[str, ...] = key_columns
+        self.n_retries: int = n_retries
+        self.backoff: float = backoff
+        self.max_backoff: float = max_backoff
+        self._row_count: int = int(worksheet.row_count)  # Not updated by gspread after batch updates
+        self._header: Optional[List[Any]] = None
+        self._records: Optional[List[Dict[str, Any]]] = None
+        self._nr_rows: Optional[int] = None
+
+    @property
+    def header(self) -> List[Any]:
+        """The values of the header row."""
+        if self._header is None:
+            self._header = self.worksheet.row_values(1)
+        return self._header
+
+    @property
+    def row_count(self) -> int:
+        """The number of rows of the sheet grid, including the header and empty rows. Needs no request."""
+        return self._row_count
+
+    def _read_columns(self, first_row: int, last_row: Optional[int]) -> Tuple[List[str], List[List[Any]]]:
+        """Reads the key columns between two rows with one batch request."""
+        columns = [column for column in self.key_columns if column in self.header]
+        letters = [rowcol_to_a1(1, self.header.index(column) + 1)[:-1] for column in columns]
+        ranges = [f"{letter}{first_row}:{letter}{last_row or ''}" for letter in letters]  # e.g. 'A2:A', to the end
+        values = self.worksheet.batch_get(ranges, major_dimension=Dimension.cols) if ranges else []
+        return columns, [value_range[0] if value_range else [] for value_range in values]
+
+    @staticmethod
+    def _to_records(columns: List[str], column_values: List[List[Any]]) -> List[Dict[str, Any]]:
+        nr_rows = max((len(column) for column in column_values), default=0)
+        records = []
+        for i in range(nr_rows):
+            record = {column: col[i] if i < len(col) else "" for column, col in zip(columns, column_values)}
+            if any(record.values()):  # Skip empty rows
+                records.append(record)
+        return records
+
+    def _fetch(self) -> List[Dict[str, Any]]:
+        if self._records is None:
+            columns, column_values = self._read_columns(2, None)
+            self._nr_rows = max((len(column) for column in column_values), default=0)
+            self._records = self._to_records(columns, column_values)
+        return self._records
+
+    @property
+    def nr_rows(self) -> int:
+        """The number of data rows, excluding the header."""
+        if self._nr_rows is None:
+            self._fetch()
+        return cast(int, self._nr_rows)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """
+        Returns the values of the key columns of every non-empty data row.
+
+        Returns:
+            List[Dict[str, Any]]: One dictionary per row, keyed by column name.
+        """
+        return self._fetch()
+
+    def dois(self) -> List[str]:
+        """Returns the DOIs listed in the sheet."""
+        return [record["DOI"] for record in self._fetch() if record.get("DOI")]
+
+    def read_rows(self, first_row: int = 2, last_row: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Reads the key columns of a range of rows, e.g. only the rows added since the last run.
+
+        Args:
+            first_row (int): The first row to read, counting the header as row 1. Defaults to 2.
+            last_row (Optional[int]): The last row to read. Defaults to the last row of the sheet.
+
+        Returns:
+            List[Dict[str, Any]]: One dictionary per non-empty row, keyed by column name.
+        """
+        if self._records is not None and first_row == 2 and last_row is None:
+            return self._records
+        return self._to_records(*self._read_columns(first_row, last_row))
+
+    def revision(self) -> Optional[str]:
+        """
+        Returns the time of the last modification of the spreadsheet, which changes with every edit.
+
+        Returns:
+            Optional[str]: The modification time from the Drive API, or None if it is not available, e.g. because the
+                credentials cannot read the Drive metadata of the spreadsheet.
+        """
+        try:
+            return str(self.worksheet.spreadsheet.get_lastUpdateTime())
+        except Exception:
+            return None
+
+    def _batch_update(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Sends a batch update, retrying quota and server errors with exponential backoff and jitter."""
+        for attempt in range(self.n_retries):
+            try:
+                return cast(Dict[str, Any], self.worksheet.spreadsheet.batch_update(body))
+            except gspread.exceptions.APIError as err:
+                if err.response.status_code not in self.RETRY_STATUS_CODES or attempt == self.n_retries - 1:
+                    raise
+                delay = min(self.max_backoff, self.backoff * 2**attempt) + random.uniform(0, self.backoff)
+                print(f"Google Sheets request failed ({err.response.status_code}), retrying in {delay:.1f}s.")
+                time.sleep(delay)
+        return {}
+
+    def insert_rows(self, rows_data: List[List[Union[str, int, float]]], row: int = 2) -> None:
+        """
+        Inserts new rows starting from the given row index with one atomic request, and adds them to the snapshot.
+
+        Args:
+            rows_data (List[List[Union[str, int, float]]]): A list of lists, each inner list representing row values.
+            row (int): The index at which to start inserting new rows. Defaults to 2.
+        """
+        if self._nr_rows is not None:
+            inherit_from_before = 2 <= row <= self._nr_rows
+        else:  # Check the row itself instead of downloading the snapshot
+            inherit_from_before = row >= 2 and any(self.worksheet.row_values(row + 1))
+        rows_range = {"sheetId": self.worksheet.id, "startIndex": row - 1, "endIndex": row - 1 + len(rows_data)}
+        self._batch_update({
+            "requests": [
+                {
+                    "insertDimension": {
+                        "range": {**rows_range, "dimension": Dimension.rows},
+                        "inheritFromBefore": inherit_from_before,
+                    }
+                },
+                {
+                    "updateCells": {
+                        "start": {"sheetId": self.worksheet.id, "rowIndex": row - 1, "columnIndex": 0},
+                        "rows": [{"values": [_cell(value) for value in values]} for values in rows_data],
+                        "fields": "userEnteredValue",
+                    }
+                },
+            ]
+        })
+        self._row_count += len(rows_data)
+        self._add_to_snapshot(rows_data)
+
+    def append_rows(self, rows_data: List[List[Union[str, int, float]]]) -> None:
+        """
+        Appends new rows after the last row with data with one atomic request, and adds them to the snapshot.
+
+        No existing row is moved, so the request takes the same time however large the sheet is. Empty rows at the
+        bottom of the grid are filled first, and the grid grows when they run out.
+
+        Args:
+            rows_data (List[List[Union[str, int, float]]]): A list of lists, each inner list representing row values.
+        """
+        response = self._batch_update({
+            "requests": [
+                {
+                    "appendCells": {
+                        "sheetId": self.worksheet.id,
+                        "rows": [{"values": [_cell(value) for value in values]} for values in rows_data],
+                        "fields": "userEnteredValue",
+                    }
+                }
+            ],
+            # The grid only grows when the empty rows run out: read its new size from the response
+            "includeSpreadsheetInResponse": True,
+            "responseIncludeGridData": False,
+        })
+        for sheet in response.get("updatedSpreadsheet", {}).get("sheets", []):
+            properties = sheet.get("properties", {})
+            if properties.get("sheetId") == self.worksheet.id:
+                self._row_count = int(properties.get("gridProperties", {}).get("rowCount", self._row_count))
+        self._add_to_snapshot(rows_data)
+
+    def _add_to_snapshot(self, rows_data: List[List[Union[str, int, float]]]) -> None:
+        if self._records is not None and self._nr_rows is not None:
+            for values in rows_data:
+                row_values = dict(zip(self.header, values))
+                self._records.append({column: row_values.get(column, "") for column in self.key_columns})
+            self._nr_rows += len(rows_data)
+
+    def filter_views(self) -> List[str]:
+        """
+        Returns the titles of the filter views of the sheet.
+
+        Returns:
+            List[str]: The titles, in the order of the spreadsheet metadata.
+        """
+        metadata = self.worksheet.spreadsheet.fetch_sheet_metadata({
+            "fields": "sheets(properties.sheetId,filterViews.title)"
+        })
+        for sheet in metadata.get("sheets", []):
+            if sheet.get("properties", {}).get("sheetId") == self.worksheet.id:
+                return [view.get("title", "") for view in sheet.get("filterViews", [])]
+        return []
+
+    def migrate_to_append(self, column: str = "Date", view_title: str = NEWEST_FIRST_VIEW) -> None:
+        """
+        Prepares a sheet written newest first at the top for `append_rows`, with one atomic request.
+
+        The data rows are sorted oldest first by the given column, so that appended rows continue the order, and a
+        filter view sorted newest first by the same column is added unless a filter view with its title exists. The
+        filter view spans the whole sheet, so it includes the rows appended later. Running it again is harmless.
+
+        Args:
+            column (str): Header name of the column to sort by, formatted so that text order is date order.
+            view_title (str): Title of the filter view sorted newest first.
+
+        Raises:
+            ValueError: If the sheet has no column with the given header name.
+        """
+        if column not in self.header:
+            e = f"Column '{column}' not found in the header of the sheet."
+            raise ValueError(e)
+        column_index = self.header.index(column)
+        requests: List[Dict[str, Any]] = [
+            {
+                "sortRange": {
+                    "range": {"sheetId": self.worksheet.id, "startRowIndex": 1},
+                    "sortSpecs": [{"dimensionIndex": column_index, "sortOrder": "ASCENDING"}],
+                }
+            }
+        ]
+        if view_title not in self.filter_views():
+            requests.append({
+                "addFilterView": {
+                    "filter": {
+                        "title": view_title,
+                        "range": {"sheetId": self.worksheet.id},
+                        "sortSpecs": [{"dimensionIndex": column_index, "sortOrder": "DESCENDING"}],
+                    }
+                }
+            })
+        self._batch_update({"requests": requests})
+        # The rows moved: the snapshot is fetched again when needed
+        self._records = None
+        self._nr_rows = None
+
+
+def _cell(value: Any) -> Dict[str, Any]:
+    """Converts a value into the cell data of a batch update, stored as entered like `valueInputOption=RAW`."""
+    if value is None or value == "":
+        return {}
+    if isinstance(value, bool):
+        return {"userEnteredValue": {"boolValue": value}}
+    if isinstance(value, (int, float)):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
+
+class SheetWriter:
+    """
+    Writes rows to a sheet in chunks, recording its progress so that a failed write can be resumed.
+
+    Each chunk is one atomic insertion (see `SheetSession.insert_rows`), placed below the chunks before it so the rows
+    keep their order. In append mode, chunks are appended after the last row instead (see `SheetSession.append_rows`).
+    After each chunk, the DOIs (the first column) of the written rows are saved to a progress file. When a write fails,
+    e.g. after exhausting the retries of a quota error, writing the same rows again skips the written ones and continues
+    below them, without creating duplicates. The progress file is deleted once all rows are written.
+
+    Args:
+        session (SheetSession): The session of the sheet to write to.
+        progress_path (str): Path to the JSON progress file.
+        key (str): Identifies the sheet in the progress file, e.g. the spreadsheet ID and the sheet name.
+        chunk_size (int): Number of rows per request.
+        append (bool): Append the rows after the last row instead of inserting them at a given row.
+
+    Methods:
+        write(rows_data, row): Writes rows, resuming a previous failed write.
+    """
+
+    def __init__(
+        self, session: SheetSession, progress_path: str, key: str, chunk_size: int = 500, append: bool = False
+    ) -> None:
+        self.session: SheetSession = session
+        self.progress_path: str = progress_path
+        self.key: str = key
+        self.chunk_size: int = chunk_size
+        self.append: bool = append
+
+    def _load_progress(self) -> Tuple[Optional[int], List[str]]:
+        """Returns the start row and the written DOIs of an unfinished write to this sheet."""
+        if not os.path.exists(self.progress_path):
+            return None, []
+        with open(self.progress_path) as progress_file:
+            progress = json.load(progress_file)
+        if progress.get("sheet") != self.key:
+            return None, []
+        return int(progress["row"]), list(progress["dois"])
+
+    def _save_progress(self, row: int, dois: List[str]) -> None:
+        tmp_path = f"{self.progress_path}.tmp"
+        with open(tmp_path, "w") as progress_file:
+            json.dump({"sheet": self.key, "row": row, "dois": dois}, progress_file)
+        os.replace(tmp_path, self.progress_path)
+
+    def write(self, rows_data: List[List[Union[str, int, float]]], row: int = 2) -> int:
+        """
+        Writes rows in chunks, starting at the given row or after the rows of a previous failed write.
+
+        Args:
+            rows_data (List[List[Union[str, int, float]]]): The rows to write, with the DOI in the first column.
+            row (int): The index at which to start inserting new rows. Defaults to 2. Ignored in append mode.
+
+        Returns:
+            int: The number of rows written by this call.
+        """
+        start_row, written = self._load_progress()
+        if start_row is not None:
+            row = start_row
+        written_dois = set(written)
+        pending = [values for values in rows_data if str(values[0]) not in written_dois]
+
+        for start in range(0, len(pending), self.chunk_size):
+            chunk = pending[start : start + self.chunk_size]
+            if self.append:
+                self.session.append_rows(chunk)
+            else:
+                self.session.insert_rows(chunk, row=row + len(written))
+            written.extend(str(values[0]) for values in chunk)
+            self._save_progress(row, written)
+
+        if os.path.exists(self.progress_path):
+            os.remove(self.progress_path)
+        return len(pending)
 
 
 class GoogleSheetsUpdater:
@@ -13,9 +388,12 @@ class GoogleSheetsUpdater:
         credentials_json_path (str): The file path to the service account's JSON credentials.
 
     Methods:
-        authenticate_google(): Authenticates with Google API using service account credentials.
+        authenticate_google(): Returns the shared client authorized with the service account credentials.
+        session(sheet_name, create): Opens a sheet once per run and returns its cached snapshot.
+        worksheet_titles(): Returns the titles of the worksheets of the spreadsheet.
         open_sheet(sheet_name): Opens a specific sheet by name within the spreadsheet.
         read_sheet_data(sheet_name): Reads all data from the specified sheet.
+        read_dois(sheet_name): Reads the DOI and Title columns of the specified sheet.
         insert_rows(sheet_name, rows_data, row): Inserts new rows into the specified sheet.
     """
 
@@ -25,37 +403,48 @@ class GoogleSheetsUpdater:
         "https://www.googleapis.com/auth/spreadsheets",
     ]
 
-    def __init__(self, spreadsheet_id: str, credentials_json_path: str) -> None:
+    def __init__(self, spreadsheet_id: str, credentials_json_path: str, token_dir: Optional[str] = None) -> None:
         """
         Initializes the GoogleSheetsUpdater with a spreadsheet ID and credentials path.
 
         Args:
             spreadsheet_id (str): The unique ID of the Google Spreadsheet to be updated.
             credentials_json_path (str): The file path to the JSON credentials for Google API authentication.
+            token_dir (Optional[str]): Directory where the access token is cached between processes.
         """
         self.spreadsheet_id: str = spreadsheet_id
         self.credentials_json_path: str = credentials_json_path
-        self.creds = self.authenticate_google()
-        self.client = gspread.authorize(self.creds)
+        self.token_dir: Optional[str] = token_dir
+        self.client: gspread.Client = self.authenticate_google()
+        self._sessions: Dict[str, SheetSession] = {}
 
-    def authenticate_google(self) -> ServiceAccountCredentials:
-        """Authenticates with Google API using service account credentials."""
-        creds = ServiceAccountCredentials.from_json_keyfile_name(self.credentials_json_path, self.SCOPES)
-        return creds
+    def authenticate_google(self) -> gspread.Client:
+        """Returns the process-wide client authorized with the service account credentials, see `get_client`."""
+        return get_client(self.credentials_json_path, self.SCOPES, token_dir=self.token_dir)
 
-    def open_sheet(self, sheet_name: str = "Sheet1") -> Optional[Tuple[gspread.Worksheet, int]]:
+    def session(self, sheet_name: str = "Sheet1", create: bool = False) -> Optional[SheetSession]:
         """
-        Opens a Google Sheet by its name.
+        Opens a worksheet once and returns its session, reused by later calls for the same sheet.
 
         Args:
             sheet_name (str): The name of the sheet to open. Defaults to 'Sheet1'.
+            create (bool): Create the sheet, with the header row of the papers, if it does not exist.
 
         Returns:
-            Optional[Tuple[gspread.Worksheet, int]]: A tuple containing the opened sheet and number of rows, or None if failed.
+            Optional[SheetSession]: The session of the sheet, or None if the sheet could not be opened.
         """
+        if sheet_name in self._sessions:
+            return self._sessions[sheet_name]
+        created = False
         try:
-            sheet = self.client.open_by_key(self.spreadsheet_id).worksheet(sheet_name)
-            nr_rows = len(sheet.get_all_records())
+            spreadsheet = self.client.open_by_key(self.spreadsheet_id)
+            try:
+                sheet = spreadsheet.worksheet(sheet_name)
+            except gspread.WorksheetNotFound:
+                if not create:
+                    raise
+                sheet = self._create_sheet(spreadsheet, sheet_name)
+                created = True
         except gspread.SpreadsheetNotFound:
             print(f"Spreadsheet with ID {self.spreadsheet_id} not found.")
         except gspread.WorksheetNotFound:
@@ -63,12 +452,50 @@ class GoogleSheetsUpdater:
         except Exception as e:
             print(f"Failed to open the sheet: {e}")
         else:
-            return sheet, nr_rows
+            session = SheetSession(sheet)
+            if created:  # Nothing to fetch from a new sheet
+                session._header, session._records, session._nr_rows = list(COLUMNS), [], 0
+            self._sessions[sheet_name] = session
+            return session
         return None
 
+    @staticmethod
+    def _create_sheet(spreadsheet: gspread.Spreadsheet, sheet_name: str) -> gspread.Worksheet:
+        """Adds a worksheet with the header row of the papers and one empty row."""
+        sheet = spreadsheet.add_worksheet(title=sheet_name, rows=2, cols=len(COLUMNS))
+        sheet.update([list(COLUMNS)], "A1")
+        return sheet
+
+    def worksheet_titles(self) -> List[str]:
+        """
+        Returns the titles of the worksheets of the spreadsheet.
+
+        Returns:
+            List[str]: The titles, in the order of the tabs.
+
+        Raises:
+            gspread.SpreadsheetNotFound: If the spreadsheet cannot be opened.
+        """
+        return [sheet.title for sheet in self.client.open_by_key(self.spreadsheet_id).worksheets()]
+
+    def open_sheet(self, sheet_name: str = "Sheet1") -> Optional[Tuple[gspread.Worksheet, int]]:
+        """
+        Opens a Google Sheet by its name.
+
+        Args:
+            sheet_name (str): The name of the sheet to open. Defaults to 'Sheet1'.
+
+        Returns:
+            Optional[Tuple[gspread.Worksheet, int]]: A tuple containing the opened sheet and number of rows, or None if failed.
+        """
+        session = self.session(sheet_name)
+        if session is None:
+            return None
+        return session.worksheet, session.nr_rows
+
     def read_sheet_data(self, sheet_name: str = "Sheet1") -> Optional[List[Dict[Any, Any]]]:
         """
-        Reads data from a specified sheet.
+        Reads all data from a specified sheet.
 
         Args:
             sheet_name (str): The name of the sheet to read data from. Defaults to 'Sheet1'.
@@ -76,12 +503,26 @@ class GoogleSheetsUpdater:
         Returns:
             Optional[List[dict]]: A list of dictionaries representing each row's data, or None if the sheet could not be opened.
         """
-        sheet_data = self.open_sheet(sheet_name)
-        if sheet_data is None:
+        session = self.session(sheet_name)
+        if session is None:
             return None
+        return cast(List[Dict[Any, Any]], session.worksheet.get_all_records())
+
+    def read_dois(self, sheet_name: str = "Sheet1") -> Optional[List[Dict[str, Any]]]:
+        """
+        Reads the DOI and Title of every row from the snapshot of a sheet, without downloading the other columns.
 
-        sheet, _ = sheet_data
-        return cast(List[Dict[Any, Any]], sheet.get_all_records())
+        Args:
+            sheet_name (str): The name of the sheet to read. Defaults to 'Sheet1'.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: One dictionary per row with the keys 'DOI' and 'Title', or None if the sheet
+                could not be opened.
+        """
+        session = self.session(sheet_name)
+        if session is None:
+            return None
+        return session.records()
 
     def insert_rows(
         self,
@@ -99,27 +540,14 @@ class GoogleSheetsUpdater:
 
         Raises:
             ValueError: If rows_data is empty or None.
-            AssertionError: If specified row index is out of sheet's current bounds.
         """
         if rows_data is None or not rows_data:
             e = "Rows data is empty"
             raise ValueError(e)
 
-        sheet_data = self.open_sheet(sheet_name)
-        if sheet_data is None:
+        session = self.session(sheet_name)
+        if session is None:
             e = f"Failed to open the specified sheet '{sheet_name}' for inserting rows."
             raise ValueError(e)
 
-        sheet, nr_rows = sheet_data
-
-        # Ensure the row index is within valid bounds (either append or insert)
-        # This causes an error, so it is now commented out. Not sure why it was needed in the first place
-        # if row > nr_rows + 1:
-        #     e = f"Selected row index {row} is too high for the sheet having {nr_rows} rows."
-        #     raise AssertionError(e)
-
-        inherit_from_before = 2 <= row <= nr_rows
-        if len(rows_data) == 1:
-            sheet.insert_row(values=rows_data[0], index=row, inherit_from_before=inherit_from_before)
-        else:
-            sheet.insert_rows(values=rows_data, row=row, inherit_from_before=inherit_from_before)
+        session.insert_rows(rows_data, row=row)
@@ -0,0 +1,161 @@
+import importlib.util
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@dataclass
+class HTTPSessionConfig:
+    """
+    Settings of the shared, connection-pooled HTTP clients.
+
+    Args:
+        max_connections (int): Maximum number of open connections.
+        max_keepalive_connections (int): Maximum number of idle connections kept alive for reuse.
+        keepalive_expiry (float): Seconds after which an idle connection is closed.
+        http2 (bool): Use HTTP/2 when the `h2` package is installed.
+        retries (int): Number of transport-level retries on connection errors.
+        timeout (float): Timeout in seconds for each request.
+    """
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30
+    http2: bool = True
+    retries: int = 3
+    timeout: float = 30
+
+    @property
+    def use_http2(self) -> bool:
+        """Whether HTTP/2 is requested and available."""
+        return self.http2 and importlib.util.find_spec("h2") is not None
+
+
+class ConnectionStats:
+    """
+    Counts requests and newly opened connections to show how well connections are reused.
+
+    Attributes:
+        requests (int): Number of requests sent.
+        connections (int): Number of connections opened.
+    """
+
+    def __init__(self) -> None:
+        self.requests: int = 0
+        self.connections: int = 0
+
+    @property
+    def reused(self) -> int:
+        """Number of requests sent over an already open connection."""
+        return max(0, self.requests - self.connections)
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Share of requests that reused a connection."""
+        return self.reused / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "reused": self.reused,
+            "reuse_ratio": round(self.reuse_ratio, 3),
+        }
+
+    def __repr__(self) -> str:
+        return f"ConnectionStats({self.as_dict()})"
+
+
+def create_async_client(
+    config: Optional[HTTPSessionConfig] = None,
+    stats: Optional[ConnectionStats] = None,
+) -> httpx.AsyncClient:
+    """
+    Creates an asynchronous HTTP client with keep-alive, pool limits, HTTP/2 if available and transport retries.
+
+    Args:
+        config (Optional[HTTPSessionConfig]): The client settings. Defaults to `HTTPSessionConfig()`.
+        stats (Optional[ConnectionStats]): If given, updated with the number of requests and opened connections.
+
+    Returns:
+        httpx.AsyncClient: The configured client. It must be closed by the caller.
+    """
+    config = config or HTTPSessionConfig()
+    limits = httpx.Limits(
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive_connections,
+        keepalive_expiry=config.keepalive_expiry,
+    )
+    transport = httpx.AsyncHTTPTransport(http2=config.use_http2, limits=limits, retries=config.retries)
+    event_hooks: Dict[str, Any] = {}
+    if stats is not None:
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                stats.connections += 1
+
+        async def on_request(request: httpx.Request) -> None:
+            stats.requests += 1
+            request.extensions["trace"] = trace
+
+        event_hooks["request"] = [on_request]
+
+    return httpx.AsyncClient(transport=transport, timeout=config.timeout, event_hooks=event_hooks)
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def create_session(config: Optional[HTTPSessionConfig] = None) -> requests.Session:
+    """
+    Creates a synchronous HTTP session with a connection pool and transport-level retries.
+
+    HTTP/2 is not supported by `requests`; use `create_async_client` for it.
+
+    Args:
+        config (Optional[HTTPSessionConfig]): The session settings. Defaults to `HTTPSessionConfig()`.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    config = config or HTTPSessionConfig()
+    retry = Retry(
+        total=config.retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=None,  # NCBI lookups are idempotent, POST included
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.max_keepalive_connections,
+        pool_maxsize=config.max_connections,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(config: Optional[HTTPSessionConfig] = None) -> requests.Session:
+    """
+    Returns the process-wide synchronous HTTP session, creating it on first use.
+
+    Args:
+        config (Optional[HTTPSessionConfig]): The session settings, only used when the session is created.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session(config)
+        return _session
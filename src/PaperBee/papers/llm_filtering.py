@@ -1,20 +1,59 @@
-import time
+import asyncio
+import random
 from typing import List, Optional, Union
 
+import httpx
+import openai
 import pandas as pd
-from ollama import Client
-from openai import OpenAI
+from ollama import AsyncClient, Client, ResponseError
+from openai import AsyncOpenAI, OpenAI
+
+OLLAMA_HOST = "http://localhost:11434"
+
+# Ollama status codes worth another attempt
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def is_transient(err: BaseException) -> bool:
+    """Checks whether a failed LLM request is worth another attempt, e.g. after a timeout or a rate limit."""
+    if isinstance(
+        err,
+        (
+            asyncio.TimeoutError,
+            httpx.TransportError,
+            openai.APIConnectionError,
+            openai.RateLimitError,
+            openai.InternalServerError,
+        ),
+    ):
+        return True
+    return isinstance(err, ResponseError) and err.status_code in RETRY_STATUS_CODES
 
 
 class LLMFilter:
     """
     A class to filter articles using an LLM (Language Model) based on titles and optional keywords.
 
+    `filter_articles_async` sends the requests with an `AsyncOpenAI` or Ollama `AsyncClient`, with at most
+    `max_concurrency` of them in flight. Each request has a timeout, and timeouts, rate limits and server errors are
+    retried with exponential backoff and jitter.
+
     Args:
         df (pd.DataFrame): DataFrame containing the articles to be filtered.
         client_type (str): The type of client to use ("openai" or "ollama"). Defaults to "openai".
         model (str): The model to use for filtering. Defaults to "gpt-3.5-turbo".
         filtering_prompt (str): The prompt content for filtering the articles.
+        max_concurrency (int): Maximum number of requests in flight.
+        timeout (float): Timeout in seconds of each request.
+        n_retries (int): Number of attempts of each request.
+        backoff (float): Base delay in seconds of the exponential backoff.
+        async_client (Optional[Union[AsyncOpenAI, AsyncClient]]): Pre-initialized async client (for testing/mocking).
+
+    Methods:
+        is_relevant(client, filtering_prompt, title, keywords, model): Asks the LLM whether a publication is relevant.
+        is_relevant_async(client, title, keywords): Asks the LLM asynchronously, with a timeout and retries.
+        filter_articles_async(): Keeps the relevant articles, asking the LLM concurrently.
+        filter_articles(): Runs `filter_articles_async` outside of an event loop.
     """
 
     def __init__(
@@ -24,6 +63,11 @@ class LLMFilter:
         model: str = "gpt-3.5-turbo",
         filtering_prompt: str = "",
         OPENAI_API_KEY: str = "",
+        max_concurrency: int = 8,
+        timeout: float = 60,
+        n_retries: int = 3,
+        backoff: float = 1.0,
+        async_client: Optional[Union[AsyncOpenAI, AsyncClient]] = None,
     ) -> None:
         """
         Initializes the LLMFilter with a DataFrame of articles and an LLM model.
@@ -37,15 +81,29 @@ class LLMFilter:
         self.llm_provider: str = llm_provider.lower()
         self.model: str = model
         self.filtering_prompt: str = filtering_prompt
+        self.OPENAI_API_KEY: str = OPENAI_API_KEY
+        self.max_concurrency: int = max_concurrency
+        self.timeout: float = timeout
+        self.n_retries: int = n_retries
+        self.backoff: float = backoff
+        self.async_client: Optional[Union[AsyncOpenAI, AsyncClient]] = async_client
         self.client: Union[OpenAI, Client]
         if self.llm_provider == "openai":
             self.client = OpenAI(api_key=OPENAI_API_KEY)
         elif self.llm_provider == "ollama":
-            self.client = Client(host="http://localhost:11434", headers={"x-some-header": "some-value"})
+            self.client = Client(host=OLLAMA_HOST, headers={"x-some-header": "some-value"})
         else:
             e = "Invalid client_type. Choose 'openai' or 'ollama'."
             raise ValueError(e)
 
+    @staticmethod
+    def _message(title: str, keywords: Union[str, List[str], None] = None) -> str:
+        if keywords and isinstance(keywords, str):  # The Keywords column is already comma-separated
+            return f"Title of the publication: '{title}'\nKeywords: {keywords}"
+        if keywords:
+            return f"Title of the publication: '{title}'\nKeywords: {', '.join(keywords)}"
+        return f"Title of the publication: '{title}'"
+
     def is_relevant(
         self,
         client: Union[OpenAI, Client],
@@ -68,10 +126,7 @@ class LLMFilter:
         Returns:
             bool: True if the publication is deemed relevant, otherwise False.
         """
-        if keywords:
-            message = f"Title of the publication: '{title}'\nKeywords: {', '.join(keywords)}"
-        else:
-            message = f"Title of the publication: '{title}'"
+        message = self._message(title, keywords)
 
         if isinstance(client, Client):
             # Use Ollama
@@ -103,26 +158,91 @@ class LLMFilter:
         else:
             return False
 
+    def _create_async_client(self) -> Union[AsyncOpenAI, AsyncClient]:
+        """Creates the async client of the provider; retries are left to `is_relevant_async`."""
+        if self.llm_provider == "openai":
+            return AsyncOpenAI(api_key=self.OPENAI_API_KEY, timeout=self.timeout, max_retries=0)
+        return AsyncClient(host=OLLAMA_HOST, headers={"x-some-header": "some-value"}, timeout=self.timeout)
+
+    async def _ask(self, client: Union[AsyncOpenAI, AsyncClient], message: str) -> Optional[str]:
+        """Sends one chat request and returns the answer."""
+        messages = [
+            {"role": "system", "content": self.filtering_prompt},
+            {"role": "user", "content": message},
+        ]
+        if isinstance(client, AsyncClient):
+            ollama_response = await client.chat(model=self.model, messages=messages)
+            return str(ollama_response["message"]["content"])
+        response = await client.chat.completions.create(model=self.model, messages=messages)  # type: ignore[arg-type]
+        return response.choices[0].message.content
+
+    async def is_relevant_async(
+        self,
+        client: Union[AsyncOpenAI, AsyncClient],
+        title: str,
+        keywords: Union[str, List[str], None] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> bool:
+        """
+        Determines asynchronously if a publication is relevant, retrying timeouts and transient errors.
+
+        Args:
+            client (Union[AsyncOpenAI, AsyncClient]): The async client of the provider.
+            title (str): The title of the publication.
+            keywords (Union[str, List[str], None]): The keywords of the publication, as a list or comma-separated.
+            semaphore (Optional[asyncio.Semaphore]): Limits the number of requests in flight.
+
+        Returns:
+            bool: True if the publication is deemed relevant, otherwise False.
+
+        Raises:
+            Exception: The error of the last attempt, or of the first attempt if it is not transient.
+        """
+        message = self._message(title, keywords)
+        semaphore = semaphore or asyncio.Semaphore(1)
+        for attempt in range(self.n_retries):
+            try:
+                async with semaphore:
+                    content = await asyncio.wait_for(self._ask(client, message), timeout=self.timeout)
+            except Exception as err:
+                if not is_transient(err) or attempt == self.n_retries - 1:
+                    raise
+                await asyncio.sleep(self.backoff * 2**attempt + random.uniform(0, self.backoff))
+            else:
+                return content is not None and "yes" in content.lower()
+        return False
+
+    async def filter_articles_async(self) -> pd.DataFrame:
+        """
+        Filters the articles by asking the LLM about all of them concurrently.
+
+        Returns:
+            pd.DataFrame: A filtered DataFrame containing only the articles deemed relevant by the LLM, in their order.
+        """
+        if self.df.empty:
+            return self.df
+        client = self.async_client or self._create_async_client()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        try:
+            relevant = await asyncio.gather(
+                *(
+                    self.is_relevant_async(client, article["Title"], article.get("Keywords"), semaphore)
+                    for _, article in self.df.iterrows()
+                )
+            )
+        finally:
+            if self.async_client is None and isinstance(client, AsyncOpenAI):
+                await client.close()
+        # gather returns the results in the order of the articles
+        return self.df.loc[[index for index, keep in zip(self.df.index, relevant) if keep]]
+
     def filter_articles(self) -> pd.DataFrame:
         """
         Filters the articles in the DataFrame by determining their relevance using the LLM.
 
+        Must not be called from a running event loop; use `filter_articles_async` there.
+
         Returns:
             pd.DataFrame: A filtered DataFrame containing only the articles deemed relevant by the LLM.
         """
-        retained_indices: List[int] = []
-
-        for index, article in self.df.iterrows():
-            if self.is_relevant(
-                client=self.client,
-                filtering_prompt=self.filtering_prompt,
-                title=article["Title"],
-                keywords=article.get("Keywords"),
-                model=self.model,
-            ):
-                retained_indices.append(index)
-
-            time.sleep(0.2)  # 100ms delay between requests to not exceed the rate limit
-
-        # Return a DataFrame containing only the retained articles
-        return self.df.loc[retained_indices]
+        return asyncio.run(self.filter_articles_async())
@@ -3,6 +3,8 @@ from typing import Any, List, Optional, Tuple
 
 from mattermostdriver import Driver
 
+from .paper_record import PaperRecord
+
 
 class MattermostPaperPublisher:
     """
@@ -58,7 +60,7 @@ class MattermostPaperPublisher:
 
     @staticmethod
     def format_papers(
-        papers_list: List[List[str]],
+        papers_list: List[PaperRecord],
     ) -> Tuple[List[str], List[str]]:
         """
         Splits and formats papers into preprints and regular papers for Mattermost.
@@ -69,18 +71,10 @@ class MattermostPaperPublisher:
         """
         papers = []
         preprints = []
-        for idx, paper in enumerate(papers_list):
-            if not isinstance(paper, list) or len(paper) < 6:
-                print(f"Warning: Skipping invalid paper at index {idx}: {paper}")
-                continue
-            emoji = "✏️" if paper[3] == "TRUE" else "🗞️"
-            title = paper[4]
-            link = paper[-1]
-            if not isinstance(title, str) or not isinstance(link, str):
-                print(f"Warning: Skipping paper with invalid title or link at index {idx}: {paper}")
-                continue
-            formatted_paper = f"{emoji} [{title}]({link})"
-            if paper[3] == "TRUE":
+        for paper in papers_list:
+            emoji = "✏️" if paper.is_preprint else "🗞️"
+            formatted_paper = f"{emoji} [{paper.title}]({paper.url})"
+            if paper.is_preprint:
                 preprints.append(formatted_paper)
             else:
                 papers.append(formatted_paper)
@@ -117,7 +111,7 @@ class MattermostPaperPublisher:
         message_blocks.append(footer)
         return "\n".join(message_blocks)
 
-    async def publish_papers(self, papers_list: List[List[str]]) -> Any:
+    async def publish_papers(self, papers_list: List[PaperRecord]) -> Any:
         """
         Formats and posts the message to Mattermost.
         Args:
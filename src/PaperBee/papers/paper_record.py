@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# Columns of the Google Sheet, in order
+COLUMNS: Tuple[str, ...] = ("DOI", "Date", "PostedDate", "IsPreprint", "Title", "Keywords", "Preprint", "URL")
+
+# Dtypes of the processed articles: Arrow-backed strings, and categoricals for the columns with few distinct values
+ARTICLE_DTYPES: Dict[str, Any] = {
+    "DOI": pd.StringDtype("pyarrow"),
+    "Date": "category",
+    "PostedDate": "category",
+    "IsPreprint": pd.CategoricalDtype(["FALSE", "TRUE"]),
+    "Title": pd.StringDtype("pyarrow"),
+    "Keywords": pd.StringDtype("pyarrow"),
+    "Preprint": pd.StringDtype("pyarrow"),
+    "URL": pd.StringDtype("pyarrow"),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class PaperRecord:
+    """
+    A processed paper, as written to the Google Sheet and posted to the messaging platforms.
+
+    Args:
+        doi (str): The DOI of the paper.
+        date (str): The date the paper was found, formatted as YYYY-mm-dd.
+        posted_date (str): The publication date of the paper.
+        is_preprint (bool): Whether the paper is a preprint.
+        title (str): The title of the paper.
+        keywords (str): Comma-separated keywords.
+        preprint (Optional[str]): The DOI of the preprint of a published paper, if known.
+        url (str): The DOI URL of the paper.
+
+    Methods:
+        from_frame(articles): Converts the DataFrame of `ArticlesProcessor` into records.
+        from_row(row): Creates a record from a row of the Google Sheet.
+        to_row(): Returns the values of the record in the order of the sheet columns.
+    """
+
+    doi: str
+    date: str
+    posted_date: str
+    is_preprint: bool
+    title: str
+    keywords: str = ""
+    preprint: Optional[str] = None
+    url: str = ""
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "PaperRecord":
+        """
+        Creates a record from values in the order of `COLUMNS`, with IsPreprint as 'TRUE'/'FALSE' or a boolean.
+
+        Args:
+            row (Sequence[Any]): The values of a sheet row.
+
+        Returns:
+            PaperRecord: The record.
+        """
+        doi, date, posted_date, is_preprint, title, keywords, preprint, url = row
+        return cls(doi, date, posted_date, is_preprint in ("TRUE", True), title, keywords, preprint, url)
+
+    @classmethod
+    def from_frame(cls, articles: pd.DataFrame) -> List["PaperRecord"]:
+        """
+        Converts processed articles into records, with plain Python values: missing values become None.
+
+        Args:
+            articles (pd.DataFrame): Articles with the columns of `COLUMNS`, e.g. from `ArticlesProcessor`.
+
+        Returns:
+            List[PaperRecord]: One record per row, in order.
+        """
+        values = articles.loc[:, list(COLUMNS)].astype(object)
+        values = values.where(values.notna(), None)
+        return [cls.from_row(row) for row in values.itertuples(index=False, name=None)]
+
+    def to_row(self) -> List[Any]:
+        """
+        Returns the values of the record in the order of `COLUMNS`, with IsPreprint as 'TRUE' or 'FALSE'.
+
+        Returns:
+            List[Any]: The values of the sheet row.
+        """
+        return [
+            self.doi,
+            self.date,
+            self.posted_date,
+            "TRUE" if self.is_preprint else "FALSE",
+            self.title,
+            self.keywords,
+            self.preprint,
+            self.url,
+        ]
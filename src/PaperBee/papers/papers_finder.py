@@ -1,23 +1,39 @@
-import json
+import asyncio
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
 from logging import Logger
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-import findpapers
 import pandas as pd
 from slack_sdk import WebClient
-from tqdm import tqdm
 
+from .archive import ArticleArchive
 from .cli import InteractiveCLIFilter
-from .google_sheet import GoogleSheetsUpdater
+from .dedup import DeduplicationIndex
+from .doi_cache import DOICache
+from .doi_ledger import DOILedger
+from .doi_resolver import DOIResolver
+from .google_sheet import GoogleSheetsUpdater, SheetSession, SheetWriter
+from .http_session import HTTPSessionConfig
 from .llm_filtering import LLMFilter
 from .mattermost_papers_formatter import MattermostPaperPublisher
+from .paper_record import ARTICLE_DTYPES, PaperRecord
+from .preprint_linker import PreprintLinker
+from .search import SearchJob, chunked, run_search_jobs
+from .search_cache import SearchCache
+from .search_index import PaperSearchIndex
+from .sheet_shards import SheetShardPolicy
 from .slack_papers_formatter import SlackPaperPublisher
 from .telegram_papers_formatter import TelegramPaperPublisher
-from .utils import ArticlesProcessor, PubMedClient
+from .utils import ArticlesProcessor
+from .watermarks import SearchWatermarks
 from .zulip_papers_formatter import ZulipPaperPublisher
 
+# Search results dumped to the root directory before the search cache, e.g. '2024-01-02_biorxiv.json'
+_LEGACY_RESULTS = re.compile(r"(\d{4}-\d{2}-\d{2})(?:_biorxiv|_pub_arx)?\.json")
+
 
 class PapersFinder:
     """
@@ -47,7 +63,24 @@ class PapersFinder:
         mattermost_team (str): The Mattermost team name.
         mattermost_channel (str): The Mattermost channel name.
         ncbi_api_key (str): The NCBI API key.
+        http_config (Optional[HTTPSessionConfig]): Settings of the connection-pooled HTTP client used for NCBI.
         databases (Optional[List[str]]): List of databases to search in, e.g., ['pubmed', 'biorxiv', 'arxiv'].
+        search_timeout (Optional[float]): Timeout in seconds for the search in each database, or None for no timeout.
+        incremental (bool): Search each database only since the last successfully processed day.
+        chunk_size (int): Number of articles streamed from the search results and processed at once.
+        search_cache_ttl (float): Hours during which the results of an identical search are reused, 0 to disable.
+        archive_retention_days (Optional[float]): Days the archived articles are kept, or None to keep them forever.
+        archive_max_size_mb (Optional[float]): Maximum size of the article archive, or None for no limit.
+        limit (int): Maximum number of papers of each search. Truncated searches are split into smaller date windows.
+        limit_per_database (int): Maximum number of papers per database of each search.
+        sheet_write_chunk_size (int): Number of rows written to the Google Sheet per request.
+        sheet_write_mode (str): 'insert' to insert new papers at the top of the Google Sheet, or 'append' to append
+            them at the bottom, which stays fast on large sheets (see `SheetSession.migrate_to_append`).
+        sheet_sharding (str): 'none', 'year' or 'quarter': write the papers of each period to their own worksheet.
+        sheet_shard_spreadsheets (Optional[Dict[str, str]]): Spreadsheet IDs of the shards kept in other spreadsheets,
+            by shard name, e.g. {'Papers 2024': '<spreadsheet ID>'}.
+        llm_max_concurrency (int): Maximum number of LLM filtering requests in flight.
+        llm_timeout (float): Timeout in seconds of each LLM filtering request.
     """
 
     def __init__(
@@ -78,7 +111,22 @@ class PapersFinder:
         mattermost_team: str = "",
         mattermost_channel: str = "",
         ncbi_api_key: str = "",
+        http_config: Optional[HTTPSessionConfig] = None,
         databases: Optional[List[str]] = None,
+        search_timeout: Optional[float] = 1800,
+        incremental: bool = False,
+        chunk_size: int = 500,
+        search_cache_ttl: float = 12,
+        archive_retention_days: Optional[float] = 365,
+        archive_max_size_mb: Optional[float] = None,
+        limit: int = 1200,
+        limit_per_database: int = 400,
+        sheet_write_chunk_size: int = 500,
+        sheet_write_mode: str = "insert",
+        sheet_sharding: str = "none",
+        sheet_shard_spreadsheets: Optional[Dict[str, str]] = None,
+        llm_max_concurrency: int = 8,
+        llm_timeout: float = 60,
     ) -> None:
         self.root_dir: str = root_dir
         # dates
@@ -89,8 +137,8 @@ class PapersFinder:
         self.until: date = self.today
         self.since: date = self.yesterday
         # search args
-        self.limit: int = 1200
-        self.limit_per_database: int = 400
+        self.limit: int = limit
+        self.limit_per_database: int = limit_per_database
         allowed_databases = {"biorxiv", "arxiv", "pubmed"}
         self.databases = databases if databases else ["biorxiv", "pubmed"]
         if not all(db in allowed_databases for db in self.databases):
@@ -101,13 +149,24 @@ class PapersFinder:
         self.google_credentials_json = google_credentials_json
         self.spreadsheet_id: str = spreadsheet_id
         self.sheet_name: str = sheet_name
+        self.sheet_write_chunk_size: int = sheet_write_chunk_size
+        if sheet_write_mode not in ("insert", "append"):
+            e = f"Invalid sheet write mode '{sheet_write_mode}'. Allowed values are: 'insert', 'append'"
+            raise ValueError(e)
+        self.sheet_write_mode: str = sheet_write_mode
+        self.shard_policy: SheetShardPolicy = SheetShardPolicy(
+            sheet_name, sheet_sharding, spreadsheet_id, sheet_shard_spreadsheets
+        )
         # Query and search files
         self.query_biorxiv: Optional[str] = query_biorxiv if query_biorxiv else None
         self.query_pub_arx: Optional[str] = query_pubmed_arxiv
         self.query: Optional[str] = query if query else None
-        self.search_file: str = os.path.join(root_dir, f"{self.today_str}.json")
-        self.search_file_biorxiv: str = os.path.join(root_dir, f"{self.today_str}_biorxiv.json")
-        self.search_file_pub_arx: str = os.path.join(root_dir, f"{self.today_str}_pub_arx.json")
+        self.search_timeout: Optional[float] = search_timeout
+        self.incremental: bool = incremental
+        self.watermarks: SearchWatermarks = SearchWatermarks(os.path.join(root_dir, "search_watermarks.json"))
+        self.completed_search_jobs: List[SearchJob] = []
+        self.chunk_size: int = chunk_size
+        self.search_cache: SearchCache = SearchCache(os.path.join(root_dir, "search_cache"), ttl_hours=search_cache_ttl)
         # Filter
         self.interactive_filtering: bool = interactive
         self.llm_filtering: bool = llm_filtering
@@ -115,6 +174,8 @@ class PapersFinder:
         self.model: str = model or "gpt-3.5-turbo"
         self.filtering_prompt: str = filtering_prompt or ""
         self.OPENAI_API_KEY: str = OPENAI_API_KEY or ""
+        self.llm_max_concurrency: int = llm_max_concurrency
+        self.llm_timeout: float = llm_timeout
         # Messaging platforms
         self.slack_bot_token: str = slack_bot_token
         self.slack_channel_id: str = slack_channel_id
@@ -131,8 +192,60 @@ class PapersFinder:
         self.logger = Logger("PapersFinder")
         # NCBI API
         self.ncbi_api_key: str = ncbi_api_key
+        self.http_config: HTTPSessionConfig = http_config or HTTPSessionConfig()
+        self.doi_cache: DOICache = DOICache(os.path.join(root_dir, "doi_cache.sqlite"))
+        # DOIs already listed in the Google Sheet
+        self.doi_ledger: DOILedger = DOILedger(os.path.join(root_dir, "doi_ledger.sqlite"))
+        # History of processed articles
+        self.archive: ArticleArchive = ArticleArchive(
+            os.path.join(root_dir, "archive"),
+            retention_days=archive_retention_days,
+            max_size_mb=archive_max_size_mb,
+        )
+        self.search_index: PaperSearchIndex = PaperSearchIndex(os.path.join(root_dir, "search_index.sqlite"))
+        if not len(self.search_index):  # Index the history when the index is created
+            self.search_index.add(PaperRecord.from_frame(self.archive.read()))
+
+    def search_jobs(self) -> List[SearchJob]:
+        """
+        Splits the search into independent jobs, one per database.
+
+        With incremental search, each job starts at the watermark of its query and database instead of `since`.
+
+        Returns:
+            List[SearchJob]: The searches to run.
+        """
+        if not self.query and (not self.query_biorxiv or not self.query_pub_arx):
+            e = "Both query_biorxiv and query_pubmed_arxiv must be provided if query is not provided."
+            raise ValueError(e)
 
-    def find_and_process_papers(self) -> pd.DataFrame:
+        jobs = []
+        for database in self.databases:
+            # Biorxiv requires a different query
+            query = self.query or (self.query_biorxiv if database == "biorxiv" else self.query_pub_arx) or ""
+            since = self.since
+            watermark = self.watermarks.get(query, database) if self.incremental else None
+            if watermark is not None:
+                # Search only the gap since the last processed day, which is searched again as it may be incomplete
+                since = min(watermark, self.until)
+                self.logger.info(f"Searching {database} since its watermark {since} instead of {self.since}.")
+            jobs.append(
+                SearchJob(
+                    name=database,
+                    query=query,
+                    databases=(database,),
+                    since=since,
+                    until=self.until,
+                    limit=self.limit,
+                    limit_per_database=self.limit_per_database,
+                    output_file=self.search_cache.path(
+                        query, (database,), since, self.until, self.limit, self.limit_per_database
+                    ),
+                )
+            )
+        return jobs
+
+    async def find_and_process_papers(self) -> pd.DataFrame:
         """
         Executes the search for papers based on predefined criteria and processes them.
 
@@ -140,69 +253,40 @@ class PapersFinder:
             pd.DataFrame: A DataFrame containing processed articles.
         """
 
-        articles: List[Dict[str, Any]] = []
-
-        if self.query:
-            findpapers.search(
-                self.search_file,
-                self.query,
-                self.since,
-                self.until,
-                self.limit,
-                self.limit_per_database,
-                self.databases,
-                verbose=False,
-            )
-            with open(self.search_file) as papers_file:
-                articles_dict: List[Dict[str, Any]] = json.load(papers_file)["papers"]
-            articles = list(articles_dict)
+        self.completed_search_jobs = await run_search_jobs(
+            self.search_jobs(), timeout=self.search_timeout, logger=self.logger, cache=self.search_cache
+        )
+        articles = (article for job in self.completed_search_jobs for article in job.iter_papers())
+
+        # Merge works found in several databases or by several queries before the expensive stages
+        dedup_index = DeduplicationIndex()
+        # Stream the result files in bounded chunks, so memory does not grow with the number of papers found
+        processed_chunks = []
+        async with DOIResolver(
+            doi_cache=self.doi_cache,
+            ncbi_api_key=self.ncbi_api_key,
+            http_config=self.http_config,
+            logger=self.logger,
+        ) as resolver:
+            for chunk in chunked(dedup_index.iter_unique(articles), self.chunk_size):
+                await resolver.resolve(chunk)
+                resolved = [article for article in chunk if article.get("url") is not None]
+                if resolved:
+                    processed_chunks.append(ArticlesProcessor(resolved, self.today_str).articles)
+                dedup_index.release()
+        self.logger.info(f"Merged {dedup_index.n_duplicates} duplicate articles.")
+
+        if processed_chunks:
+            # Chunks have different categories, which concatenate to object columns
+            processed_articles = pd.concat(processed_chunks, ignore_index=True).astype(ARTICLE_DTYPES)
         else:
-            if not self.query_biorxiv or not self.query_pub_arx:
-                e = "Both query_biorxiv and query_pubmed_arxiv must be provided if query is not provided."
-                raise ValueError(e)
-
-            findpapers.search(
-                self.search_file_pub_arx,
-                self.query_pub_arx,
-                self.since,
-                self.until,
-                self.limit,
-                self.limit_per_database,
-                [
-                    database for database in self.databases if database != "biorxiv"
-                ],  # Biorxiv requires a different query
-                verbose=False,
-            )
-            if "biorxiv" in self.databases:
-                findpapers.search(
-                    self.search_file_biorxiv,
-                    self.query_biorxiv,
-                    self.since,
-                    self.until,
-                    self.limit,
-                    self.limit_per_database,
-                    ["biorxiv"],
-                    verbose=False,
-                )
-            with open(self.search_file_pub_arx) as papers_file:
-                articles_pub_arx_dict: List[Dict[str, Any]] = json.load(papers_file)["papers"]
-            with open(self.search_file_biorxiv) as papers_file:
-                articles_biorxiv_dict: List[Dict[str, Any]] = json.load(papers_file)["papers"]
-            articles = articles_pub_arx_dict + articles_biorxiv_dict
-
-        doi_extractor = PubMedClient()
-        for article in tqdm(articles):
-            if "PubMed" in article["databases"]:
-                doi = doi_extractor.get_doi_from_title(article["title"], ncbi_api_key=self.ncbi_api_key)
-                article["url"] = f"https://doi.org/{doi}" if doi else None
-            else:
-                article["url"] = next(
-                    (s for s in article["urls"] if s.startswith("https://doi.org")),
-                    None,
-                )
-        articles = [article for article in articles if article.get("url") is not None]
-        processor = ArticlesProcessor(articles, self.today_str)
-        processed_articles = processor.articles
+            processed_articles = ArticlesProcessor([], self.today_str).articles
+
+        # Link publications to archived preprints, and to preprints found in this run
+        linker = PreprintLinker.from_frame(self.archive.read(columns=["DOI", "IsPreprint", "Title"]))
+        linker.add_frame(processed_articles)
+        linker.link(processed_articles)
+        self.logger.info(f"Linked {processed_articles['Preprint'].notna().sum()} publications to their preprint.")
         self.logger.info(f"Found {len(processed_articles)} articles.")
 
         if self.llm_filtering:
@@ -212,8 +296,10 @@ class PapersFinder:
                 model=self.model,
                 filtering_prompt=self.filtering_prompt,
                 OPENAI_API_KEY=self.OPENAI_API_KEY,
+                max_concurrency=self.llm_max_concurrency,
+                timeout=self.llm_timeout,
             )
-            processed_articles = llm_filter.filter_articles()
+            processed_articles = await llm_filter.filter_articles_async()
             self.logger.info(f"Filtered down to {len(processed_articles)} articles using LLM.")
 
         if self.interactive_filtering:
@@ -223,40 +309,182 @@ class PapersFinder:
 
         return processed_articles
 
-    def update_google_sheet(self, processed_articles: pd.DataFrame, row: int = 2) -> List[List[Any]]:
+    @property
+    def sheet_key(self) -> str:
+        """Identifies the unsharded Google Sheet in the DOI ledger and the write progress."""
+        return self.shard_key(self.sheet_name)
+
+    def shard_key(self, shard: str) -> str:
+        """Identifies a shard of the Google Sheet in the DOI ledger and the write progress."""
+        return f"{self.shard_policy.spreadsheet_of(shard)}/{shard}"
+
+    def _list_shards(self, updaters: Dict[str, GoogleSheetsUpdater]) -> Set[str]:
+        """Returns the existing shards of the Google Sheet, in all spreadsheets that can hold them."""
+        shards: Set[str] = set()
+        for spreadsheet_id, updater in updaters.items():
+            try:
+                titles = updater.worksheet_titles()
+            except Exception as e:
+                self.logger.warning(f"Failed to list the worksheets of the spreadsheet {spreadsheet_id}: {e}")
+                continue
+            shards.update(
+                title
+                for title in titles
+                if self.shard_policy.is_shard(title) and self.shard_policy.spreadsheet_of(title) == spreadsheet_id
+            )
+        return shards
+
+    def _sync_shard(
+        self, updater: GoogleSheetsUpdater, shard: str, create: bool, insert_row: Optional[int]
+    ) -> Optional[SheetSession]:
+        """Opens a shard and brings its DOI ledger up to date."""
+        session = updater.session(sheet_name=shard, create=create)
+        if session is None:
+            return None
+        try:
+            synced = self.doi_ledger.sync(self.shard_key(shard), session, insert_row=insert_row)
+        except Exception as e:
+            self.logger.warning(f"Failed to sync the DOI ledger with the sheet '{shard}', using the local ledger: {e}")
+        else:
+            self.doi_cache.seed((article.get("Title", ""), article["DOI"]) for article in synced)
+        return session
+
+    def find_new_papers(
+        self, processed_articles: pd.DataFrame, row: int = 2
+    ) -> Tuple[Dict[str, SheetSession], List[PaperRecord]]:
         """
-        Updates the Google Sheet with the processed articles that are not already listed.
+        Works out which processed articles are not listed in any shard of the Google Sheet yet.
+
+        The shards are opened and synced with the local DOI ledger concurrently; the ledger only reads the rows
+        changed since the last run, so that the cost of a run does not grow with the history.
 
         Args:
             processed_articles (pd.DataFrame): DataFrame containing processed articles.
-            row (int): The starting row number in the Google Sheet for the updates. Defaults to 2.
+            row (int): The row where new papers are inserted. Defaults to 2. Ignored in append mode.
+
         Returns:
-            List[List[Any]]: The data that was inserted into the Google Sheet.
+            Tuple[Dict[str, SheetSession], List[PaperRecord]]: The sessions of the opened shards by name, and the
+                papers to write and post.
+
+        Raises:
+            ValueError: If a shard that new papers are written to cannot be opened.
         """
-        gsheet_updater = GoogleSheetsUpdater(
-            spreadsheet_id=self.spreadsheet_id,
-            credentials_json_path=self.google_credentials_json,
+        updaters = {
+            spreadsheet_id: GoogleSheetsUpdater(
+                spreadsheet_id=spreadsheet_id,
+                credentials_json_path=self.google_credentials_json,
+                token_dir=self.root_dir,
+            )
+            for spreadsheet_id in self.shard_policy.spreadsheet_ids()
+        }
+        shards = self._list_shards(updaters)
+        # The shards of today's papers, and of papers left over by a failed write, are created if needed
+        days = {self.today_str, *processed_articles["Date"].astype(str)}
+        days.update(
+            str(pending_row[1]) for shard in shards for pending_row in self.doi_ledger.pending(self.shard_key(shard))
         )
-        gsheet_cache = gsheet_updater.read_sheet_data(sheet_name=self.sheet_name)
-        if gsheet_cache:
-            published_dois = [article["DOI"] for article in gsheet_cache]
+        write_shards = {self.shard_policy.shard(day) for day in days}
+        shards.update(write_shards)
+
+        insert_row = None if self.sheet_write_mode == "append" else row
+        names = sorted(shards)
+        with ThreadPoolExecutor(max_workers=min(8, len(names)), thread_name_prefix="sheet-shards") as executor:
+            opened = executor.map(
+                lambda shard: self._sync_shard(
+                    updaters[self.shard_policy.spreadsheet_of(shard)], shard, shard in write_shards, insert_row
+                ),
+                names,
+            )
+            sessions = {shard: session for shard, session in zip(names, opened) if session is not None}
+        for shard in write_shards - sessions.keys():
+            e = f"Failed to open the specified sheet '{shard}' for inserting rows."
+            raise ValueError(e)
 
-            processed_articles_filtered = processed_articles[~processed_articles["DOI"].isin(published_dois)]
-        else:  # Sheet is empty (the moment of deployment)
-            processed_articles_filtered = processed_articles
+        published_dois: Set[str] = set()
+        for shard in shards:
+            key = self.shard_key(shard)
+            published_dois.update(self.doi_ledger.published(key, processed_articles["DOI"]))
+            # Papers posted by a run whose sheet write failed are written, but not posted again
+            published_dois.update(pending_row[0] for pending_row in self.doi_ledger.pending(key))
+        processed_articles_filtered = processed_articles[~processed_articles["DOI"].isin(published_dois)]
+        return sessions, PaperRecord.from_frame(processed_articles_filtered)
+
+    def _rows_by_shard(
+        self, sessions: Dict[str, SheetSession], papers: List[PaperRecord]
+    ) -> Dict[str, List[List[Any]]]:
+        """Groups the rows of new papers and of papers left over by a failed write by shard."""
+        rows: Dict[str, List[List[Any]]] = {}
+        for paper in papers:
+            rows.setdefault(self.shard_policy.shard(paper.date), []).append(paper.to_row())
+        for shard in sessions:
+            key = self.shard_key(shard)
+            pending = self.doi_ledger.pending(key)
+            written = self.doi_ledger.published(key, [pending_row[0] for pending_row in pending])
+            rows.setdefault(shard, []).extend(pending_row for pending_row in pending if pending_row[0] not in written)
+        return {shard: shard_rows for shard, shard_rows in rows.items() if shard_rows}
+
+    def _progress_path(self, shard: str) -> str:
+        if shard == self.sheet_name:
+            return os.path.join(self.root_dir, "sheet_write_progress.json")
+        return os.path.join(self.root_dir, f"sheet_write_progress_{re.sub(r'[^A-Za-z0-9-]+', '_', shard)}.json")
+
+    def write_google_sheet(self, sessions: Dict[str, SheetSession], papers: List[PaperRecord], row: int = 2) -> None:
+        """
+        Writes new papers, and the papers left over by a failed write, to their shards of the Google Sheet.
 
-        row_data = [list(row) for row in processed_articles_filtered.values.tolist()]
+        If the write of a shard fails, its unwritten rows are kept in the DOI ledger and written by the next run, the
+        other shards are still written, and the first error is raised at the end.
 
-        if row_data:
-            gsheet_updater.insert_rows(sheet_name=self.sheet_name, rows_data=row_data, row=row)
-        return row_data
+        Args:
+            sessions (Dict[str, SheetSession]): The sessions of the shards, from `find_new_papers`.
+            papers (List[PaperRecord]): The papers to write.
+            row (int): The starting row number in the Google Sheet for the updates. Defaults to 2. Ignored in append
+                mode, where the papers are appended after the last row.
+        """
+        errors: List[Exception] = []
+        for shard, row_data in self._rows_by_shard(sessions, papers).items():
+            key = self.shard_key(shard)
+            writer = SheetWriter(
+                sessions[shard],
+                self._progress_path(shard),
+                key=key,
+                chunk_size=self.sheet_write_chunk_size,
+                append=self.sheet_write_mode == "append",
+            )
+            try:
+                writer.write(row_data, row=row)
+            except Exception as e:
+                self.doi_ledger.set_pending(key, row_data)
+                errors.append(e)
+                continue
+            spreadsheet_id = self.shard_policy.spreadsheet_of(shard)
+            siblings = [
+                self.shard_key(other) for other in sessions if self.shard_policy.spreadsheet_of(other) == spreadsheet_id
+            ]
+            self.doi_ledger.record(key, sessions[shard], [values[0] for values in row_data], siblings=siblings)
+        if errors:
+            raise errors[0]
+
+    def update_google_sheet(self, processed_articles: pd.DataFrame, row: int = 2) -> List[PaperRecord]:
+        """
+        Updates the Google Sheet with the processed articles that are not already listed.
+
+        Args:
+            processed_articles (pd.DataFrame): DataFrame containing processed articles.
+            row (int): The starting row number in the Google Sheet for the updates. Defaults to 2.
+        Returns:
+            List[PaperRecord]: The papers that were inserted into the Google Sheet.
+        """
+        sessions, papers = self.find_new_papers(processed_articles, row=row)
+        self.write_google_sheet(sessions, papers, row=row)
+        return papers
 
-    def post_paper_to_slack(self, papers: List[List[str]]) -> Any:
+    def post_paper_to_slack(self, papers: List[PaperRecord]) -> Any:
         """
         Posts the papers to Slack.
 
         Args:
-            papers (List[str]): List of papers to post to Slack.
+            papers (List[PaperRecord]): List of papers to post to Slack.
         """
         self.slack_publisher: SlackPaperPublisher = SlackPaperPublisher(
             WebClient(self.slack_bot_token),
@@ -269,12 +497,12 @@ class PapersFinder:
         )
         return response
 
-    async def post_paper_to_telegram(self, papers: List[List[str]]) -> Any:
+    async def post_paper_to_telegram(self, papers: List[PaperRecord]) -> Any:
         """
         Posts the papers to Telegram.
 
         Args:
-            papers (List[str]): List of papers to post to Telegram.
+            papers (List[PaperRecord]): List of papers to post to Telegram.
         """
         telegram_publisher = TelegramPaperPublisher(
             Logger("TelegramPaperPublisher"),
@@ -286,12 +514,12 @@ class PapersFinder:
         response = await telegram_publisher.publish_papers(papers_pub, preprints, self.today_str, self.spreadsheet_id)
         return response
 
-    async def post_paper_to_zulip(self, papers: List[List[str]]) -> Any:
+    async def post_paper_to_zulip(self, papers: List[PaperRecord]) -> Any:
         """
         Posts the papers to Zulip.
 
         Args:
-            papers (List[str]): List of papers to post to Telegram.
+            papers (List[PaperRecord]): List of papers to post to Zulip.
         """
         zulip_publisher = ZulipPaperPublisher(
             Logger("ZulipPaperPublisher"),
@@ -306,12 +534,12 @@ class PapersFinder:
         )
         return response
 
-    async def post_paper_to_mattermost(self, papers: List[List[str]]) -> Any:
+    async def post_paper_to_mattermost(self, papers: List[PaperRecord]) -> Any:
         """
         Posts the papers to Mattermost.
 
         Args:
-            papers (List[str]): List of papers to post to Mattermost.
+            papers (List[PaperRecord]): List of papers to post to Mattermost.
         """
         mattermost_publisher = MattermostPaperPublisher(
             Logger("MattermostPaperPublisher"),
@@ -323,28 +551,49 @@ class PapersFinder:
         response = await mattermost_publisher.publish_papers(papers)
         return response
 
+    def update_watermarks(self) -> None:
+        """
+        Records the `until` date of every successful search job, so that the next incremental run starts there.
+        """
+        for job in self.completed_search_jobs:
+            for database in job.databases:
+                self.watermarks.update(job.query, database, job.until)
+
     def cleanup_files(self) -> None:
         """
-        Deletes the search result files from the previous day to keep the directory clean.
+        Deletes the expired search results and, once, those of previous versions; compacts the archive of the previous
+        days and applies its retention policy.
         """
-        yesterday_file = os.path.join(self.root_dir, f"{self.yesterday_str}.json")
-        if os.path.exists(yesterday_file):
-            os.remove(yesterday_file)
-            print(f"Deleted yesterday's file: {yesterday_file}")
-        else:
-            print(f"File not found, no deletion needed for: {yesterday_file}")
-        yesterday_file_biorxiv = os.path.join(self.root_dir, f"{self.yesterday_str}_biorxiv.json")
-        if os.path.exists(yesterday_file_biorxiv):
-            os.remove(yesterday_file_biorxiv)
-            print(f"Deleted yesterday's file: {yesterday_file_biorxiv}")
-        else:
-            print(f"File not found, no deletion needed for: {yesterday_file_biorxiv}")
-        yesterday_file_pub_arx = os.path.join(self.root_dir, f"{self.yesterday_str}_pub_arx.json")
-        if os.path.exists(yesterday_file_pub_arx):
-            os.remove(yesterday_file_pub_arx)
-            print(f"Deleted yesterday's file: {yesterday_file_pub_arx}")
-        else:
-            print(f"File not found, no deletion needed for: {yesterday_file_pub_arx}")
+        for path in self.search_cache.prune():
+            print(f"Deleted expired search results: {path}")
+        self.remove_legacy_results()
+        self.archive.compact(before=self.today_str)
+        for day in self.archive.apply_retention(self.today):
+            print(f"Deleted archived articles of {day}")
+
+    def remove_legacy_results(self) -> List[str]:
+        """
+        One-time migration that deletes the search results dumped to the root directory before the search cache.
+
+        Only the files the previous versions wrote are deleted, i.e. those dated up to the day of the migration. The
+        migration is recorded in a marker file, so files created in the root directory afterwards are never touched.
+
+        Returns:
+            List[str]: The names of the deleted files.
+        """
+        marker = os.path.join(self.root_dir, ".legacy_results_removed")
+        if os.path.exists(marker):
+            return []
+        deleted = []
+        for name in sorted(os.listdir(self.root_dir)):
+            match = _LEGACY_RESULTS.fullmatch(name)
+            if match and match.group(1) <= self.today_str:
+                os.remove(os.path.join(self.root_dir, name))
+                self.logger.warning(f"Deleted search results of a previous version: {name}")
+                deleted.append(name)
+        with open(marker, "w") as file:
+            file.write(f"{self.today_str}\n")
+        return deleted
 
     async def run_daily(
         self,
@@ -352,7 +601,7 @@ class PapersFinder:
         post_to_telegram: bool = False,
         post_to_zulip: bool = False,
         post_to_mattermost: bool = False,
-    ) -> Tuple[List[List[Any]], Any | None, Any | None, Any | None, Any | None]:
+    ) -> Tuple[List[PaperRecord], Any | None, Any | None, Any | None, Any | None]:
         """
         The main method to orchestrate finding, processing, and updating papers in a Google Sheet on a daily schedule.
 
@@ -363,11 +612,55 @@ class PapersFinder:
             post_to_mattermost (bool): Whether to post the papers to Mattermost.
 
         Returns:
-            Tuple[List[List[Any]], Any]: The papers posted and the response from the posting method.
+            Tuple[List[PaperRecord], Any]: The papers posted and the response from the posting method.
         """
-        processed_articles = self.find_and_process_papers()
-        papers = self.update_google_sheet(processed_articles)
+        processed_articles = await self.find_and_process_papers()
+        processed_papers = PaperRecord.from_frame(processed_articles)
+        self.archive.append(processed_papers)
+        self.search_index.add(processed_papers)
+        sessions, papers = self.find_new_papers(processed_articles)
+        self.update_watermarks()
+
+        # The sheet write runs on a worker thread while the papers are posted
+        sheet_write = asyncio.create_task(asyncio.to_thread(self.write_google_sheet, sessions, papers))
+        await asyncio.sleep(0)  # Start the write before a blocking post holds the event loop
+        try:
+            responses = await self.post_papers(
+                papers, post_to_slack, post_to_telegram, post_to_zulip, post_to_mattermost
+            )
+        finally:
+            try:
+                await sheet_write
+            except Exception:
+                self.logger.exception(
+                    f"Failed to write {len(papers)} papers to the Google Sheet; the next run writes them."
+                )
+
+        self.cleanup_files()
+
+        return (papers, *responses)
 
+    async def post_papers(
+        self,
+        papers: List[PaperRecord],
+        post_to_slack: bool = True,
+        post_to_telegram: bool = False,
+        post_to_zulip: bool = False,
+        post_to_mattermost: bool = False,
+    ) -> Tuple[Any | None, Any | None, Any | None, Any | None]:
+        """
+        Posts the papers to the selected platforms.
+
+        Args:
+            papers (List[PaperRecord]): The papers to post.
+            post_to_slack (bool): Whether to post the papers to Slack.
+            post_to_telegram (bool): Whether to post the papers to Telegram.
+            post_to_zulip (bool): Whether to post the papers to Zulip.
+            post_to_mattermost (bool): Whether to post the papers to Mattermost.
+
+        Returns:
+            Tuple[Any]: The responses of Slack, Telegram, Zulip and Mattermost, None for the platforms not posted to.
+        """
         response_slack = None
         response_telegram = None
         response_zulip = None
@@ -385,22 +678,27 @@ class PapersFinder:
         if post_to_mattermost:
             response_mattermost = await self.post_paper_to_mattermost(papers)
 
-        self.cleanup_files()
-
-        return papers, response_slack, response_telegram, response_zulip, response_mattermost
+        return response_slack, response_telegram, response_zulip, response_mattermost
 
-    def send_csv(self, user_id: str, user_query: str) -> Tuple[pd.DataFrame, Any]:
+    def send_csv(self, user_id: str, user_query: str, live: bool = False) -> Tuple[pd.DataFrame, Any]:
         """
         Paired with search_articles_command listener, send the articles' list as csv file in the channel where it was requested.
 
+        The articles are looked up in the local search index of all processed papers, which answers in milliseconds.
+
         Args:
             user_id (str): The ID of the user requesting the CSV.
             user_query (str): The query string provided by the user.
+            live (bool): Run a full live search with the configured queries instead of using the index.
 
         Returns:
             Tuple[pd.DataFrame, Any]: The processed articles and the response from Slack.
         """
-        processed_articles = self.find_and_process_papers()
+        if live:
+            processed_articles = asyncio.run(self.find_and_process_papers())
+        else:
+            processed_articles = self.search_index.search(user_query)
+            self.logger.info(f"Found {len(processed_articles)} indexed articles for '{user_query}'.")
         response = self.slack_publisher._send_csv(
             processed_articles,
             root_dir=self.root_dir,
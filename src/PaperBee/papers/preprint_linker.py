@@ -0,0 +1,137 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from .dedup import MinHasher, title_shingles
+from .utils import normalize_title
+
+BIORXIV_DOI_PREFIX = "10.1101/"
+
+
+class PreprintLinker:
+    """
+    Links published articles to their bioRxiv preprint by title, with in-memory lookups only.
+
+    Preprints are indexed by normalized title for exact matches, and by MinHash bands of their title shingles to find
+    candidates for fuzzy matches, e.g. when the title changed slightly on publication. Candidates are confirmed with
+    the exact Jaccard similarity of the shingles.
+
+    Args:
+        threshold (float): Minimum Jaccard similarity of the title shingles of a preprint and a publication.
+        num_perm (int): Length of the MinHash signatures.
+        bands (int): Number of LSH bands; `num_perm` must be divisible by it.
+
+    Methods:
+        from_frame(articles): Creates a linker indexing the bioRxiv preprints of processed or archived articles.
+        add_frame(articles): Indexes the bioRxiv preprints of processed or archived articles.
+        add(dois, titles): Indexes preprints.
+        match(title): Finds the preprint of a publication.
+        link(articles): Fills the Preprint column of processed articles.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16) -> None:
+        if num_perm % bands:
+            e = f"num_perm ({num_perm}) must be divisible by bands ({bands})."
+            raise ValueError(e)
+        self.threshold: float = threshold
+        self.bands: int = bands
+        self.rows: int = num_perm // bands
+        self.hasher = MinHasher(num_perm=num_perm)
+        self._dois: List[str] = []
+        self._shingles: List[Set[str]] = []
+        self._titles: Dict[str, int] = {}
+        self._buckets: Dict[Tuple[int, ...], List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._dois)
+
+    @classmethod
+    def from_frame(cls, articles: pd.DataFrame) -> "PreprintLinker":
+        """
+        Creates a linker from processed or archived articles, indexing their bioRxiv preprints.
+
+        Args:
+            articles (pd.DataFrame): Articles with the columns 'DOI', 'IsPreprint' and 'Title'.
+
+        Returns:
+            PreprintLinker: The linker.
+        """
+        linker = cls()
+        linker.add_frame(articles)
+        return linker
+
+    def add_frame(self, articles: pd.DataFrame) -> None:
+        """Indexes the bioRxiv preprints among processed or archived articles."""
+        if articles.empty:
+            return
+        is_preprint = articles["IsPreprint"].isin([True, "TRUE"])
+        preprints = articles[is_preprint & articles["DOI"].str.startswith(BIORXIV_DOI_PREFIX)]
+        self.add(preprints["DOI"].tolist(), preprints["Title"].tolist())
+
+    def _band_keys(self, shingles: Set[str]) -> List[Tuple[int, ...]]:
+        signature = self.hasher.signature(shingles)
+        return [(band, *signature[band * self.rows : (band + 1) * self.rows]) for band in range(self.bands)]
+
+    def add(self, dois: List[str], titles: List[str]) -> None:
+        """
+        Indexes preprints. A DOI that is already indexed is skipped.
+
+        Args:
+            dois (List[str]): The DOIs of the preprints.
+            titles (List[str]): Their titles.
+        """
+        known = set(self._dois)
+        for doi, title in zip(dois, titles):
+            if doi in known or not title:
+                continue
+            known.add(doi)
+            index = len(self._dois)
+            shingles = title_shingles(title)
+            self._dois.append(doi)
+            self._shingles.append(shingles)
+            self._titles.setdefault(normalize_title(title), index)
+            for key in self._band_keys(shingles):
+                self._buckets.setdefault(key, []).append(index)
+
+    def match(self, title: str) -> Optional[str]:
+        """
+        Finds the preprint of a publication by its title.
+
+        Args:
+            title (str): The title of the publication.
+
+        Returns:
+            Optional[str]: The DOI of the most similar preprint above the threshold, or None.
+        """
+        exact = self._titles.get(normalize_title(title))
+        if exact is not None:
+            return self._dois[exact]
+        shingles = title_shingles(title)
+        if not shingles:
+            return None
+        candidates = {index for key in self._band_keys(shingles) for index in self._buckets.get(key, [])}
+        best: Optional[int] = None
+        best_similarity = self.threshold
+        for index in sorted(candidates):
+            other = self._shingles[index]
+            similarity = len(shingles & other) / len(shingles | other)
+            if similarity >= best_similarity:
+                best, best_similarity = index, similarity
+        return self._dois[best] if best is not None else None
+
+    def link(self, articles: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fills the Preprint column of the published articles that have an indexed preprint.
+
+        Args:
+            articles (pd.DataFrame): Processed articles, e.g. from `ArticlesProcessor`. Updated in place.
+
+        Returns:
+            pd.DataFrame: The same articles.
+        """
+        if articles.empty or not self._dois:
+            return articles
+        published = articles["IsPreprint"] == "FALSE"
+        preprints = [self.match(title) for title in articles.loc[published, "Title"]]
+        articles.loc[published, "Preprint"] = pd.Series(preprints, index=articles.index[published], dtype=object)
+        return articles
@@ -0,0 +1,344 @@
+import asyncio
+import json
+import os
+import threading
+from collections import Counter
+from contextlib import suppress
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+from itertools import islice
+from logging import Logger
+from typing import IO, Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+import findpapers
+
+from .search_cache import SearchCache
+
+T = TypeVar("T")
+
+_WHITESPACE = " \t\n\r"
+
+
+class _JSONStream:
+    """Incremental reader of JSON values from a text file, keeping only a small buffer in memory."""
+
+    def __init__(self, file: IO[str], read_size: int) -> None:
+        self.file = file
+        self.read_size = read_size
+        self.buffer = ""
+        self.position = 0
+        self.decoder = json.JSONDecoder()
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Reads the next block of the file, dropping the consumed part of the buffer."""
+        if self.eof:
+            return False
+        data = self.file.read(self.read_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position :] + data
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """Returns the next non-whitespace character without consuming it."""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in _WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                e = "Unexpected end of JSON file."
+                raise ValueError(e)
+
+    def expect(self, char: str) -> None:
+        """Consumes the next non-whitespace character, which must be `char`."""
+        found = self.peek()
+        if found != char:
+            e = f"Expected '{char}' in JSON file, found '{found}'."
+            raise ValueError(e)
+        self.position += 1
+
+    def value(self) -> Any:
+        """Decodes the next JSON value, reading more of the file until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+            else:
+                # A number at the end of the buffer may continue in the next block
+                if end == len(self.buffer) and not self.eof and self._fill():
+                    continue
+                self.position = end
+                return value
+
+
+def iter_papers(path: str, read_size: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the `papers` entries of a findpapers result file one by one, without loading the whole file.
+
+    Args:
+        path (str): Path of the JSON file written by findpapers.
+        read_size (int): Number of characters read from the file at once.
+
+    Yields:
+        Dict[str, Any]: The papers of the file.
+    """
+    with open(path) as papers_file:
+        stream = _JSONStream(papers_file, read_size)
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            key = stream.value()
+            stream.expect(":")
+            if key == "papers":
+                stream.expect("[")
+                if stream.peek() == "]":
+                    stream.position += 1
+                else:
+                    while True:
+                        yield stream.value()
+                        if stream.peek() == "]":
+                            stream.position += 1
+                            break
+                        stream.expect(",")
+            else:
+                stream.value()  # Search metadata, skipped
+            if stream.peek() == "}":
+                return
+            stream.expect(",")
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Splits an iterable into lists of at most `size` items.
+
+    Args:
+        items (Iterable[T]): The items to split.
+        size (int): The maximum size of each chunk.
+
+    Yields:
+        List[T]: The chunks, in order.
+    """
+    iterator = iter(items)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+@dataclass(frozen=True)
+class SearchJob:
+    """
+    A single findpapers search, e.g. one database or one query group.
+
+    Args:
+        name (str): Name of the job used in logs, e.g. the database.
+        query (str): The findpapers query.
+        databases (Tuple[str, ...]): Databases to search in.
+        since (date): First publication date to search for.
+        until (date): Last publication date to search for.
+        limit (int): Maximum number of papers in total.
+        limit_per_database (int): Maximum number of papers per database.
+        output_file (str): Path of the JSON file written by findpapers.
+    """
+
+    name: str
+    query: str
+    databases: Tuple[str, ...]
+    since: date
+    until: date
+    limit: int
+    limit_per_database: int
+    output_file: str
+
+    def run(self) -> None:
+        """
+        Runs the search, writing its results to `output_file`.
+
+        The results are written to a temporary file first, so an interrupted search never leaves a partial file.
+        """
+        tmp_file = f"{self.output_file}.tmp"
+        findpapers.search(
+            tmp_file,
+            self.query,
+            self.since,
+            self.until,
+            self.limit,
+            self.limit_per_database,
+            list(self.databases),
+            verbose=False,
+        )
+        os.replace(tmp_file, self.output_file)
+
+    def iter_papers(self) -> Iterator[Dict[str, Any]]:
+        """
+        Streams the papers found by the search.
+
+        Yields:
+            Dict[str, Any]: The papers of `output_file`.
+        """
+        yield from iter_papers(self.output_file)
+
+    def is_truncated(self) -> bool:
+        """
+        Checks whether the results reached `limit`, or `limit_per_database` in any database, so papers may be missing.
+
+        Returns:
+            bool: True if the search should be split into smaller date windows.
+        """
+        total = 0
+        per_database: Counter = Counter()
+        for paper in self.iter_papers():
+            total += 1
+            per_database.update(paper.get("databases") or [])
+        return total >= self.limit or any(count >= self.limit_per_database for count in per_database.values())
+
+    def split(self) -> List["SearchJob"]:
+        """
+        Splits the date window of the search in two halves.
+
+        Returns:
+            List[SearchJob]: The searches of both halves, with their own output files next to `output_file`, or an
+                empty list if the window is a single day.
+        """
+        if self.since >= self.until:
+            return []
+        middle = self.since + (self.until - self.since) // 2
+        stem = os.path.splitext(self.output_file)[0]
+        return [
+            replace(
+                self,
+                name=f"{self.name} {since}..{until}",
+                since=since,
+                until=until,
+                output_file=f"{stem}.{since:%Y%m%d}-{until:%Y%m%d}.json",
+            )
+            for since, until in [(self.since, middle), (middle + timedelta(days=1), self.until)]
+        ]
+
+
+async def _run_in_daemon_thread(function: Callable[[], None], slots: asyncio.Semaphore) -> None:
+    """
+    Runs a function in a daemon thread, holding one of the slots until the thread ends.
+
+    Threads of timed out jobs cannot be stopped. Unlike the workers of a ThreadPoolExecutor, which are joined at
+    exit, daemon threads do not keep the process alive once the run is over.
+    """
+    loop = asyncio.get_running_loop()
+    await slots.acquire()
+    done = loop.create_future()
+
+    def finish(error: Optional[BaseException]) -> None:
+        slots.release()  # The slot is only freed once the thread ended, even if the job timed out
+        if done.done():
+            return
+        if error is None:
+            done.set_result(None)
+        else:
+            done.set_exception(error)
+
+    def target() -> None:
+        error: Optional[BaseException] = None
+        try:
+            function()
+        except BaseException as e:
+            error = e
+        # The event loop is closed if the job timed out and the run is over
+        with suppress(RuntimeError):
+            loop.call_soon_threadsafe(finish, error)
+
+    threading.Thread(target=target, name="findpapers", daemon=True).start()
+    await done
+
+
+async def _run_job(
+    job: SearchJob,
+    run_in_thread: Callable[[Callable[[], None]], Awaitable[None]],
+    logger: Logger,
+    cache: Optional[SearchCache],
+    split_truncated: bool,
+) -> List[SearchJob]:
+    """Runs a search, and recursively the halves of its date window while its results are truncated."""
+    if cache is not None and cache.is_fresh(job.output_file):
+        logger.info(f"Reusing cached results of search '{job.name}': {job.output_file}")
+    else:
+        await run_in_thread(job.run)
+    if not split_truncated or not job.is_truncated():
+        return [job]
+
+    halves = job.split()
+    if not halves:
+        logger.warning(f"Search '{job.name}' reached its limit within a single day; increase the search limits.")
+        return [job]
+    logger.info(f"Search '{job.name}' reached its limit; splitting it into {halves[0].name} and {halves[1].name}.")
+    results = await asyncio.gather(*(_run_job(half, run_in_thread, logger, cache, split_truncated) for half in halves))
+    return [leaf for result in results for leaf in result]
+
+
+async def run_search_jobs(
+    jobs: List[SearchJob],
+    timeout: Optional[float] = None,
+    logger: Optional[Logger] = None,
+    cache: Optional[SearchCache] = None,
+    split_truncated: bool = True,
+    max_workers: Optional[int] = None,
+) -> List[SearchJob]:
+    """
+    Runs independent searches concurrently in daemon worker threads.
+
+    A failing or timed out job is logged and skipped, so that it does not block the results of the other jobs, nor
+    keep the process alive once the run is over. A job whose results reach its limits is split into two halves of its
+    date window, which are run in parallel, recursively until no results are truncated. A job fails if any of its
+    splits fails, so that no window is silently skipped.
+
+    Args:
+        jobs (List[SearchJob]): The searches to run.
+        timeout (Optional[float]): Timeout in seconds for each job and its splits, or None to wait indefinitely.
+        logger (Optional[Logger]): Logger for failed jobs.
+        cache (Optional[SearchCache]): If given, jobs whose `output_file` is a fresh cache entry are not run again.
+        split_truncated (bool): Split the date window of truncated searches.
+        max_workers (Optional[int]): Maximum number of searches running at once. Defaults to at least 8.
+
+    Returns:
+        List[SearchJob]: The successful searches, in the order of the jobs and of their date windows. Their papers
+            are read with `iter_papers`.
+
+    Raises:
+        RuntimeError: If every job failed.
+    """
+    if not jobs:
+        return []
+    logger = logger or Logger("SearchJobs")
+    slots = asyncio.Semaphore(max_workers or max(8, len(jobs)))
+
+    def run_in_thread(function: Callable[[], None]) -> Awaitable[None]:
+        return _run_in_daemon_thread(function, slots)
+
+    results = await asyncio.gather(
+        *(asyncio.wait_for(_run_job(job, run_in_thread, logger, cache, split_truncated), timeout) for job in jobs),
+        return_exceptions=True,
+    )
+
+    completed: List[SearchJob] = []
+    failed: List[str] = []
+    for job, result in zip(jobs, results):
+        if isinstance(result, asyncio.TimeoutError):
+            logger.error(f"Search '{job.name}' timed out after {timeout} seconds.")
+            failed.append(job.name)
+        elif isinstance(result, BaseException):
+            logger.error(f"Search '{job.name}' failed: {result!r}")
+            failed.append(job.name)
+        else:
+            completed.extend(result)
+
+    if len(failed) == len(jobs):
+        e = f"All searches failed: {', '.join(failed)}."
+        raise RuntimeError(e)
+    return completed
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import time
+from datetime import date
+from typing import List, Sequence
+
+
+class SearchCache:
+    """
+    A content-addressed cache of findpapers result files.
+
+    Each search is stored under a hash of its query, databases, date window and limits, so a rerun of the same search
+    on the same day reuses the result file while any change of the parameters leads to a new search.
+
+    Args:
+        directory (str): Directory of the cached result files, created if needed.
+        ttl_hours (float): Hours during which a result file is reused. 0 disables reuse.
+
+    Methods:
+        path(query, databases, since, until, limit, limit_per_database): Returns the result file of a search.
+        is_fresh(path): Checks whether a result file can be reused.
+        prune(): Deletes the expired result files.
+    """
+
+    def __init__(self, directory: str, ttl_hours: float = 12) -> None:
+        self.directory: str = directory
+        self.ttl_hours: float = ttl_hours
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(
+        query: str,
+        databases: Sequence[str],
+        since: date,
+        until: date,
+        limit: int,
+        limit_per_database: int,
+    ) -> str:
+        """
+        Returns the cache key of a search.
+
+        Args:
+            query (str): The findpapers query.
+            databases (Sequence[str]): Databases to search in; their order does not matter.
+            since (date): First publication date to search for.
+            until (date): Last publication date to search for.
+            limit (int): Maximum number of papers in total.
+            limit_per_database (int): Maximum number of papers per database.
+
+        Returns:
+            str: A hexadecimal hash of the search parameters.
+        """
+        parameters = {
+            "query": query,
+            "databases": sorted(databases),
+            "since": since.isoformat(),
+            "until": until.isoformat(),
+            "limit": limit,
+            "limit_per_database": limit_per_database,
+        }
+        return hashlib.sha256(json.dumps(parameters, sort_keys=True).encode()).hexdigest()[:32]
+
+    def path(
+        self,
+        query: str,
+        databases: Sequence[str],
+        since: date,
+        until: date,
+        limit: int,
+        limit_per_database: int,
+    ) -> str:
+        """Returns the path of the result file of a search, see `key` for the arguments."""
+        key = self.key(query, databases, since, until, limit, limit_per_database)
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _age_hours(self, path: str) -> float:
+        return (time.time() - os.path.getmtime(path)) / 3600
+
+    def is_fresh(self, path: str) -> bool:
+        """
+        Checks whether a result file exists and is younger than the freshness window.
+
+        Args:
+            path (str): A path returned by `path`.
+
+        Returns:
+            bool: True if the search does not have to be run again.
+        """
+        return self.ttl_hours > 0 and os.path.exists(path) and self._age_hours(path) < self.ttl_hours
+
+    def prune(self) -> List[str]:
+        """
+        Deletes the result files that are older than the freshness window, and leftovers of interrupted searches.
+
+        Returns:
+            List[str]: The deleted files.
+        """
+        deleted = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not os.path.isfile(path):
+                continue
+            if name.endswith(".tmp") or self._age_hours(path) >= self.ttl_hours:
+                os.remove(path)
+                deleted.append(path)
+        return deleted
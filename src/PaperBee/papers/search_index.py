@@ -0,0 +1,163 @@
+import re
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import pandas as pd
+
+from .paper_record import COLUMNS, PaperRecord
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS papers (
+        id INTEGER PRIMARY KEY,
+        doi TEXT NOT NULL UNIQUE,
+        date TEXT,
+        posted_date TEXT,
+        is_preprint INTEGER,
+        title TEXT,
+        keywords TEXT,
+        preprint TEXT,
+        url TEXT
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+        title, keywords, doi, content='papers', content_rowid='id', tokenize='unicode61'
+    )
+    """,
+    # Keep the full-text index in sync with the papers table
+    """
+    CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN
+        INSERT INTO papers_fts (rowid, title, keywords, doi) VALUES (new.id, new.title, new.keywords, new.doi);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN
+        INSERT INTO papers_fts (papers_fts, rowid, title, keywords, doi)
+        VALUES ('delete', old.id, old.title, old.keywords, old.doi);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE ON papers BEGIN
+        INSERT INTO papers_fts (papers_fts, rowid, title, keywords, doi)
+        VALUES ('delete', old.id, old.title, old.keywords, old.doi);
+        INSERT INTO papers_fts (rowid, title, keywords, doi) VALUES (new.id, new.title, new.keywords, new.doi);
+    END
+    """,
+]
+
+
+def fts_query(query: str) -> str:
+    """
+    Converts a free-text query into an FTS5 query matching papers that contain all of its words.
+
+    Words are quoted, so characters with a meaning in the FTS5 syntax (e.g. '-', ':' or '"') cannot break the query.
+
+    Args:
+        query (str): The user's query, e.g. 'single-cell atlas'.
+
+    Returns:
+        str: The FTS5 query, or an empty string if the query contains no words.
+    """
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", query))
+
+
+class PaperSearchIndex:
+    """
+    A local SQLite FTS5 index over the titles, keywords and DOIs of every processed paper.
+
+    Ad-hoc searches, e.g. from a chat command, are answered from the index instead of a live search.
+
+    Args:
+        db_path (str): Path to the SQLite database file.
+
+    Methods:
+        add(papers): Adds or updates papers.
+        search(query, limit): Finds papers matching all words of a query.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path: str = db_path
+        with self._connect() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0])
+
+    def add(self, papers: List[PaperRecord]) -> None:
+        """
+        Adds papers to the index, replacing the entries of papers with the same DOI.
+
+        Args:
+            papers (List[PaperRecord]): The processed papers.
+        """
+        rows = [
+            (
+                paper.doi,
+                paper.date,
+                paper.posted_date,
+                int(paper.is_preprint),
+                paper.title,
+                paper.keywords,
+                paper.preprint,
+                paper.url,
+            )
+            for paper in papers
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO papers (doi, date, posted_date, is_preprint, title, keywords, preprint, url)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (doi) DO UPDATE SET
+                    date = excluded.date,
+                    posted_date = excluded.posted_date,
+                    is_preprint = excluded.is_preprint,
+                    title = excluded.title,
+                    keywords = excluded.keywords,
+                    preprint = excluded.preprint,
+                    url = excluded.url
+                """,
+                rows,
+            )
+
+    def search(self, query: str, limit: int = 1000) -> pd.DataFrame:
+        """
+        Finds the papers whose title, keywords or DOI contain all words of a query, best matches first.
+
+        Args:
+            query (str): The user's query, e.g. 'single-cell atlas'.
+            limit (int): Maximum number of papers returned.
+
+        Returns:
+            pd.DataFrame: The matching papers, with the columns of the Google Sheet.
+        """
+        match = fts_query(query)
+        rows = []
+        if match:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT p.doi, p.date, p.posted_date, p.is_preprint, p.title, p.keywords, p.preprint, p.url
+                    FROM papers_fts JOIN papers AS p ON p.id = papers_fts.rowid
+                    WHERE papers_fts MATCH ?
+                    ORDER BY bm25(papers_fts), p.date DESC
+                    LIMIT ?
+                    """,
+                    (match, limit),
+                ).fetchall()
+        papers = [PaperRecord.from_row([*row[:3], bool(row[3]), *row[4:]]) for row in rows]
+        return pd.DataFrame([paper.to_row() for paper in papers], columns=list(COLUMNS))
@@ -0,0 +1,76 @@
+import re
+from datetime import date
+from typing import Dict, List, Optional
+
+# Ways of splitting the papers into worksheets
+SHARDING_POLICIES = ("none", "year", "quarter")
+
+
+class SheetShardPolicy:
+    """
+    Maps papers to the worksheet they are written to, by the date they were found.
+
+    With 'none', every paper is written to the worksheet `sheet_name`. With 'year' or 'quarter', the papers of each
+    period are written to their own worksheet, e.g. 'Papers 2025' or 'Papers 2025-Q3', so that no worksheet grows
+    without bounds. Shards can be kept in other spreadsheets than the default one, e.g. to stay below the cell limit
+    of a spreadsheet. The unsharded worksheet `sheet_name` always counts as a shard, so the papers listed before the
+    sharding was turned on are still found.
+
+    Args:
+        sheet_name (str): Name of the unsharded worksheet, and prefix of the shard names.
+        sharding (str): One of `SHARDING_POLICIES`.
+        spreadsheet_id (str): The spreadsheet holding the shards by default.
+        spreadsheets (Optional[Dict[str, str]]): Spreadsheet IDs of the shards kept in other spreadsheets, by shard name.
+
+    Methods:
+        shard(day): Returns the name of the worksheet of the papers found on a day.
+        is_shard(title): Checks whether a worksheet is a shard.
+        spreadsheet_of(shard): Returns the ID of the spreadsheet holding a shard.
+        spreadsheet_ids(): Returns the IDs of the spreadsheets that can hold shards.
+    """
+
+    def __init__(
+        self,
+        sheet_name: str = "Papers",
+        sharding: str = "none",
+        spreadsheet_id: str = "",
+        spreadsheets: Optional[Dict[str, str]] = None,
+    ) -> None:
+        if sharding not in SHARDING_POLICIES:
+            e = f"Invalid sheet sharding '{sharding}'. Allowed values are: {SHARDING_POLICIES}"
+            raise ValueError(e)
+        self.sheet_name: str = sheet_name
+        self.sharding: str = sharding
+        self.spreadsheet_id: str = spreadsheet_id
+        self.spreadsheets: Dict[str, str] = dict(spreadsheets or {})
+        suffix = {"none": "", "year": r" \d{4}", "quarter": r" \d{4}-Q[1-4]"}[sharding]
+        self._pattern = re.compile(f"{re.escape(sheet_name)}(?:{suffix})?")
+
+    def shard(self, day: str) -> str:
+        """
+        Returns the name of the worksheet of the papers found on a day.
+
+        Args:
+            day (str): The date the papers were found, formatted as YYYY-mm-dd.
+
+        Returns:
+            str: The name of the worksheet.
+        """
+        if self.sharding == "none":
+            return self.sheet_name
+        found = date.fromisoformat(day)
+        if self.sharding == "year":
+            return f"{self.sheet_name} {found.year}"
+        return f"{self.sheet_name} {found.year}-Q{(found.month - 1) // 3 + 1}"
+
+    def is_shard(self, title: str) -> bool:
+        """Checks whether a worksheet holds papers of this policy, including the unsharded worksheet."""
+        return self._pattern.fullmatch(title) is not None
+
+    def spreadsheet_of(self, shard: str) -> str:
+        """Returns the ID of the spreadsheet holding a shard."""
+        return self.spreadsheets.get(shard, self.spreadsheet_id)
+
+    def spreadsheet_ids(self) -> List[str]:
+        """Returns the IDs of the spreadsheets that can hold shards, the default one first."""
+        return list(dict.fromkeys([self.spreadsheet_id, *self.spreadsheets.values()]))
@@ -6,6 +6,8 @@ import pandas as pd
 from slack_sdk import WebClient
 from slack_sdk.web.slack_response import SlackResponse
 
+from .paper_record import PaperRecord
+
 
 class SlackPaperPublisher:
     """
@@ -32,13 +34,13 @@ class SlackPaperPublisher:
 
     @staticmethod
     def format_papers_for_slack(
-        papers_list: List[List[str]],
+        papers_list: List[PaperRecord],
     ) -> Tuple[List[str], List[str]]:
         """
         Formats a list of papers into separate lists for regular papers and preprints with Slack message formatting.
 
         Args:
-            papers_list (List[List[str]]): A list of papers, where each paper is a list of Args.
+            papers_list (List[PaperRecord]): A list of papers.
 
         Returns:
             Tuple[List[str], List[str]]: Two lists, one for regular papers and one for preprints, each formatted for Slack.
@@ -46,9 +48,9 @@ class SlackPaperPublisher:
         papers = []
         preprints = []
         for paper in papers_list:
-            emoji = ":pencil:" if paper[3] == "TRUE" else ":rolled_up_newspaper:"
-            formatted_paper = f"{emoji} <{paper[-1]}|{paper[4]}>"
-            if paper[3] == "TRUE":
+            emoji = ":pencil:" if paper.is_preprint else ":rolled_up_newspaper:"
+            formatted_paper = f"{emoji} <{paper.url}|{paper.title}>"
+            if paper.is_preprint:
                 preprints.append(formatted_paper)
             else:
                 papers.append(formatted_paper)
@@ -3,6 +3,8 @@ from typing import List, Optional, Tuple
 
 from telegram import Bot, Message
 
+from .paper_record import PaperRecord
+
 
 def escape_reserved_symbols(text: str, symbols: str = "!.-+>()") -> str:
     """
@@ -58,13 +60,13 @@ class TelegramPaperPublisher:
 
     @staticmethod
     def format_papers(
-        papers_list: List[List[str]],
+        papers_list: List[PaperRecord],
     ) -> Tuple[List[str], List[str]]:
         """
         Formats a list of papers into separate lists for regular papers and preprints with Telegram MarkdownV2 formatting.
 
         Args:
-            papers_list (List[List[str]]): A list of papers, where each paper is a list of Args.
+            papers_list (List[PaperRecord]): A list of papers.
 
         Returns:
             Tuple[List[str], List[str]]: Two lists, one for regular papers and one for preprints, each formatted for Telegram.
@@ -72,12 +74,12 @@ class TelegramPaperPublisher:
         papers = []
         preprints = []
         for paper in papers_list:
-            emoji = "✏️" if paper[3] == "TRUE" else "🗞️"
-            title = escape_reserved_symbols(paper[4])
-            link = escape_reserved_symbols(paper[-1])
+            emoji = "✏️" if paper.is_preprint else "🗞️"
+            title = escape_reserved_symbols(paper.title)
+            link = escape_reserved_symbols(paper.url)
             formatted_paper = f"{emoji} [{title}]({link})"
 
-            if paper[3] == "TRUE":
+            if paper.is_preprint:
                 preprints.append(formatted_paper)
             else:
                 papers.append(formatted_paper)
@@ -1,10 +1,13 @@
+import re
 from datetime import date, datetime
 from time import sleep
-from typing import List, Optional, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import defusedxml.ElementTree as ET  # Using defusedxml for security
 import pandas as pd
-import requests
+
+from .http_session import get_session
+from .paper_record import ARTICLE_DTYPES, COLUMNS
 
 
 class ArticlesProcessor:
@@ -12,6 +15,9 @@ class ArticlesProcessor:
     Processes a list of articles, including filtering columns, extracting DOIs,
     setting dates, determining preprint status, and more.
 
+    The processed articles use the compact dtypes of `ARTICLE_DTYPES`; `PaperRecord.from_frame` converts them to
+    plain Python values for the Google Sheet and the messaging platforms.
+
     Args:
         articles (pd.DataFrame): DataFrame containing articles information.
         today_str (str): The current date as a string.
@@ -49,10 +55,14 @@ class ArticlesProcessor:
         else:
             self.articles = self.articles.loc[:, columns]
 
+    # The transforms below process whole columns in one pass over their values. pandas string methods on object
+    # columns also loop in Python, with more overhead per row than `.apply` (see benchmarks/).
+
     def extract_doi(self) -> None:
         """Extracts DOIs from URLs and adds them as a new column."""
         if not self.articles.empty:
-            self.articles["DOI"] = self.articles["url"].apply(lambda x: x[x.find("10.") :])
+            urls = self.articles["url"].to_numpy()
+            self.articles["DOI"] = [url[url.find("10.") :] for url in urls]
 
     def set_dates(self) -> None:
         """Sets the publication date and the date of processing."""
@@ -63,27 +73,72 @@ class ArticlesProcessor:
     def determine_preprint_status(self) -> None:
         """Determines whether each article is a preprint based on its database."""
         if not self.articles.empty:
-            self.articles["IsPreprint"] = self.articles["databases"].apply(
-                lambda dbs: "FALSE" if "PubMed" in dbs else "TRUE"
-            )
+            databases = self.articles["databases"].to_numpy()
+            self.articles["IsPreprint"] = ["FALSE" if "PubMed" in dbs else "TRUE" for dbs in databases]
 
     def rename_and_process_columns(self) -> None:
         """Renames columns and processes keywords."""
         if not self.articles.empty:
+            # Keywords are prefixed with their source, e.g. "K-single-cell"
+            keywords = self.articles["keywords"].to_numpy()
             self.articles["Title"] = self.articles["title"]
-            self.articles["Keywords"] = self.articles["keywords"].apply(lambda kws: ", ".join(kw[2:] for kw in kws))
+            self.articles["Keywords"] = [", ".join([kw[2:] for kw in kws]) for kws in keywords]
             self.articles["URL"] = self.articles["url"]
 
     def select_last_columns(self) -> None:
         """Selects and rearranges the final set of columns for the DataFrame."""
-        expected_columns = ["DOI", "Date", "PostedDate", "IsPreprint", "Title", "Keywords", "Preprint", "URL"]
+        expected_columns = list(COLUMNS)
         if self.articles.empty:
             self.articles["Preprint"] = []
             # Create empty DataFrame with expected columns
             self.articles = pd.DataFrame(columns=expected_columns)
         else:
-            self.articles["Preprint"] = None  # TODO add search for preprint of published articles
+            self.articles["Preprint"] = None  # Filled by PreprintLinker
             self.articles = self.articles[expected_columns]
+        self.articles = self.articles.astype(ARTICLE_DTYPES)
+
+
+def normalize_title(title: str) -> str:
+    """
+    Normalizes a publication title for matching: lowercase, alphanumeric characters only, single spaces.
+
+    Args:
+        title (str): The title to normalize.
+
+    Returns:
+        str: The normalized title.
+    """
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", title.lower()).split())
+
+
+def parse_pubmed_articles(content: Union[str, bytes]) -> List[Dict[str, Optional[str]]]:
+    """
+    Parses an efetch XML response into a list of PubMed articles with their title and DOI.
+
+    Args:
+        content (Union[str, bytes]): The XML returned by efetch.
+
+    Returns:
+        List[Dict[str, Optional[str]]]: One dictionary per article with the keys 'pmid', 'title' and 'doi'.
+    """
+    root = ET.fromstring(content)  # Using defusedxml for parsing
+    articles: List[Dict[str, Optional[str]]] = []
+    for pubmed_article in root.findall(".//PubmedArticle"):
+        pmid = pubmed_article.findtext(".//PMID")
+        title_el = pubmed_article.find(".//ArticleTitle")
+        title = "".join(title_el.itertext()) if title_el is not None else ""
+        doi = None
+        for el in pubmed_article.findall(".//Article/ELocationID"):
+            if el.attrib.get("EIdType") == "doi" and el.text:
+                doi = str(el.text)
+                break
+        if doi is None:
+            for el in pubmed_article.findall(".//ArticleIdList/ArticleId"):
+                if el.attrib.get("IdType") == "doi" and el.text:
+                    doi = str(el.text)
+                    break
+        articles.append({"pmid": pmid, "title": title, "doi": doi})
+    return articles
 
 
 class PubMedClient:
@@ -91,6 +146,8 @@ class PubMedClient:
     A client for fetching DOI (Digital Object Identifier) information for publications from PubMed.
     """
 
+    base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+
     @staticmethod
     def get_doi_from_title(
         title: str,
@@ -110,12 +167,12 @@ class PubMedClient:
             Optional[str]: The DOI of the publication if found, otherwise None.
         """
         api_key = f"&api_key={ncbi_api_key}" if ncbi_api_key else ""
-        base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+        base_url = PubMedClient.base_url
         search_url = f"{base_url}esearch.fcgi?db=pubmed&term={title}&retmode=json{api_key}"
 
         for _ in range(n_retries):
             try:
-                search_response = requests.get(search_url, timeout=10)  # Added timeout
+                search_response = get_session().get(search_url, timeout=10)  # Added timeout
                 search_data = search_response.json()
 
                 # NCBI does not allow more than 3 requests per second (10 with an API key)
@@ -142,7 +199,7 @@ class PubMedClient:
         if seconds_to_wait:
             sleep(seconds_to_wait)
         fetch_url = f"{base_url}efetch.fcgi?db=pubmed&id={pubmed_id}&retmode=xml"
-        fetch_response = requests.get(fetch_url, timeout=10)  # Added timeout
+        fetch_response = get_session().get(fetch_url, timeout=10)  # Added timeout
         root = ET.fromstring(fetch_response.content)  # Using defusedxml for parsing
 
         for article in root.findall(".//Article"):
@@ -151,6 +208,79 @@ class PubMedClient:
                     return str(el.text)
         return None
 
+    @staticmethod
+    def batch_search_params(titles: List[str], ncbi_api_key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Builds the parameters of an esearch request that matches any of the titles.
+
+        Args:
+            titles (List[str]): The titles of the publications.
+            ncbi_api_key (Optional[str]): Optional API key for NCBI.
+
+        Returns:
+            Dict[str, Any]: The esearch parameters.
+        """
+        terms = []
+        for title in titles:
+            # Quotes and brackets would break the phrase search
+            cleaned = " ".join(re.sub(r'["\[\]()]', " ", title).split())
+            terms.append(f'"{cleaned}"[Title]')
+        params: Dict[str, Any] = {
+            "db": "pubmed",
+            "term": " OR ".join(terms),
+            "retmode": "json",
+            "retmax": len(titles) * 5,
+        }
+        if ncbi_api_key:
+            params["api_key"] = ncbi_api_key
+        return params
+
+    @staticmethod
+    def fetch_params(pubmed_ids: List[str], ncbi_api_key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Builds the parameters of an efetch request for all given PMIDs.
+
+        Args:
+            pubmed_ids (List[str]): The PubMed identifiers to fetch.
+            ncbi_api_key (Optional[str]): Optional API key for NCBI.
+
+        Returns:
+            Dict[str, Any]: The efetch parameters.
+        """
+        params: Dict[str, Any] = {"db": "pubmed", "id": ",".join(pubmed_ids), "retmode": "xml"}
+        if ncbi_api_key:
+            params["api_key"] = ncbi_api_key
+        return params
+
+    @staticmethod
+    def match_titles(
+        titles: List[str], records: List[Dict[str, Optional[str]]]
+    ) -> Tuple[Dict[str, Optional[str]], List[str]]:
+        """
+        Maps titles to the DOIs of fetched PubMed records with the same normalized title.
+
+        Args:
+            titles (List[str]): The titles of the publications.
+            records (List[Dict[str, Optional[str]]]): Records returned by `parse_pubmed_articles`.
+
+        Returns:
+            Tuple[Dict[str, Optional[str]], List[str]]: The matched DOIs, and the titles that matched no record
+                or several records with different DOIs.
+        """
+        found: Dict[str, Set[Optional[str]]] = {}
+        for record in records:
+            found.setdefault(normalize_title(record["title"] or ""), set()).add(record["doi"])
+
+        matched: Dict[str, Optional[str]] = {}
+        unmatched: List[str] = []
+        for title in titles:
+            candidates = found.get(normalize_title(title), set())
+            if len(candidates) == 1:
+                matched[title] = next(iter(candidates))
+            else:  # Not matched or ambiguous
+                unmatched.append(title)
+        return matched, unmatched
+
 
 def parse_date(date_str: Union[str, date]) -> date:
     """
@@ -0,0 +1,68 @@
+import hashlib
+import json
+import os
+from datetime import date
+from typing import Dict, Optional
+
+from .utils import parse_date
+
+
+class SearchWatermarks:
+    """
+    Persists, per (query, database), the `until` date of the last successfully processed search.
+
+    The next search only has to cover the gap since the watermark, so catch-up runs after missed days or with a large
+    `--since` only fetch papers that have not been processed yet.
+
+    Args:
+        path (str): Path to the JSON file storing the watermarks.
+
+    Methods:
+        get(query, database): Returns the watermark of a query and database.
+        update(query, database, until): Moves the watermark forward and saves it.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self.watermarks: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path) as watermarks_file:
+                self.watermarks = json.load(watermarks_file)
+
+    @staticmethod
+    def key(query: str, database: str) -> str:
+        """Returns the key of a query and database, hashing the query to keep keys short."""
+        query_hash = hashlib.sha256(query.encode()).hexdigest()[:16]
+        return f"{database}:{query_hash}"
+
+    def get(self, query: str, database: str) -> Optional[date]:
+        """
+        Returns the watermark of a query and database.
+
+        Args:
+            query (str): The findpapers query.
+            database (str): The database, e.g. 'pubmed'.
+
+        Returns:
+            Optional[date]: The `until` date of the last processed search, or None if there was none.
+        """
+        value = self.watermarks.get(self.key(query, database))
+        return parse_date(value) if value else None
+
+    def update(self, query: str, database: str, until: date) -> None:
+        """
+        Moves the watermark of a query and database forward and saves all watermarks.
+
+        Args:
+            query (str): The findpapers query.
+            database (str): The database, e.g. 'pubmed'.
+            until (date): The `until` date of the processed search. Older dates are ignored.
+        """
+        current = self.get(query, database)
+        if current is not None and current >= until:
+            return
+        self.watermarks[self.key(query, database)] = until.strftime("%Y-%m-%d")
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as watermarks_file:
+            json.dump(self.watermarks, watermarks_file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
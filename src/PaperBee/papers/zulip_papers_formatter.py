@@ -5,6 +5,8 @@ from typing import Any, List, Optional, Tuple
 import pandas as pd
 import zulip
 
+from .paper_record import PaperRecord
+
 
 class ZulipPaperPublisher:
     """
@@ -39,13 +41,13 @@ class ZulipPaperPublisher:
 
     @staticmethod
     def format_papers_for_zulip(
-        papers_list: List[List[str]],
+        papers_list: List[PaperRecord],
     ) -> Tuple[List[str], List[str]]:
         """
         Formats a list of papers into separate lists for regular papers and preprints with Zulip message formatting.
 
         Args:
-            papers_list (List[List[str]]): A list of papers, where each paper is a list of attributes.
+            papers_list (List[PaperRecord]): A list of papers.
 
         Returns:
             Tuple[List[str], List[str]]: Two lists, one for regular papers and one for preprints, each formatted for Zulip.
@@ -53,9 +55,9 @@ class ZulipPaperPublisher:
         papers = []
         preprints = []
         for paper in papers_list:
-            emoji = "🖊️" if paper[3] == "TRUE" else "📰"
-            formatted_paper = f"{emoji} [{paper[4]}]({paper[-1]})"
-            if paper[3] == "TRUE":
+            emoji = "🖊️" if paper.is_preprint else "📰"
+            formatted_paper = f"{emoji} [{paper.title}]({paper.url})"
+            if paper.is_preprint:
                 preprints.append(formatted_paper)
             else:
                 papers.append(formatted_paper)
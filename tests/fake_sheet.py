@@ -0,0 +1,151 @@
+from collections import Counter
+
+from gspread.exceptions import APIError, WorksheetNotFound
+from gspread.utils import a1_to_rowcol
+
+HEADER = ["DOI", "Date", "PostedDate", "IsPreprint", "Title", "Keywords", "Preprint", "URL"]
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.text = f"HTTP {status_code}"
+
+    def json(self):
+        return {"error": {"code": self.status_code, "message": self.text}}
+
+
+class FakeSpreadsheet:
+    """An in-memory spreadsheet; its revision changes with every edit of any of its worksheets."""
+
+    def __init__(self):
+        self.sheets = []
+        self.revision = 0
+        self.failures = []  # Status codes of the next requests, None for a success
+
+    def get_lastUpdateTime(self):
+        return f"2024-01-01T00:00:{self.revision:02d}Z"
+
+    def worksheet(self, title):
+        for sheet in self.sheets:
+            if sheet.title == title:
+                return sheet
+        raise WorksheetNotFound(title)
+
+    def worksheets(self):
+        return list(self.sheets)
+
+    def add_worksheet(self, title, rows, cols):
+        sheet = FakeWorksheet([], empty_rows=rows - 1, title=title, spreadsheet=self)
+        sheet.rows = [[]]
+        self.revision += 1
+        return sheet
+
+    def fetch_sheet_metadata(self, params=None):
+        sheets = [
+            {"properties": {"sheetId": sheet.id}, "filterViews": [{"title": title} for title in sheet.filter_views]}
+            for sheet in self.sheets
+        ]
+        return {"sheets": sheets}
+
+    def batch_update(self, body):
+        requests = body["requests"]
+        worksheet = self.sheets[_sheet_id(requests[0])]
+        worksheet.calls["batch_update"] += 1
+        status_code = self.failures.pop(0) if self.failures else None
+        if status_code:
+            raise APIError(FakeResponse(status_code))
+        if "insertDimension" in requests[0]:
+            insert, update = requests
+            start = insert["insertDimension"]["range"]["startIndex"]
+            worksheet.rows[start:start] = _values(update["updateCells"]["rows"])
+            worksheet.row_count += len(update["updateCells"]["rows"])
+        for request in requests:
+            if "appendCells" in request:
+                # Fills the empty rows of the grid first, like the Sheets API
+                worksheet.rows.extend(_values(request["appendCells"]["rows"]))
+                worksheet.row_count = max(worksheet.row_count, len(worksheet.rows))
+            elif "sortRange" in request:
+                (spec,) = request["sortRange"]["sortSpecs"]
+                worksheet.rows[1:] = sorted(
+                    worksheet.rows[1:],
+                    key=lambda row: row[spec["dimensionIndex"]],
+                    reverse=spec["sortOrder"] == "DESCENDING",
+                )
+            elif "addFilterView" in request:
+                worksheet.filter_views.append(request["addFilterView"]["filter"]["title"])
+        self.revision += 1
+        if not body.get("includeSpreadsheetInResponse"):
+            return {}
+        properties = {"sheetId": worksheet.id, "gridProperties": {"rowCount": worksheet.row_count}}
+        return {"updatedSpreadsheet": {"sheets": [{"properties": properties}]}}
+
+
+def _sheet_id(request):
+    (fields,) = request.values()
+    return fields["sheetId"] if "sheetId" in fields else fields["range"]["sheetId"]
+
+
+def _values(rows):
+    return [[cell["userEnteredValue"]["stringValue"] if cell else "" for cell in row["values"]] for row in rows]
+
+
+class FakeWorksheet:
+    """An in-memory worksheet that counts the API calls."""
+
+    def __init__(self, rows, empty_rows=0, title="Papers", spreadsheet=None):
+        self.rows = [HEADER, *rows]
+        self.row_count = len(self.rows) + empty_rows
+        self.title = title
+        self.filter_views = []
+        self.spreadsheet = spreadsheet or FakeSpreadsheet()
+        self.id = len(self.spreadsheet.sheets)
+        self.spreadsheet.sheets.append(self)
+        self.calls = Counter()
+
+    def row_values(self, row):
+        self.calls["row_values"] += 1
+        return list(self.rows[row - 1]) if row <= len(self.rows) else []
+
+    def batch_get(self, ranges, major_dimension=None):
+        self.calls["batch_get"] += 1
+        values = []
+        for a1_range in ranges:
+            start, end = a1_range.split(":")
+            first_row, col = a1_to_rowcol(start)
+            last_row = a1_to_rowcol(end)[0] if end[-1].isdigit() else len(self.rows)
+            column = [row[col - 1] if col <= len(row) else "" for row in self.rows[first_row - 1 : last_row]]
+            while column and not column[-1]:
+                column.pop()
+            values.append([column] if column else [])
+        return values
+
+    def get_all_records(self):
+        self.calls["get_all_records"] += 1
+        return [dict(zip(HEADER, row)) for row in self.rows[1:]]
+
+    def update(self, values, range_name):
+        self.rows[: len(values)] = [list(row) for row in values]
+        self.spreadsheet.revision += 1
+
+    def insert_rows(self, values, row, inherit_from_before=False):
+        """Inserts rows like an edit by hand."""
+        self.rows[row - 1 : row - 1] = values
+        self.row_count += len(values)
+        self.spreadsheet.revision += 1
+
+
+class FakeClient:
+    """A client of in-memory spreadsheets by ID, counting how often they are opened."""
+
+    def __init__(self, spreadsheets):
+        self.spreadsheets = spreadsheets
+        self.opened = Counter()
+
+    def open_by_key(self, key):
+        self.opened[key] += 1
+        return self.spreadsheets[key]
+
+
+def make_row(doi, title):
+    return [doi, "2024-01-03", "2024-01-01", "TRUE", title, "", "", f"https://doi.org/{doi}"]
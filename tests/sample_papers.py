@@ -1,26 +1,28 @@
+from PaperBee.papers import PaperRecord
+
 sample_papers = [
-    [
-        "10.1101/2024.04.26.591400",
-        "2024-04-29",
-        "2024-04-28",
-        "TRUE",
-        "Single-Cell Transcriptomics Reveals the Molecular Logic Underlying Ca2+ Signaling Diversity in Human and Mouse Brain",
-        "https://doi.org/10.1101/2024.04.26.591400",
-    ],
-    [
-        "10.1101/2024.04.22.590645",
-        "2024-04-29",
-        "2024-04-26",
-        "TRUE",
-        "scMUSCL: Multi-Source Transfer Learning for Clustering scRNA-seq Data",
-        "https://doi.org/10.1101/2024.04.22.590645",
-    ],
-    [
-        "10.1101/2024.04.21.590442",
-        "2024-04-29",
-        "2024-04-26",
-        "TRUE",
-        "Imbalance and Composition Correction Ensemble Learning Framework (ICCELF): A novel framework for automated scRNA-seq cell type annotation",
-        "https://doi.org/10.1101/2024.04.21.590442",
-    ],
+    PaperRecord(
+        doi="10.1101/2024.04.26.591400",
+        date="2024-04-29",
+        posted_date="2024-04-28",
+        is_preprint=True,
+        title="Single-Cell Transcriptomics Reveals the Molecular Logic Underlying Ca2+ Signaling Diversity in Human and Mouse Brain",
+        url="https://doi.org/10.1101/2024.04.26.591400",
+    ),
+    PaperRecord(
+        doi="10.1101/2024.04.22.590645",
+        date="2024-04-29",
+        posted_date="2024-04-26",
+        is_preprint=True,
+        title="scMUSCL: Multi-Source Transfer Learning for Clustering scRNA-seq Data",
+        url="https://doi.org/10.1101/2024.04.22.590645",
+    ),
+    PaperRecord(
+        doi="10.1101/2024.04.21.590442",
+        date="2024-04-29",
+        posted_date="2024-04-26",
+        is_preprint=True,
+        title="Imbalance and Composition Correction Ensemble Learning Framework (ICCELF): A novel framework for automated scRNA-seq cell type annotation",
+        url="https://doi.org/10.1101/2024.04.21.590442",
+    ),
 ]
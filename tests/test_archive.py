@@ -0,0 +1,60 @@
+from datetime import date
+
+from PaperBee.papers import PaperRecord
+from PaperBee.papers.archive import ArticleArchive
+
+
+def make_paper(doi, day, title="A paper", is_preprint=True):
+    return PaperRecord(doi, day, "2024-01-01", is_preprint, title, "single-cell", None, f"https://doi.org/{doi}")
+
+
+def test_append_and_read_by_date(tmp_path):
+    archive = ArticleArchive(str(tmp_path / "archive"))
+    archive.append([make_paper("10.1/a", "2024-01-02"), make_paper("10.1/b", "2024-01-03", is_preprint=False)])
+    archive.append([make_paper("10.1/c", "2024-01-03")])
+
+    assert archive.partitions() == ["2024-01-02", "2024-01-03"]
+    assert archive.read()["DOI"].tolist() == ["10.1/a", "10.1/b", "10.1/c"]
+    january_3 = archive.read(since="2024-01-03", columns=["DOI", "IsPreprint"])
+    assert january_3.columns.tolist() == ["DOI", "IsPreprint"]
+    assert january_3["IsPreprint"].tolist() == [False, True]
+    assert january_3["DOI"].dtype == "string[pyarrow]"
+    assert PaperRecord.from_frame(archive.read(until="2024-01-02")) == [make_paper("10.1/a", "2024-01-02")]
+    assert archive.read(since="2025-01-01").empty
+
+
+def test_compact_merges_files_and_drops_repeated_dois(tmp_path):
+    archive = ArticleArchive(str(tmp_path))
+    archive.append([make_paper("10.1/a", "2024-01-02"), make_paper("10.1/b", "2024-01-02")])
+    archive.append([make_paper("10.1/a", "2024-01-02", title="Rerun")])
+    archive.append([make_paper("10.1/c", "2024-01-03")])
+    archive.append([make_paper("10.1/d", "2024-01-03")])
+
+    assert archive.compact(before="2024-01-03") == ["2024-01-02"]
+    assert len(archive._files("2024-01-02")) == 1
+    assert len(archive._files("2024-01-03")) == 2
+    papers = archive.read(until="2024-01-02")
+    assert sorted(zip(papers["DOI"], papers["Title"])) == [("10.1/a", "Rerun"), ("10.1/b", "A paper")]
+
+
+def test_retention_by_age_and_size(tmp_path):
+    archive = ArticleArchive(str(tmp_path), retention_days=30)
+    for day in ["2023-11-01", "2024-01-01", "2024-01-02", "2024-01-03"]:
+        archive.append([make_paper(f"10.1/{day}", day)])
+
+    assert archive.apply_retention(today=date(2024, 1, 10)) == ["2023-11-01"]
+
+    partition_size = archive.size_bytes() / 3
+    archive.max_size_mb = 2.5 * partition_size / 1024 / 1024
+    assert archive.apply_retention(today=date(2024, 1, 10)) == ["2024-01-01"]
+    assert archive.partitions() == ["2024-01-02", "2024-01-03"]
+
+
+def test_compact_deletes_files_of_crashed_writes(tmp_path):
+    archive = ArticleArchive(str(tmp_path))
+    (path,) = archive.append([make_paper("10.1/a", "2024-01-02")])
+    (tmp_path / "date=2024-01-02" / "compacted-1.parquet.tmp").write_bytes(b"partial")
+
+    archive.compact(before="2024-01-03")
+
+    assert sorted(p.name for p in (tmp_path / "date=2024-01-02").iterdir()) == [path.rsplit("/", 1)[-1]]
@@ -0,0 +1,59 @@
+import asyncio
+
+import httpx
+import pytest
+
+from PaperBee.papers.async_pubmed import AsyncPubMedClient, TokenBucket
+from tests.test_utils import EFETCH_XML
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, capacity=1)
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    for _ in range(5):
+        await bucket.acquire()
+
+    assert loop.time() - start >= 4 / 20 * 0.9
+
+
+@pytest.mark.asyncio
+async def test_client_never_exceeds_the_ncbi_rate():
+    loop = asyncio.get_running_loop()
+    async with AsyncPubMedClient(ncbi_api_key="key") as pubmed_client:
+        times = []
+        for _ in range(25):
+            await pubmed_client.rate_limiter.acquire()
+            times.append(loop.time())
+
+    rate = pubmed_client.rate_limiter.rate
+    assert max(sum(start <= t < start + 0.99 for t in times) for start in times) <= rate
+
+
+@pytest.mark.asyncio
+async def test_get_dois_from_titles_retries_and_batches():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith("esearch.fcgi"):
+            if calls.count(request.url.path) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={"esearchresult": {"idlist": ["111", "222"]}})
+        return httpx.Response(200, content=EFETCH_XML.encode())
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with AsyncPubMedClient(ncbi_api_key="key", client=client) as pubmed_client:
+        dois = await pubmed_client.get_dois_from_titles([
+            "Single-cell atlas of the human lung",
+            "Spatial transcriptomics benchmark",
+        ])
+    await client.aclose()
+
+    assert dois == {
+        "Single-cell atlas of the human lung": "10.1000/lung",
+        "Spatial transcriptomics benchmark": "10.1000/spatial",
+    }
+    assert [path.rsplit("/", 1)[-1] for path in calls] == ["esearch.fcgi", "esearch.fcgi", "efetch.fcgi"]
@@ -0,0 +1,82 @@
+from PaperBee.papers.dedup import DeduplicationIndex, MinHasher, title_shingles
+from PaperBee.papers.preprint_linker import PreprintLinker
+from PaperBee.papers.utils import ArticlesProcessor
+
+
+def test_minhash_similarity_tracks_title_similarity():
+    hasher = MinHasher(num_perm=128)
+    title = "Population-level integration of single-cell datasets enables multi-scale analysis across samples"
+    same = hasher.signature(title_shingles(title.upper() + "."))
+    close = hasher.signature(title_shingles(title.replace("enables", "allows")))
+    other = hasher.signature(title_shingles("Spatial transcriptomics of the developing human heart"))
+    reference = hasher.signature(title_shingles(title))
+
+    assert hasher.similarity(reference, same) == 1.0
+    assert hasher.similarity(reference, close) > 0.7
+    assert hasher.similarity(reference, other) < 0.2
+
+
+def test_merge_by_doi_and_title():
+    articles = [
+        {"title": "A single-cell atlas of the lung", "databases": ["bioRxiv"], "doi": "10.1101/lung", "urls": []},
+        {"title": "Spatial transcriptomics benchmark", "databases": ["arXiv"], "doi": None, "urls": []},
+        {"title": "A Single-Cell Atlas of the Lung.", "databases": ["PubMed"], "doi": None, "urls": ["u"]},
+        {"title": "Renamed title", "databases": ["PubMed"], "doi": "10.1101/LUNG", "urls": []},
+        {"title": "A single-cell atlas of the lung", "databases": ["PubMed"], "doi": "10.1000/published", "urls": []},
+    ]
+    index = DeduplicationIndex()
+
+    merged = index.merge(articles)
+
+    assert [article["title"] for article in merged] == [
+        "A single-cell atlas of the lung",
+        "Spatial transcriptomics benchmark",
+        "A Single-Cell Atlas of the Lung.",
+    ]
+    assert merged[0]["databases"] == ["bioRxiv", "PubMed"]  # Same DOI
+    assert merged[2]["urls"] == ["u"]  # Same title, both journal articles
+    assert merged[2]["doi"] == "10.1000/published"
+    assert index.n_duplicates == 2
+
+
+def test_released_articles_are_still_deduplicated():
+    index = DeduplicationIndex()
+    first = [{"title": "A single-cell atlas of the lung", "databases": ["bioRxiv"], "doi": None, "urls": []}]
+    second = [
+        {"title": "A single-cell atlas of the lung", "databases": ["bioRxiv"], "doi": None, "urls": []},
+        {"title": "Spatial transcriptomics benchmark", "databases": ["PubMed"], "doi": None, "urls": []},
+    ]
+
+    assert list(index.iter_unique(first)) == first
+    index.release()
+
+    assert [article["title"] for article in index.iter_unique(second)] == ["Spatial transcriptomics benchmark"]
+    assert index.articles[0] is None
+    assert index.n_duplicates == 1
+
+
+def test_preprint_and_publication_are_linked_not_merged():
+    articles = [
+        {
+            "title": "A single-cell atlas of the lung",
+            "databases": ["bioRxiv"],
+            "publication_date": "2024-01-01",
+            "keywords": [],
+            "url": "https://doi.org/10.1101/lung",
+        },
+        {
+            "title": "A Single-Cell Atlas of the Lung.",
+            "databases": ["PubMed"],
+            "publication_date": "2024-01-02",
+            "keywords": [],
+            "url": "https://doi.org/10.1000/published",
+        },
+    ]
+
+    merged = DeduplicationIndex().merge(articles)
+    processed = ArticlesProcessor(merged, "2024-01-03").articles
+    PreprintLinker.from_frame(processed).link(processed)
+
+    assert processed["DOI"].tolist() == ["10.1101/lung", "10.1000/published"]
+    assert processed["IsPreprint"].tolist() == ["TRUE", "FALSE"]
+    assert processed.loc[processed["IsPreprint"] == "FALSE", "Preprint"].tolist() == ["10.1101/lung"]
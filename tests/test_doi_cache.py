@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+from PaperBee.papers.doi_cache import DOICache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DOICache(str(tmp_path / "doi_cache.sqlite"), hit_ttl_days=10, miss_ttl_days=1, max_entries=3)
+
+
+def test_hits_and_misses_are_cached(cache):
+    cache.set_many({"Single-cell atlas of the lung": "10.1000/lung", "Unknown paper": None})
+
+    cached = cache.get_many(["single-cell atlas of the LUNG.", "Unknown paper", "Not looked up"])
+
+    assert cached == {"single-cell atlas of the LUNG.": "10.1000/lung", "Unknown paper": None}
+
+
+def test_misses_expire_before_hits(cache, monkeypatch):
+    cache.set_many({"Found": "10.1000/found", "Missing": None})
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 2 * 24 * 3600)
+
+    assert cache.get_many(["Found", "Missing"]) == {"Found": "10.1000/found"}
+
+
+def test_seed_and_size_cap(cache):
+    cache.set_many({"Missing": None})
+    cache.seed([("Missing", "10.1000/missing"), ("A", "10.1000/a"), ("B", "10.1000/b"), ("", "10.1000/empty")])
+    cache.set_many({"C": "10.1000/c"})
+
+    cached = cache.get_many(["Missing", "A", "B", "C"])
+
+    assert len(cached) == 3
+    assert cached["C"] == "10.1000/c"
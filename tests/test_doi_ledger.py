@@ -0,0 +1,57 @@
+from PaperBee.papers.doi_ledger import DOILedger
+from PaperBee.papers.google_sheet import SheetSession
+from tests.fake_sheet import FakeWorksheet, make_row
+
+
+def test_sync_reads_only_changed_rows(tmp_path):
+    ledger = DOILedger(str(tmp_path / "doi_ledger.sqlite"))
+    worksheet = FakeWorksheet([make_row("10.1/a", "Paper A"), make_row("10.1/b", "Paper B")], empty_rows=10)
+
+    assert len(ledger.sync("sheet", SheetSession(worksheet))) == 2
+    assert ledger.published("sheet", ["10.1/a", "10.1/c"]) == {"10.1/a"}
+
+    # Nothing changed: the sheet is not read
+    worksheet.calls.clear()
+    assert ledger.sync("sheet", SheetSession(worksheet)) == []
+    assert worksheet.calls["batch_get"] == 0
+
+    # A row added by hand at the top: only that row is read
+    worksheet.insert_rows([make_row("10.1/c", "Paper C")], row=2)
+    assert ledger.sync("sheet", SheetSession(worksheet)) == [{"DOI": "10.1/c", "Title": "Paper C"}]
+    assert ledger.published("sheet", ["10.1/a", "10.1/c"]) == {"10.1/a", "10.1/c"}
+
+    # Rows inserted by PaperBee are recorded without reading them back
+    session = SheetSession(worksheet)
+    session.insert_rows([make_row("10.1/d", "Paper D")])
+    ledger.record("sheet", session, ["10.1/d"])
+    assert ledger.sync("sheet", SheetSession(worksheet)) == []
+    assert ledger.published("sheet", ["10.1/d"]) == {"10.1/d"}
+
+
+def test_sync_reads_everything_after_deletions(tmp_path):
+    ledger = DOILedger(str(tmp_path / "doi_ledger.sqlite"))
+    worksheet = FakeWorksheet([make_row("10.1/a", "Paper A"), make_row("10.1/b", "Paper B")])
+    ledger.sync("sheet", SheetSession(worksheet))
+
+    del worksheet.rows[1]
+    worksheet.row_count -= 1
+    worksheet.spreadsheet.revision += 1
+
+    assert ledger.sync("sheet", SheetSession(worksheet)) == [{"DOI": "10.1/b", "Title": "Paper B"}]
+    assert ledger.published("sheet", ["10.1/a", "10.1/b"]) == {"10.1/b"}
+    assert ledger.published("other sheet", ["10.1/b"]) == set()
+
+
+def test_sync_rebuilds_after_sorting_by_hand(tmp_path):
+    ledger = DOILedger(str(tmp_path / "doi_ledger.sqlite"))
+    worksheet = FakeWorksheet([make_row("10.1/b", "Paper B"), make_row("10.1/c", "Paper C")], empty_rows=10)
+    ledger.sync("sheet", SheetSession(worksheet))
+
+    # A row added at the top, then the sheet sorted by hand so the new row is no longer at the insertion row
+    worksheet.insert_rows([make_row("10.1/a", "Paper A")], row=2)
+    worksheet.rows[1:] = sorted(worksheet.rows[1:], key=lambda row: row[0], reverse=True)
+
+    synced = ledger.sync("sheet", SheetSession(worksheet))
+
+    assert {record["DOI"] for record in synced} == {"10.1/a", "10.1/b", "10.1/c"}
+    assert ledger.published("sheet", ["10.1/a", "10.1/b", "10.1/c"]) == {"10.1/a", "10.1/b", "10.1/c"}
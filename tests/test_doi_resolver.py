@@ -0,0 +1,108 @@
+import httpx
+import pytest
+
+from PaperBee.papers.doi_cache import DOICache
+from PaperBee.papers.doi_resolver import DOIResolver, arxiv_doi, doi_from_string
+
+
+def test_doi_from_string():
+    assert doi_from_string("https://doi.org/10.1101/2024.04.26.591400") == "10.1101/2024.04.26.591400"
+    assert doi_from_string("doi:10.1000/xyz.") == "10.1000/xyz"
+    assert doi_from_string("https://www.biorxiv.org/content/early") is None
+    assert doi_from_string(None) is None
+
+
+def test_arxiv_doi():
+    assert arxiv_doi(["http://arxiv.org/abs/2401.01234v2"]) == "10.48550/arXiv.2401.01234"
+    assert arxiv_doi(["http://arxiv.org/pdf/hep-th/9901001v1"]) == "10.48550/arXiv.hep-th/9901001"
+    assert arxiv_doi(["https://example.org/paper"]) is None
+
+
+@pytest.mark.asyncio
+async def test_resolve_uses_local_metadata_before_pubmed(tmp_path, monkeypatch):
+    cache = DOICache(str(tmp_path / "doi_cache.sqlite"))
+    cache.set_many({"Cached PubMed paper": "10.1000/cached"})
+    looked_up = []
+
+    async def fake_get_dois_from_titles(self, titles, batch_size=50):
+        looked_up.extend(titles)
+        return dict.fromkeys(titles, "10.1000/pubmed")
+
+    monkeypatch.setattr(
+        "PaperBee.papers.async_pubmed.AsyncPubMedClient.get_dois_from_titles", fake_get_dois_from_titles
+    )
+
+    articles = [
+        {"title": "With DOI field", "databases": ["PubMed"], "doi": "10.1000/field", "urls": []},
+        {"title": "Preprint", "databases": ["bioRxiv"], "doi": None, "urls": ["https://doi.org/10.1101/pre"]},
+        {"title": "PREPRINT", "databases": ["PubMed"], "doi": None, "urls": []},
+        {"title": "With DOI field.", "databases": ["PubMed"], "doi": None, "urls": []},
+        {"title": "ArXiv paper", "databases": ["arXiv"], "doi": None, "urls": ["http://arxiv.org/abs/2401.01234v1"]},
+        {"title": "Cached PubMed paper", "databases": ["PubMed"], "doi": None, "urls": []},
+        {"title": "New PubMed paper", "databases": ["PubMed"], "doi": None, "urls": []},
+        {"title": "No DOI anywhere", "databases": ["bioRxiv"], "doi": None, "urls": ["https://biorxiv.org/x"]},
+    ]
+    async with DOIResolver(doi_cache=cache) as resolver:
+        await resolver.resolve(articles)
+
+    assert [article["url"] for article in articles] == [
+        "https://doi.org/10.1000/field",
+        "https://doi.org/10.1101/pre",
+        "https://doi.org/10.1000/pubmed",  # The publication of a preprint has its own DOI
+        "https://doi.org/10.1000/field",
+        "https://doi.org/10.48550/arXiv.2401.01234",
+        "https://doi.org/10.1000/cached",
+        "https://doi.org/10.1000/pubmed",
+        None,
+    ]
+    assert looked_up == ["PREPRINT", "New PubMed paper"]
+    assert resolver.saved_lookups == 3
+    assert resolver.stats["cache"] == 1
+    assert resolver.stats["pubmed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_lookups_are_not_cached(tmp_path, monkeypatch):
+    cache = DOICache(str(tmp_path / "doi_cache.sqlite"))
+
+    async def failing_request(self, endpoint, params):
+        e = "NCBI is unreachable"
+        raise httpx.ConnectError(e)
+
+    monkeypatch.setattr("PaperBee.papers.async_pubmed.AsyncPubMedClient._request", failing_request)
+
+    articles = [{"title": "Unreachable PubMed paper", "databases": ["PubMed"], "doi": None, "urls": []}]
+    async with DOIResolver(doi_cache=cache) as resolver:
+        await resolver.resolve(articles)
+
+    assert articles[0]["url"] is None
+    assert cache.get_many(["Unreachable PubMed paper"]) == {}
+    assert resolver.stats["pubmed"] == 0
+    assert resolver.stats["unresolved"] == 1
+
+
+@pytest.mark.asyncio
+async def test_chunks_share_one_pubmed_client(monkeypatch):
+    clients = []
+    closed = []
+
+    async def fake_get_dois_from_titles(self, titles, batch_size=50):
+        clients.append(self)
+        return dict.fromkeys(titles)
+
+    async def fake_aclose(self):
+        closed.append(self)
+
+    monkeypatch.setattr(
+        "PaperBee.papers.async_pubmed.AsyncPubMedClient.get_dois_from_titles", fake_get_dois_from_titles
+    )
+    monkeypatch.setattr("PaperBee.papers.async_pubmed.AsyncPubMedClient.aclose", fake_aclose)
+
+    async with DOIResolver() as resolver:
+        for title in ["First chunk", "Second chunk"]:
+            await resolver.resolve([{"title": title, "databases": ["PubMed"], "doi": None, "urls": []}])
+        assert closed == []
+
+    assert len(clients) == 2
+    assert clients[0] is clients[1]
+    assert closed == [clients[0]]
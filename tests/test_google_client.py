@@ -0,0 +1,68 @@
+import os
+from datetime import timedelta
+
+import pytest
+
+from PaperBee.papers import google_client
+from PaperBee.papers.google_client import clear_clients, get_client, token_path
+
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+
+
+class FakeCredentials:
+    refreshes = 0
+
+    def __init__(self, scopes):
+        self.scopes = scopes
+        self.token = None
+        self.expiry = None
+
+    def refresh(self, request):
+        FakeCredentials.refreshes += 1
+        self.token = f"token-{FakeCredentials.refreshes}"
+        self.expiry = google_client._utcnow() + timedelta(hours=1)
+
+
+@pytest.fixture(autouse=True)
+def fake_google(monkeypatch):
+    FakeCredentials.refreshes = 0
+    monkeypatch.setattr(
+        google_client.Credentials, "from_service_account_file", lambda path, scopes: FakeCredentials(scopes)
+    )
+    monkeypatch.setattr(google_client.gspread, "authorize", lambda creds: ("client", creds))
+    clear_clients()
+    yield
+    clear_clients()
+
+
+def test_client_is_cached_by_credentials_and_scopes():
+    client = get_client("credentials.json", SCOPES)
+
+    assert get_client("credentials.json", list(reversed(SCOPES))) is client
+    assert get_client("other.json", SCOPES) is not client
+    assert FakeCredentials.refreshes == 2
+
+
+def test_token_is_refreshed_near_expiry_only():
+    _, creds = get_client("credentials.json", SCOPES)
+    creds.expiry = google_client._utcnow() + timedelta(minutes=30)
+    get_client("credentials.json", SCOPES)
+    assert FakeCredentials.refreshes == 1
+
+    creds.expiry = google_client._utcnow() + timedelta(minutes=2)
+    get_client("credentials.json", SCOPES)
+    assert FakeCredentials.refreshes == 2
+
+
+def test_token_is_persisted_for_the_next_process(tmp_path):
+    _, creds = get_client("credentials.json", SCOPES, token_dir=str(tmp_path))
+    path = token_path(str(tmp_path), "credentials.json", SCOPES)
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+    clear_clients()  # A new process
+    _, restored = get_client("credentials.json", SCOPES, token_dir=str(tmp_path))
+
+    assert restored is not creds
+    assert restored.token == creds.token
+    assert restored.expiry == creds.expiry
+    assert FakeCredentials.refreshes == 1
@@ -0,0 +1,124 @@
+import os
+from collections import Counter
+
+import pytest
+from gspread.exceptions import APIError
+
+from PaperBee.papers import google_sheet
+from PaperBee.papers.google_sheet import GoogleSheetsUpdater, SheetSession, SheetWriter
+from tests.fake_sheet import FakeClient, FakeWorksheet, make_row
+
+
+def test_session_fetches_the_key_columns_once():
+    worksheet = FakeWorksheet([make_row("10.1/a", "Paper A"), ["", "", "", "", "", "", "", ""], make_row("10.1/b", "")])
+    session = SheetSession(worksheet)
+
+    assert session.records() == [{"DOI": "10.1/a", "Title": "Paper A"}, {"DOI": "10.1/b", "Title": ""}]
+    assert session.nr_rows == 3
+    session.insert_rows([make_row("10.1/c", "Paper C")])
+
+    assert session.dois() == ["10.1/a", "10.1/b", "10.1/c"]
+    assert session.nr_rows == 4
+    assert worksheet.rows[1][0] == "10.1/c"
+    assert worksheet.calls == Counter({"row_values": 1, "batch_get": 1, "batch_update": 1})
+
+
+def test_empty_sheet():
+    session = SheetSession(FakeWorksheet([]))
+
+    assert session.records() == []
+    assert session.nr_rows == 0
+
+
+def test_updater_reuses_the_session(monkeypatch):
+    worksheet = FakeWorksheet([make_row("10.1/a", "Paper A")])
+    client = FakeClient({"sheet-id": worksheet.spreadsheet})
+    monkeypatch.setattr(google_sheet, "get_client", lambda *args, **kwargs: client)
+    updater = GoogleSheetsUpdater(spreadsheet_id="sheet-id", credentials_json_path="credentials.json")
+
+    assert updater.read_dois("Papers") == [{"DOI": "10.1/a", "Title": "Paper A"}]
+    updater.insert_rows("Papers", [make_row("10.1/b", "Paper B"), make_row("10.1/c", "Paper C")])
+    _, nr_rows = updater.open_sheet("Papers")
+
+    assert nr_rows == 3
+    assert client.opened == Counter({"sheet-id": 1})
+    assert worksheet.calls == Counter({"row_values": 1, "batch_get": 1, "batch_update": 1})
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(google_sheet.time, "sleep", delays.append)
+    return delays
+
+
+def test_writer_writes_chunks_in_order(tmp_path, sleeps):
+    worksheet = FakeWorksheet([make_row("10.1/old", "Old paper")])
+    worksheet.spreadsheet.failures = [429, 503]
+    writer = SheetWriter(SheetSession(worksheet), str(tmp_path / "progress.json"), "sheet", chunk_size=2)
+
+    assert writer.write([make_row(f"10.1/{i}", f"Paper {i}") for i in range(5)]) == 5
+
+    assert [row[0] for row in worksheet.rows[1:]] == ["10.1/0", "10.1/1", "10.1/2", "10.1/3", "10.1/4", "10.1/old"]
+    assert worksheet.calls["batch_update"] == 5  # 3 chunks and 2 retries
+    assert len(sleeps) == 2
+    assert 1 <= sleeps[0] < 2 <= sleeps[1] < 3  # Exponential backoff with up to 1s of jitter
+    assert not os.path.exists(tmp_path / "progress.json")
+
+
+def test_writer_resumes_a_failed_write(tmp_path, sleeps):
+    worksheet = FakeWorksheet([make_row("10.1/old", "Old paper")])
+    rows = [make_row(f"10.1/{i}", f"Paper {i}") for i in range(5)]
+    progress_path = str(tmp_path / "progress.json")
+    session = SheetSession(worksheet, n_retries=2)
+    writer = SheetWriter(session, progress_path, "sheet", chunk_size=2)
+
+    worksheet.spreadsheet.failures = [None, 429, 429]  # The second chunk fails twice
+    with pytest.raises(APIError):
+        writer.write(rows)
+    assert [row[0] for row in worksheet.rows[1:]] == ["10.1/0", "10.1/1", "10.1/old"]
+    assert os.path.exists(progress_path)
+
+    assert SheetWriter(session, progress_path, "sheet", chunk_size=2).write(rows) == 3
+    assert [row[0] for row in worksheet.rows[1:]] == ["10.1/0", "10.1/1", "10.1/2", "10.1/3", "10.1/4", "10.1/old"]
+    assert not os.path.exists(progress_path)
+
+
+def test_client_errors_are_not_retried(sleeps):
+    worksheet = FakeWorksheet([])
+    worksheet.spreadsheet.failures = [400]
+
+    with pytest.raises(APIError):
+        SheetSession(worksheet).insert_rows([make_row("10.1/a", "Paper A")])
+    assert sleeps == []
+
+
+def test_append_rows_fill_the_grid_before_growing_it():
+    worksheet = FakeWorksheet([make_row("10.1/old", "Old paper")], empty_rows=1)
+    session = SheetSession(worksheet)
+    session.dois()
+
+    session.append_rows([make_row("10.1/a", "Paper A")])
+    assert session.row_count == 3
+    session.append_rows([make_row("10.1/b", "Paper B"), make_row("10.1/c", "Paper C")])
+
+    assert [row[0] for row in worksheet.rows[1:]] == ["10.1/old", "10.1/a", "10.1/b", "10.1/c"]
+    assert session.row_count == worksheet.row_count == 5
+    assert session.dois() == ["10.1/old", "10.1/a", "10.1/b", "10.1/c"]
+    assert worksheet.calls["batch_get"] == 1
+
+
+def test_migrate_to_append_sorts_oldest_first_with_a_newest_first_view():
+    rows = [make_row(f"10.1/{day}", f"Paper {day}") for day in (3, 2, 1)]
+    for row, day in zip(rows, (3, 2, 1)):
+        row[1] = f"2024-01-0{day}"
+    worksheet = FakeWorksheet(rows)
+    session = SheetSession(worksheet)
+
+    session.migrate_to_append()
+    session.migrate_to_append()
+
+    assert [row[0] for row in worksheet.rows[1:]] == ["10.1/1", "10.1/2", "10.1/3"]
+    assert worksheet.filter_views == [google_sheet.NEWEST_FIRST_VIEW]
+    with pytest.raises(ValueError, match="Column 'Added'"):
+        session.migrate_to_append(column="Added")
@@ -0,0 +1,45 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from PaperBee.papers.http_session import (
+    ConnectionStats,
+    HTTPSessionConfig,
+    create_async_client,
+)
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_async_client_reuses_connections(server_url):
+    stats = ConnectionStats()
+    async with create_async_client(HTTPSessionConfig(retries=0), stats) as client:
+        for _ in range(3):
+            response = await client.get(server_url)
+            assert response.text == "ok"
+
+    assert stats.as_dict() == {"requests": 3, "connections": 1, "reused": 2, "reuse_ratio": 0.667}
@@ -0,0 +1,80 @@
+import asyncio
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from openai import AsyncOpenAI
+
+from PaperBee.papers.llm_filtering import LLMFilter
+
+
+def fake_client(monkeypatch, answer):
+    """An AsyncOpenAI client whose chat completions are answered by `answer(title)`."""
+    client = AsyncOpenAI(api_key="test")
+
+    async def create(model, messages):
+        content = await answer(messages[1]["content"])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    monkeypatch.setattr(client.chat.completions, "create", create)
+    return client
+
+
+def articles(n):
+    return pd.DataFrame({"Title": [f"Paper {i}" for i in range(n)], "Keywords": ["cells, dynamics"] * n})
+
+
+@pytest.mark.asyncio
+async def test_requests_run_concurrently_and_keep_the_order(monkeypatch):
+    in_flight = []
+    peak = []
+
+    async def answer(message):
+        number = int(message.split("'")[1].split()[1])  # "Title of the publication: 'Paper 3'..."
+        in_flight.append(number)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01 * (10 - number))  # Later papers are answered first
+        in_flight.remove(number)
+        return "Yes" if number % 2 == 0 else "No"
+
+    client = fake_client(monkeypatch, answer)
+    llm_filter = LLMFilter(articles(10), OPENAI_API_KEY="test", max_concurrency=4, async_client=client)
+
+    filtered = await llm_filter.filter_articles_async()
+
+    assert filtered["Title"].tolist() == ["Paper 0", "Paper 2", "Paper 4", "Paper 6", "Paper 8"]
+    assert max(peak) == 4
+
+
+@pytest.mark.asyncio
+async def test_timeouts_are_retried(monkeypatch):
+    calls = []
+
+    async def answer(message):
+        calls.append(message)
+        if len(calls) == 1:
+            await asyncio.sleep(1)  # Longer than the timeout
+        return "yes"
+
+    client = fake_client(monkeypatch, answer)
+    llm_filter = LLMFilter(articles(1), OPENAI_API_KEY="test", timeout=0.05, backoff=0, async_client=client)
+
+    assert len(await llm_filter.filter_articles_async()) == 1
+    assert len(calls) == 2
+    assert "Keywords: cells, dynamics" in calls[0]
+
+
+@pytest.mark.asyncio
+async def test_other_errors_are_not_retried(monkeypatch):
+    calls = []
+
+    async def answer(message):
+        calls.append(message)
+        e = "Invalid request"
+        raise ValueError(e)
+
+    llm_filter = LLMFilter(articles(1), OPENAI_API_KEY="test", backoff=0, async_client=fake_client(monkeypatch, answer))
+
+    with pytest.raises(ValueError, match="Invalid request"):
+        await llm_filter.filter_articles_async()
+    assert len(calls) == 1
@@ -0,0 +1,45 @@
+from PaperBee.papers import PaperRecord
+from PaperBee.papers.mattermost_papers_formatter import MattermostPaperPublisher
+from PaperBee.papers.slack_papers_formatter import SlackPaperPublisher
+from PaperBee.papers.utils import ArticlesProcessor
+from tests.sample_papers import sample_papers
+
+
+def test_records_round_trip_processed_articles():
+    articles = [
+        {
+            "databases": ["PubMed"],
+            "publication_date": "2024-01-01",
+            "title": "Single-cell atlas",
+            "keywords": ["K-single-cell"],
+            "url": "https://doi.org/10.1000/atlas",
+        },
+    ]
+    processed = ArticlesProcessor(articles, "2024-01-03").articles
+
+    (record,) = PaperRecord.from_frame(processed)
+
+    assert record == PaperRecord(
+        doi="10.1000/atlas",
+        date="2024-01-03",
+        posted_date="2024-01-01",
+        is_preprint=False,
+        title="Single-cell atlas",
+        keywords="single-cell",
+        url="https://doi.org/10.1000/atlas",
+    )
+    assert record.to_row() == [*processed.iloc[0].tolist()[:6], None, processed.iloc[0]["URL"]]
+    assert PaperRecord.from_row(record.to_row()) == record
+    assert PaperRecord.from_frame(ArticlesProcessor([], "2024-01-03").articles) == []
+
+
+def test_publishers_split_preprints():
+    published = PaperRecord("10.1000/x", "2024-01-03", "2024-01-01", False, "Published paper", url="https://x")
+    papers, preprints = SlackPaperPublisher.format_papers_for_slack([*sample_papers, published])
+
+    assert papers == [":rolled_up_newspaper: <https://x|Published paper>"]
+    assert len(preprints) == len(sample_papers)
+
+    papers, preprints = MattermostPaperPublisher.format_papers([published])
+    assert papers == ["🗞️ [Published paper](https://x)"]
+    assert preprints == []
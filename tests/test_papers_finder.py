@@ -0,0 +1,140 @@
+import threading
+
+import pytest
+
+from PaperBee.papers import google_sheet
+from PaperBee.papers.papers_finder import PapersFinder
+from PaperBee.papers.utils import ArticlesProcessor
+from tests.fake_sheet import FakeClient, FakeWorksheet, make_row
+
+
+@pytest.fixture
+def worksheet(monkeypatch):
+    worksheet = FakeWorksheet([make_row("10.1101/old", "Old paper")])
+    client = FakeClient({"sheet-id": worksheet.spreadsheet})
+    monkeypatch.setattr(google_sheet, "get_client", lambda *args, **kwargs: client)
+    monkeypatch.setattr(google_sheet.time, "sleep", lambda delay: None)
+    return worksheet
+
+
+@pytest.fixture
+def finder(tmp_path):
+    return PapersFinder(
+        root_dir=str(tmp_path),
+        spreadsheet_id="sheet-id",
+        google_credentials_json="credentials.json",
+        sheet_name="Papers",
+    )
+
+
+def processed_articles(*ids):
+    articles = [
+        {
+            "databases": ["bioRxiv"],
+            "publication_date": "2024-01-01",
+            "title": f"Paper {i}",
+            "keywords": [],
+            "url": f"https://doi.org/10.1101/{i}",
+        }
+        for i in ids
+    ]
+    return ArticlesProcessor(articles, "2024-01-03").articles
+
+
+@pytest.mark.asyncio
+async def test_papers_are_posted_while_the_sheet_is_written(worksheet, finder, monkeypatch):
+    posted = threading.Event()
+    batch_update = worksheet.spreadsheet.batch_update
+
+    def slow_batch_update(body):
+        assert posted.wait(timeout=5), "The post waited for the sheet write"
+        batch_update(body)
+
+    async def find_and_process_papers():
+        return processed_articles("old", "new")
+
+    def post_paper_to_slack(papers):
+        posted.set()
+        return [paper.doi for paper in papers]
+
+    worksheet.spreadsheet.batch_update = slow_batch_update
+    monkeypatch.setattr(finder, "find_and_process_papers", find_and_process_papers)
+    monkeypatch.setattr(finder, "post_paper_to_slack", post_paper_to_slack)
+
+    papers, response_slack, *_ = await finder.run_daily(post_to_slack=True)
+
+    assert [paper.doi for paper in papers] == response_slack == ["10.1101/new"]
+    assert [row[0] for row in worksheet.rows[1:]] == ["10.1101/new", "10.1101/old"]
+
+
+def test_failed_sheet_write_is_reconciled_by_the_next_run(worksheet, finder):
+    sessions, papers = finder.find_new_papers(processed_articles("a", "b"))
+    worksheet.spreadsheet.failures = [500] * sessions["Papers"].n_retries
+    with pytest.raises(google_sheet.gspread.exceptions.APIError):
+        finder.write_google_sheet(sessions, papers)
+
+    # The papers of the failed write are not posted again, but written with the new ones
+    sessions, papers = finder.find_new_papers(processed_articles("a", "b", "c"))
+    assert [paper.doi for paper in papers] == ["10.1101/c"]
+    finder.write_google_sheet(sessions, papers)
+
+    assert [row[0] for row in worksheet.rows[1:]] == ["10.1101/c", "10.1101/a", "10.1101/b", "10.1101/old"]
+    assert finder.doi_ledger.pending(finder.sheet_key) == []
+    assert finder.find_new_papers(processed_articles("a", "b", "c"))[1] == []
+
+
+def test_append_mode_writes_at_the_bottom(worksheet, tmp_path):
+    finder = PapersFinder(
+        root_dir=str(tmp_path),
+        spreadsheet_id="sheet-id",
+        google_credentials_json="credentials.json",
+        sheet_name="Papers",
+        sheet_write_mode="append",
+    )
+    finder.update_google_sheet(processed_articles("old", "a"))
+    batch_gets = worksheet.calls["batch_get"]
+
+    assert [paper.doi for paper in finder.update_google_sheet(processed_articles("a", "b"))] == ["10.1101/b"]
+    assert [row[0] for row in worksheet.rows[1:]] == ["10.1101/old", "10.1101/a", "10.1101/b"]
+    assert worksheet.calls["batch_get"] == batch_gets  # Our own appends are not read back
+
+    with pytest.raises(ValueError, match="Invalid sheet write mode"):
+        PapersFinder(str(tmp_path), "sheet-id", "credentials.json", "Papers", sheet_write_mode="prepend")
+
+
+def test_sharded_sheet_deduplicates_across_shards(worksheet, tmp_path):
+    finder = PapersFinder(
+        root_dir=str(tmp_path),
+        spreadsheet_id="sheet-id",
+        google_credentials_json="credentials.json",
+        sheet_name="Papers",
+        sheet_sharding="quarter",
+    )
+    assert [paper.doi for paper in finder.update_google_sheet(processed_articles("old", "a"))] == ["10.1101/a"]
+    assert [paper.doi for paper in finder.update_google_sheet(processed_articles("a", "b"))] == ["10.1101/b"]
+
+    shard = worksheet.spreadsheet.worksheet("Papers 2024-Q1")
+    assert [row[0] for row in shard.rows] == ["DOI", "10.1101/b", "10.1101/a"]
+    assert [row[0] for row in worksheet.rows[1:]] == ["10.1101/old"]
+
+    # Writing to one shard does not make the ledger read the other shards again
+    calls = [sheet.calls["batch_get"] for sheet in worksheet.spreadsheet.sheets]
+    assert finder.update_google_sheet(processed_articles("b")) == []
+    assert [sheet.calls["batch_get"] for sheet in worksheet.spreadsheet.sheets] == calls
+
+
+def test_legacy_search_results_are_deleted_once(finder, tmp_path):
+    for name in ["2024-01-02.json", "2024-01-02_biorxiv.json", "2024-01-02_pub_arx.json", "search_watermarks.json"]:
+        (tmp_path / name).write_text("{}")
+    (tmp_path / "2999-01-01.json").write_text("{}")
+
+    finder.cleanup_files()
+
+    assert (tmp_path / "search_watermarks.json").exists()
+    assert (tmp_path / "2999-01-01.json").exists()
+    assert not any(tmp_path.glob("2024-*.json"))
+
+    # The migration only runs once
+    (tmp_path / "2024-01-02.json").write_text("{}")
+    finder.cleanup_files()
+    assert (tmp_path / "2024-01-02.json").exists()
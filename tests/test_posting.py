@@ -64,7 +64,7 @@ async def test_posting():
 
         # Check scpoli paper
         for paper in papers:
-            if paper[4].startswith("Population-level integration of single-cell"):
+            if paper.title.startswith("Population-level integration of single-cell"):
                 break
         else:
             e = "scpoli paper not found"
@@ -0,0 +1,61 @@
+import pandas as pd
+
+from PaperBee.papers.preprint_linker import PreprintLinker
+from PaperBee.papers.utils import ArticlesProcessor
+
+
+def make_article(title, databases, doi):
+    return {
+        "databases": databases,
+        "publication_date": "2024-01-01",
+        "title": title,
+        "keywords": [],
+        "url": f"https://doi.org/{doi}",
+    }
+
+
+def test_link_publications_to_preprints():
+    archived = pd.DataFrame({
+        "DOI": ["10.1101/2023.05.01.000001", "10.1101/2023.06.01.000002", "10.48550/arXiv.2301.00001"],
+        "IsPreprint": [True, True, True],
+        "Title": [
+            "Population-level integration of single-cell datasets enables multi-scale analysis across samples",
+            "A spatial atlas of the developing human heart",
+            "Deep learning for cell type annotation",
+        ],
+    })
+    linker = PreprintLinker.from_frame(archived)
+    assert len(linker) == 2  # Only bioRxiv preprints are indexed
+
+    articles = ArticlesProcessor(
+        [
+            make_article(
+                "Population-level integration of single-cell datasets enables multiscale analysis across samples.",
+                ["PubMed"],
+                "10.1038/s41592-023-02035-2",
+            ),
+            make_article("A Spatial Atlas of the Developing Human Heart", ["PubMed"], "10.1016/heart"),
+            make_article("Deep learning for cell type annotation", ["PubMed"], "10.1000/dl"),
+            make_article("A spatial atlas of the developing human heart", ["bioRxiv"], "10.1101/2024.01.01.000003"),
+        ],
+        "2024-01-03",
+    ).articles
+
+    linker.link(articles)
+
+    assert articles["Preprint"].tolist() == ["10.1101/2023.05.01.000001", "10.1101/2023.06.01.000002", pd.NA, pd.NA]
+    assert articles["Preprint"].dtype == "string[pyarrow]"
+
+
+def test_preprints_of_the_same_run_are_linked():
+    articles = ArticlesProcessor(
+        [
+            make_article("Kidney organoids at single-cell resolution", ["bioRxiv"], "10.1101/kidney"),
+            make_article("Kidney organoids at single-cell resolution", ["PubMed"], "10.1000/kidney"),
+        ],
+        "2024-01-03",
+    ).articles
+    linker = PreprintLinker()
+    linker.add_frame(articles)
+
+    assert linker.link(articles)["Preprint"].tolist() == [pd.NA, "10.1101/kidney"]
@@ -0,0 +1,179 @@
+import json
+import subprocess
+import sys
+import textwrap
+import time
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+
+import pytest
+
+from PaperBee.papers.search import SearchJob, chunked, iter_papers, run_search_jobs
+from PaperBee.papers.search_cache import SearchCache
+
+
+@dataclass(frozen=True)
+class FakeSearchJob(SearchJob):
+    delay: float = 0
+    fail: bool = False
+    papers_per_day: int = 0
+
+    def run(self):
+        time.sleep(self.delay)
+        if self.fail:
+            e = f"{self.name} is down"
+            raise ConnectionError(e)
+        papers = [{"title": f"Paper from {self.name}"}]
+        if self.papers_per_day:
+            days = [self.since + timedelta(days=i) for i in range((self.until - self.since).days + 1)]
+            papers = [
+                {"title": f"Paper {i} of {day}", "databases": list(self.databases)}
+                for day in days
+                for i in range(self.papers_per_day)
+            ][: min(self.limit, self.limit_per_database)]
+        with open(self.output_file, "w") as output:
+            json.dump({"papers": papers, "query": self.query}, output)
+
+
+@pytest.fixture
+def make_job(tmp_path):
+    def make(name, **kwargs):
+        parameters = {
+            "query": "[single-cell]",
+            "databases": (name,),
+            "since": date(2024, 1, 1),
+            "until": date(2024, 1, 2),
+            "limit": 10,
+            "limit_per_database": 10,
+            "output_file": str(tmp_path / f"{name}.json"),
+        }
+        return FakeSearchJob(name=name, **{**parameters, **kwargs})
+
+    return make
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_concurrently(make_job):
+    start = time.monotonic()
+    jobs = [make_job("pubmed", delay=0.3), make_job("biorxiv", delay=0.3)]
+    completed = await run_search_jobs(jobs)
+
+    assert completed == jobs
+    assert list(completed[1].iter_papers()) == [{"title": "Paper from biorxiv"}]
+    assert time.monotonic() - start < 0.55
+
+
+@pytest.mark.asyncio
+async def test_failures_and_timeouts_are_isolated(make_job):
+    jobs = [make_job("pubmed"), make_job("biorxiv", fail=True), make_job("arxiv", delay=1)]
+    completed = await run_search_jobs(jobs, timeout=0.2)
+
+    assert completed == [jobs[0]]
+    assert list(completed[0].iter_papers()) == [{"title": "Paper from pubmed"}]
+
+
+def test_timed_out_search_does_not_keep_the_process_alive(tmp_path):
+    script = textwrap.dedent(f"""
+        import asyncio, time
+        from datetime import date
+        from PaperBee.papers.search import SearchJob, run_search_jobs
+
+        class StalledJob(SearchJob):
+            def run(self):
+                time.sleep(30)
+
+        job = StalledJob("stalled", "[single-cell]", ("pubmed",), date(2024, 1, 1), date(2024, 1, 2), 10, 10,
+                         {str(tmp_path / "stalled.json")!r})
+        try:
+            asyncio.run(run_search_jobs([job], timeout=0.2))
+        except RuntimeError:
+            pass
+    """)
+    start = time.monotonic()
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=20)  # noqa: S603
+
+    assert time.monotonic() - start < 10
+
+
+@pytest.mark.asyncio
+async def test_all_jobs_failing_raises(make_job):
+    with pytest.raises(RuntimeError, match="All searches failed"):
+        await run_search_jobs([make_job("biorxiv", fail=True)])
+
+
+@pytest.mark.asyncio
+async def test_fresh_cached_results_are_reused(make_job, tmp_path):
+    cache = SearchCache(str(tmp_path))
+    cached_job = make_job("pubmed", fail=True)
+    with open(cached_job.output_file, "w") as output:
+        json.dump({"papers": [{"title": "Cached paper"}]}, output)
+
+    completed = await run_search_jobs([cached_job, make_job("biorxiv")], cache=cache)
+
+    assert [job.name for job in completed] == ["pubmed", "biorxiv"]
+    assert list(completed[0].iter_papers()) == [{"title": "Cached paper"}]
+
+
+@pytest.mark.asyncio
+async def test_truncated_searches_are_split(make_job):
+    job = make_job("pubmed", papers_per_day=3, until=date(2024, 1, 8))
+
+    completed = await run_search_jobs([job])
+
+    assert [(leaf.since.day, leaf.until.day) for leaf in completed] == [(1, 2), (3, 4), (5, 6), (7, 8)]
+    titles = [paper["title"] for leaf in completed for paper in leaf.iter_papers()]
+    assert len(titles) == len(set(titles)) == 24
+
+
+@pytest.mark.asyncio
+async def test_truncated_single_day_is_kept(make_job):
+    job = make_job("pubmed", papers_per_day=20, since=date(2024, 1, 2))
+
+    completed = await run_search_jobs([job])
+
+    assert completed == [job]
+    assert len(list(job.iter_papers())) == 10
+
+
+@pytest.mark.asyncio
+async def test_failing_split_fails_the_job(make_job, monkeypatch):
+    jobs = [make_job("pubmed", papers_per_day=20), make_job("biorxiv")]
+    split = FakeSearchJob.split
+    monkeypatch.setattr(FakeSearchJob, "split", lambda self: [replace(half, fail=True) for half in split(self)])
+
+    completed = await run_search_jobs(jobs)
+
+    assert completed == [jobs[1]]
+
+
+def test_iter_papers_streams_with_small_reads(tmp_path):
+    papers = [
+        {"title": f'Paper {i} with "quotes", [brackets] and {{braces}}', "citations": 10**i, "urls": []}
+        for i in range(20)
+    ]
+    path = tmp_path / "search.json"
+    path.write_text(json.dumps({"limit": 10, "papers": papers, "until": "2024-01-02"}, indent=2, sort_keys=True))
+
+    assert list(iter_papers(str(path), read_size=7)) == papers
+
+
+def test_iter_papers_handles_empty_results(tmp_path):
+    path = tmp_path / "search.json"
+    path.write_text(json.dumps({"papers": [], "query": "[x]"}))
+    assert list(iter_papers(str(path))) == []
+
+    path.write_text("{}")
+    assert list(iter_papers(str(path))) == []
+
+
+def test_iter_papers_rejects_truncated_files(tmp_path):
+    path = tmp_path / "search.json"
+    path.write_text('{"papers": [{"title": "A"}, {"title": "B"')
+
+    with pytest.raises(ValueError):
+        list(iter_papers(str(path), read_size=4))
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
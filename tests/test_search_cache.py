@@ -0,0 +1,45 @@
+import os
+import time
+from datetime import date
+
+from PaperBee.papers.search_cache import SearchCache
+
+SEARCH = ("[single-cell]", ("pubmed",), date(2024, 1, 1), date(2024, 1, 2), 10, 5)
+
+
+def test_key_depends_on_every_parameter():
+    key = SearchCache.key(*SEARCH)
+
+    assert SearchCache.key("[single-cell]", ["pubmed"], date(2024, 1, 1), date(2024, 1, 2), 10, 5) == key
+    assert SearchCache.key("[spatial]", ("pubmed",), date(2024, 1, 1), date(2024, 1, 2), 10, 5) != key
+    assert SearchCache.key("[single-cell]", ("biorxiv",), date(2024, 1, 1), date(2024, 1, 2), 10, 5) != key
+    assert SearchCache.key("[single-cell]", ("pubmed",), date(2023, 12, 31), date(2024, 1, 2), 10, 5) != key
+    assert SearchCache.key("[single-cell]", ("pubmed",), date(2024, 1, 1), date(2024, 1, 2), 20, 5) != key
+
+
+def test_freshness_and_pruning(tmp_path):
+    cache = SearchCache(str(tmp_path / "search_cache"), ttl_hours=1)
+    path = cache.path(*SEARCH)
+    assert not cache.is_fresh(path)
+
+    with open(path, "w") as output:
+        output.write('{"papers": []}')
+    assert cache.is_fresh(path)
+    assert cache.prune() == []
+
+    two_hours_ago = time.time() - 7200
+    os.utime(path, (two_hours_ago, two_hours_ago))
+    leftover = f"{cache.path('[x]', ('arxiv',), *SEARCH[2:])}.tmp"
+    open(leftover, "w").close()
+
+    assert not cache.is_fresh(path)
+    assert sorted(cache.prune()) == sorted([path, leftover])
+    assert os.listdir(cache.directory) == []
+
+
+def test_zero_ttl_disables_reuse(tmp_path):
+    cache = SearchCache(str(tmp_path), ttl_hours=0)
+    path = cache.path(*SEARCH)
+    open(path, "w").close()
+
+    assert not cache.is_fresh(path)
@@ -0,0 +1,37 @@
+from PaperBee.papers import PaperRecord
+from PaperBee.papers.search_index import PaperSearchIndex, fts_query
+
+
+def make_paper(doi, title, keywords="", day="2024-01-02"):
+    return PaperRecord(doi, day, "2024-01-01", True, title, keywords, None, f"https://doi.org/{doi}")
+
+
+def test_fts_query_quotes_words():
+    assert fts_query('single-cell "atlas" AND lung:') == '"single" "cell" "atlas" "AND" "lung"'
+    assert fts_query("--") == ""
+
+
+def test_search_titles_keywords_and_dois(tmp_path):
+    index = PaperSearchIndex(str(tmp_path / "index.sqlite"))
+    index.add([
+        make_paper("10.1101/lung", "A single-cell atlas of the human lung", "single-cell, atlas"),
+        make_paper("10.1101/heart", "Spatial transcriptomics of the heart", "spatial"),
+        make_paper("10.1101/kidney", "Kidney organoids", "single-cell"),
+    ])
+
+    assert index.search("single-cell atlas")["DOI"].tolist() == ["10.1101/lung"]
+    assert sorted(index.search("single-cell")["DOI"]) == ["10.1101/kidney", "10.1101/lung"]
+    assert index.search("heart")["IsPreprint"].tolist() == ["TRUE"]
+    assert index.search("kidney")["URL"].tolist() == ["https://doi.org/10.1101/kidney"]
+    assert index.search("brain").empty
+    assert index.search("").empty
+
+
+def test_readding_a_doi_updates_its_entry(tmp_path):
+    index = PaperSearchIndex(str(tmp_path / "index.sqlite"))
+    index.add([make_paper("10.1101/lung", "Lung atlas")])
+    index.add([make_paper("10.1101/lung", "Human lung atlas, revised", day="2024-01-05")])
+
+    assert len(index) == 1
+    assert index.search("lung")["Date"].tolist() == ["2024-01-05"]
+    assert index.search("revised")["DOI"].tolist() == ["10.1101/lung"]
@@ -0,0 +1,25 @@
+import pytest
+
+from PaperBee.papers.sheet_shards import SheetShardPolicy
+
+
+def test_shard_names():
+    assert SheetShardPolicy("Papers").shard("2025-08-14") == "Papers"
+    assert SheetShardPolicy("Papers", "year").shard("2025-08-14") == "Papers 2025"
+    assert SheetShardPolicy("Papers", "quarter").shard("2025-08-14") == "Papers 2025-Q3"
+    with pytest.raises(ValueError, match="Invalid sheet sharding"):
+        SheetShardPolicy("Papers", "month")
+
+
+def test_shards_include_the_unsharded_sheet():
+    policy = SheetShardPolicy("Papers", "quarter", "main", {"Papers 2024-Q4": "archive"})
+
+    assert [policy.is_shard(title) for title in ("Papers", "Papers 2025-Q1", "Papers 2025", "Other")] == [
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert policy.spreadsheet_of("Papers 2024-Q4") == "archive"
+    assert policy.spreadsheet_of("Papers 2025-Q1") == "main"
+    assert policy.spreadsheet_ids() == ["main", "archive"]
@@ -0,0 +1,106 @@
+import pandas as pd
+
+from PaperBee.papers.paper_record import ARTICLE_DTYPES
+from PaperBee.papers.utils import ArticlesProcessor, normalize_title, parse_pubmed_articles
+
+EFETCH_XML = """<?xml version="1.0" ?>
+<PubmedArticleSet>
+  <PubmedArticle>
+    <MedlineCitation>
+      <PMID>111</PMID>
+      <Article>
+        <ArticleTitle>Single-cell atlas of the <i>human</i> lung.</ArticleTitle>
+        <ELocationID EIdType="pii">S0001</ELocationID>
+        <ELocationID EIdType="doi">10.1000/lung</ELocationID>
+      </Article>
+    </MedlineCitation>
+  </PubmedArticle>
+  <PubmedArticle>
+    <MedlineCitation>
+      <PMID>222</PMID>
+      <Article>
+        <ArticleTitle>Spatial transcriptomics benchmark</ArticleTitle>
+      </Article>
+    </MedlineCitation>
+    <PubmedData>
+      <ArticleIdList>
+        <ArticleId IdType="pubmed">222</ArticleId>
+        <ArticleId IdType="doi">10.1000/spatial</ArticleId>
+      </ArticleIdList>
+    </PubmedData>
+  </PubmedArticle>
+</PubmedArticleSet>
+"""
+
+
+def test_normalize_title():
+    assert normalize_title("  Single-Cell  atlas: of the LUNG. ") == "single cell atlas of the lung"
+
+
+def test_parse_pubmed_articles():
+    articles = parse_pubmed_articles(EFETCH_XML)
+    assert articles == [
+        {"pmid": "111", "title": "Single-cell atlas of the human lung.", "doi": "10.1000/lung"},
+        {"pmid": "222", "title": "Spatial transcriptomics benchmark", "doi": "10.1000/spatial"},
+    ]
+
+
+def test_articles_processor_output():
+    articles = [
+        {
+            "databases": ["bioRxiv", "PubMed"],
+            "publication_date": "2024-01-01",
+            "title": "Single-cell atlas",
+            "keywords": ["K-single-cell", "M-RNA-Seq"],
+            "url": "https://doi.org/10.1101/2024.01.01.000001",
+            "abstract": "Ignored",
+        },
+        {
+            "databases": ["arXiv"],
+            "publication_date": "2024-01-02",
+            "title": "Spatial benchmark",
+            "keywords": [],
+            "url": "https://arxiv.org/abs/2401.00001",
+        },
+    ]
+
+    processed = ArticlesProcessor(articles, "2024-01-03").articles
+
+    expected = pd.DataFrame({
+        "DOI": ["10.1101/2024.01.01.000001", "1"],
+        "Date": ["2024-01-03", "2024-01-03"],
+        "PostedDate": ["2024-01-01", "2024-01-02"],
+        "IsPreprint": ["FALSE", "TRUE"],
+        "Title": ["Single-cell atlas", "Spatial benchmark"],
+        "Keywords": ["single-cell, RNA-Seq", ""],
+        "Preprint": [None, None],
+        "URL": ["https://doi.org/10.1101/2024.01.01.000001", "https://arxiv.org/abs/2401.00001"],
+    }).astype(ARTICLE_DTYPES)
+    pd.testing.assert_frame_equal(processed, expected)
+    empty = ArticlesProcessor([], "2024-01-03").articles
+    assert empty.columns.tolist() == expected.columns.tolist()
+    assert empty.dtypes.astype(str).tolist() == expected.dtypes.astype(str).tolist()
+
+
+def test_concatenated_chunks_keep_compact_dtypes():
+    chunks = [
+        ArticlesProcessor(
+            [
+                {
+                    "databases": ["bioRxiv"],
+                    "publication_date": f"2024-01-0{day}",
+                    "title": f"Paper {day}",
+                    "keywords": [],
+                    "url": f"https://doi.org/10.1101/{day}",
+                }
+            ],
+            "2024-01-03",
+        ).articles
+        for day in (1, 2)
+    ]
+
+    articles = pd.concat(chunks, ignore_index=True).astype(ARTICLE_DTYPES)
+
+    assert articles["PostedDate"].dtype == "category"
+    assert articles["PostedDate"].tolist() == ["2024-01-01", "2024-01-02"]
+    assert articles.memory_usage(deep=True).sum() < articles.astype(object).memory_usage(deep=True).sum()
@@ -0,0 +1,41 @@
+from datetime import date, timedelta
+
+from PaperBee.papers.papers_finder import PapersFinder
+from PaperBee.papers.watermarks import SearchWatermarks
+
+
+def test_watermarks_are_persisted_and_only_move_forward(tmp_path):
+    path = str(tmp_path / "search_watermarks.json")
+    watermarks = SearchWatermarks(path)
+    watermarks.update("[single-cell]", "pubmed", date(2024, 5, 2))
+    watermarks.update("[single-cell]", "pubmed", date(2024, 5, 1))
+
+    reloaded = SearchWatermarks(path)
+
+    assert reloaded.get("[single-cell]", "pubmed") == date(2024, 5, 2)
+    assert reloaded.get("[single-cell]", "biorxiv") is None
+    assert reloaded.get("[other query]", "pubmed") is None
+
+
+def test_incremental_search_starts_at_watermark(tmp_path):
+    finder = PapersFinder(
+        root_dir=str(tmp_path),
+        spreadsheet_id="",
+        google_credentials_json="",
+        sheet_name="Papers",
+        since=7,
+        query="[single-cell]",
+        incremental=True,
+    )
+    yesterday = finder.today - timedelta(days=1)
+    finder.watermarks.update("[single-cell]", "pubmed", yesterday)
+
+    jobs = {job.name: job for job in finder.search_jobs()}
+
+    assert jobs["pubmed"].since == yesterday
+    assert jobs["biorxiv"].since == finder.today - timedelta(days=7)
+
+    finder.completed_search_jobs = list(jobs.values())
+    finder.update_watermarks()
+
+    assert SearchWatermarks(finder.watermarks.path).get("[single-cell]", "biorxiv") == finder.until